@@ -0,0 +1,164 @@
+"""
+Benchmark over the synthetic corpus
+Times page rendering, bulk unlock, PDF-to-Word conversion and merging on a
+corpus written by pdf_corpus.py, using the same engine calls as the editors
+and batch tools:
+
+    python pdf_corpus.py corpus --scale medium
+    python benchmark_corpus.py corpus
+    python benchmark_corpus.py corpus --render-pages 500 --convert-pages 100
+    python benchmark_corpus.py --output corpus_bench.json    # small corpus in a temp folder
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from pdf_batch_encrypt import load_password_map
+from pdf_corpus import DOCUMENT_KINDS, PASSWORDS_NAME, generate_corpus, load_manifest
+from pdf_engine import WordConverter, open_document, render_page, unlock_file, write_pages
+
+
+def bench_render(corpus_dir: str, manifest: dict, pages: int) -> Dict[str, dict]:
+    """Open each long document and render its first pages at 100%"""
+    results = {}
+    for entry in manifest['files']:
+        if entry['kind'] not in DOCUMENT_KINDS:
+            continue
+        start = time.perf_counter()
+        doc = open_document(os.path.join(corpus_dir, entry['path']))
+        opened = time.perf_counter()
+        count = min(pages, len(doc))
+        for page_num in range(count):
+            render_page(doc, page_num)
+        per_page = (time.perf_counter() - opened) / count
+        doc.close()
+        results[entry['kind']] = {'open_ms': round((opened - start) * 1000, 1), 'pages': count,
+                                  'ms_per_page': round(per_page * 1000, 2)}
+        print(f"  {entry['kind']:10} open {(opened - start) * 1000:7.1f} ms, "
+              f"{per_page * 1000:7.2f} ms/page over {count} pages")
+    return results
+
+
+def bench_unlock(corpus_dir: str, manifest: dict, work_dir: str) -> dict:
+    """Write a decrypted copy of every encrypted file"""
+    encrypted = [entry for entry in manifest['files'] if entry['kind'] == 'encrypted']
+    if not encrypted:
+        print("  Skipped: no encrypted/ in this corpus")
+        return {}
+    passwords = load_password_map(os.path.join(corpus_dir, "encrypted", PASSWORDS_NAME))
+    start = time.perf_counter()
+    for entry in encrypted:
+        name = os.path.basename(entry['path'])
+        unlock_file(os.path.join(corpus_dir, entry['path']), passwords[name],
+                    os.path.join(work_dir, f"unlocked_{name}"))
+    seconds = time.perf_counter() - start
+    pages = sum(entry['pages'] for entry in encrypted)
+    print(f"  {len(encrypted)} files, {pages:,} pages in {seconds:.2f}s "
+          f"({len(encrypted) / seconds:.1f} files/s, {pages / seconds:,.0f} pages/s)")
+    return {'files': len(encrypted), 'pages': pages, 'seconds': round(seconds, 3)}
+
+
+def bench_convert(corpus_dir: str, manifest: dict, pages: int, work_dir: str) -> Dict[str, dict]:
+    """Convert the first pages of the text, table and image documents to Word"""
+    results = {}
+    for entry in manifest['files']:
+        if entry['kind'] not in ('text', 'tables', 'images'):
+            continue
+        doc = open_document(os.path.join(corpus_dir, entry['path']))
+        doc.select(list(range(min(pages, len(doc)))))
+        converter = WordConverter(doc)
+        start = time.perf_counter()
+        count = converter.convert(os.path.join(work_dir, f"{entry['kind']}.docx"))
+        seconds = time.perf_counter() - start
+        doc.close()
+        results[entry['kind']] = {'pages': count, 'seconds': round(seconds, 3),
+                                  'tables': converter.stats['tables'],
+                                  'images': converter.stats['images']}
+        print(f"  {entry['kind']:10} {count} pages in {seconds:6.2f}s "
+              f"({seconds / count * 1000:6.1f} ms/page, {converter.stats['tables']} tables, "
+              f"{converter.stats['images']} images)")
+    return results
+
+
+def bench_merge(corpus_dir: str, manifest: dict, work_dir: str) -> dict:
+    """Merge every part into one PDF the way a pipeline merge stage does"""
+    from pypdf import PdfReader
+
+    parts = [os.path.join(corpus_dir, entry['path'])
+             for entry in manifest['files'] if entry['kind'] == 'part']
+    if not parts:
+        print("  Skipped: no parts/ in this corpus")
+        return {}
+    start = time.perf_counter()
+    pages = write_pages((page for path in parts for page in PdfReader(path).pages),
+                        os.path.join(work_dir, "merged.pdf"))
+    seconds = time.perf_counter() - start
+    print(f"  {len(parts)} files, {pages:,} pages in {seconds:.2f}s ({pages / seconds:,.0f} pages/s)")
+    return {'files': len(parts), 'pages': pages, 'seconds': round(seconds, 3)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark rendering, unlock, conversion and "
+                                                 "merge on a synthetic corpus")
+    parser.add_argument("corpus_dir", nargs="?",
+                        help="Corpus written by pdf_corpus.py (default: generate a small one)")
+    parser.add_argument("--render-pages", type=int, default=200,
+                        help="Pages rendered per document (default: 200)")
+    parser.add_argument("--convert-pages", type=int, default=50,
+                        help="Pages converted per document (default: 50)")
+    parser.add_argument("--output", help="Save the results as JSON")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_corpus_")
+    try:
+        corpus_dir = args.corpus_dir
+        if corpus_dir is None:
+            corpus_dir = os.path.join(work_dir, "corpus")
+            print("Generating a small corpus...")
+            generate_corpus(corpus_dir, "small")
+        try:
+            manifest = load_manifest(corpus_dir)
+        except (OSError, ValueError) as e:
+            print(f"Error: not a corpus folder ({e})", file=sys.stderr)
+            return 1
+
+        print("=" * 60)
+        print(f"CORPUS BENCHMARK ({manifest['scale']}, seed {manifest['seed']}, "
+              f"{manifest['total_pages']:,} pages)")
+        print("=" * 60)
+
+        results = {'scale': manifest['scale'], 'seed': manifest['seed']}
+        print(f"\n[BENCH 1] Rendering (first {args.render_pages} pages)")
+        results['render'] = bench_render(corpus_dir, manifest, args.render_pages)
+
+        print("\n[BENCH 2] Bulk unlock")
+        results['unlock'] = bench_unlock(corpus_dir, manifest, work_dir)
+
+        print(f"\n[BENCH 3] PDF to Word (first {args.convert_pages} pages)")
+        results['convert'] = bench_convert(corpus_dir, manifest, args.convert_pages, work_dir)
+
+        print("\n[BENCH 4] Merge")
+        results['merge'] = bench_merge(corpus_dir, manifest, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
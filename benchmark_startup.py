@@ -0,0 +1,384 @@
+"""
+Benchmark for editor startup
+Runs each of the five editors in fresh interpreters and records how long its imports take
+(python -X importtime), which of the deferred libraries were loaded anyway,
+the time from process start until the main window is drawn and until the
+first page of a reference PDF is on screen, and the memory in use once the
+editor is idle:
+
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 9 --pdf samples/reference.pdf
+    python benchmark_startup.py --editor pdf_editor_complete
+    python benchmark_startup.py --output startup.json
+    python benchmark_startup.py --compare startup.json --threshold 0.2
+
+Without a display the editors are started under Xvfb when it is installed.
+Otherwise the benchmark runs headless: the editor module is imported and the
+first page is opened and rendered with pdf_engine, the same calls the editors
+make, but no window is created. pdf_editor has no page view: its first page is
+the page list it reads with pypdf, so that is what it is timed on.
+
+--output saves the results (with the current git commit) as JSON; --compare
+reads such a file and exits with status 1 when a metric got worse by more
+than the threshold, so runs from two commits can be checked against each
+other.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+
+# The editors are imported from here whatever the working directory
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Editor module -> main window class
+EDITORS = {
+    'pdf_editor': "PDFEditorApp",
+    'pdf_editor_complete': "CompletePDFEditor",
+    'pdf_editor_enhanced': "EnhancedPDFEditor",
+    'pdf_editor_full': "EnhancedPDFEditor",
+    'pdf_editor_interactive': "InteractivePDFEditor",
+}
+
+# Libraries that are only needed once a feature is used
+DEFERRED = ("docx", "lxml.etree", "pypdf", "pymupdf4llm", "cryptography.fernet",
+            "signature_processing", "concurrent.futures.process")
+
+# Metric key, label and unit, in report order
+METRICS = (
+    ('import_ms', "Import", "ms"),
+    ('window_ms', "Time to window", "ms"),
+    ('first_page_ms', "First page", "ms"),
+    ('idle_rss_mb', "Idle memory", "MB"),
+)
+
+# How long the editor is left idle before its memory is read
+IDLE_SECONDS = 0.5
+
+# Run in a fresh interpreter: argv is module, class, PDF path, mode
+# ("window" or "headless") and idle seconds. Prints perf_counter readings for
+# the window and the first page, and the resident memory once idle.
+EDITOR_SCRIPT = """
+import importlib, json, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current memory; KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+module_name, class_name, pdf_path, mode, idle = sys.argv[1:6]
+result = {"window": None}
+if mode == "window":
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+
+    def fail(title, message, **options):
+        sys.exit(f"{title}: {message}")
+
+    root = tk.Tk()
+    module = importlib.import_module(module_name)
+    options = {"warm_up": False} if module_name == "pdf_editor_complete" else {}
+    editor = getattr(module, class_name)(root, **options)
+    root.update()
+    result["window"] = time.perf_counter()
+
+    # Answer the file dialog and the "PDF loaded" message box
+    filedialog.askopenfilename = lambda **options: pdf_path
+    messagebox.showinfo = lambda *args, **options: None
+    messagebox.showerror = fail
+    getattr(editor, "load_pdf" if module_name == "pdf_editor" else "open_pdf")()
+    root.update()
+    result["first_page"] = time.perf_counter()
+    root.after(int(float(idle) * 1000), root.quit)
+    root.mainloop()
+else:
+    importlib.import_module(module_name)
+    if module_name == "pdf_editor":
+        from pypdf import PdfReader
+        for page in PdfReader(pdf_path).pages:
+            page.extract_text()
+    else:
+        from pdf_engine import open_document, render_page
+        render_page(open_document(pdf_path), 0)
+    result["first_page"] = time.perf_counter()
+    time.sleep(float(idle))
+result["idle_rss_mb"] = rss_mb()
+print("RESULT:" + json.dumps(result))
+"""
+
+
+def import_time(module: str) -> float:
+    """Cumulative import time of module in milliseconds, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=HERE)
+    for line in reversed(result.stderr.splitlines()):
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def loaded_deferred(module: str) -> list:
+    """Deferred libraries that importing module pulls in"""
+    code = (f"import sys, {module}; "
+            f"print('DEFERRED:' + ','.join(m for m in {DEFERRED!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, check=True, cwd=HERE)
+    # PyMuPDF may print a deprecation warning to stdout as well
+    for line in result.stdout.splitlines():
+        if line.startswith("DEFERRED:"):
+            return [name for name in line[len("DEFERRED:"):].split(",") if name]
+    raise RuntimeError(f"Could not import {module}")
+
+
+def run_editor(module: str, pdf_path: str, mode: str) -> Dict[str, Optional[float]]:
+    """Start module in a fresh interpreter; window_ms and first_page_ms count
+    from the launch of the process"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", EDITOR_SCRIPT, module, EDITORS[module], pdf_path, mode,
+         str(IDLE_SECONDS)],
+        capture_output=True, text=True, timeout=120, cwd=HERE)
+    lines = [line for line in result.stdout.splitlines() if line.startswith("RESULT:")]
+    if result.returncode != 0 or not lines:
+        error = result.stderr.strip().splitlines() or ["no output"]
+        raise RuntimeError(error[-1])
+
+    # perf_counter is system-wide on the platforms we run on, so the child's
+    # readings can be compared with the launch time taken here
+    readings = json.loads(lines[0][len("RESULT:"):])
+    window = readings['window']
+    return {
+        'window_ms': (window - start) * 1000 if window is not None else None,
+        'first_page_ms': (readings['first_page'] - start) * 1000,
+        'idle_rss_mb': readings['idle_rss_mb'],
+    }
+
+
+def has_display() -> bool:
+    """Whether Tk can open a window here"""
+    result = subprocess.run([sys.executable, "-c", "import tkinter; tkinter.Tk().destroy()"],
+                            capture_output=True)
+    return result.returncode == 0
+
+
+def start_xvfb(timeout: float = 5.0) -> Optional[subprocess.Popen]:
+    """Start a virtual X display for the editors if there is none and Xvfb is installed"""
+    if not sys.platform.startswith("linux") or os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    display = f":{100 + os.getpid() % 400}"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            break
+        if has_display():
+            return server
+        time.sleep(0.1)
+    server.kill()
+    del os.environ["DISPLAY"]
+    return None
+
+
+def reference_pdf(path: str, pages: int = 20):
+    """Text, vector shapes and an embedded image on every page"""
+    import io
+
+    import fitz  # PyMuPDF
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (600, 300), "white")
+    draw = ImageDraw.Draw(image)
+    for n in range(0, 600, 20):
+        draw.line((n, 0, 600 - n, 300), fill=(n % 255, 80, 160), width=3)
+    png = io.BytesIO()
+    image.save(png, format="PNG")
+
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Reference page {page_num + 1}", fontsize=20)
+        for line in range(30):
+            page.insert_text((72, 110 + line * 14),
+                             f"Line {line + 1}: the quick brown fox jumps over the lazy dog.",
+                             fontsize=10)
+        page.draw_rect(fitz.Rect(72, 540, 300, 620), color=(0, 0, 1), width=2)
+        page.insert_image(fitz.Rect(320, 540, 540, 650), stream=png.getvalue())
+    doc.save(path)
+    doc.close()
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree being measured"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, cwd=HERE)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def bench_editor(module: str, pdf_path: str, mode: str, runs: int) -> dict:
+    """Median of each metric over runs fresh interpreters"""
+    imports = [import_time(module) for _ in range(runs)]
+    starts = [run_editor(module, pdf_path, mode) for _ in range(runs)]
+    return {
+        'import_ms': _median(imports),
+        'window_ms': _median([start['window_ms'] for start in starts]),
+        'first_page_ms': _median([start['first_page_ms'] for start in starts]),
+        'idle_rss_mb': _median([start['idle_rss_mb'] for start in starts]),
+        'deferred_loaded': loaded_deferred(module),
+    }
+
+
+def print_editor(metrics: dict):
+    for key, label, unit in METRICS:
+        value = metrics.get(key)
+        shown = f"{value:8.1f} {unit}" if value is not None else "       - (needs a window)"
+        print(f"  {label + ':':16}{shown}")
+    deferred = metrics['deferred_loaded']
+    print(f"  {'Deferred libs:':16}{', '.join(deferred) if deferred else 'none loaded'}")
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """Print changes against a saved run and return the metrics that regressed"""
+    regressions = []
+    same_mode = current['mode'] == baseline.get('mode')
+    if not same_mode:
+        print(f"  Baseline ran in {baseline.get('mode')} mode; comparing import time only")
+
+    for module, metrics in current['editors'].items():
+        old = baseline.get('editors', {}).get(module)
+        if old is None:
+            continue
+        for key, label, unit in METRICS:
+            if key != 'import_ms' and not same_mode:
+                continue
+            before, after = old.get(key), metrics.get(key)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"  {module} {label}: {before:.1f} -> {after:.1f} {unit} ({change:+.0%}){flag}")
+            if flag:
+                regressions.append(f"{module} {label}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark editor startup")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Fresh interpreters per measurement (default: 5)")
+    parser.add_argument("--editor", choices=sorted(EDITORS), action="append",
+                        help="Editor module to measure (default: all)")
+    parser.add_argument("--pdf", help="Reference PDF to open (default: a generated 20-page PDF)")
+    parser.add_argument("--output", help="Save the results as JSON")
+    parser.add_argument("--compare", metavar="JSON",
+                        help="Results saved by an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown that counts as a regression (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read {args.compare}: {e}", file=sys.stderr)
+            return 1
+
+    print("=" * 60)
+    print("EDITOR STARTUP BENCHMARK")
+    print("=" * 60)
+
+    xvfb = start_xvfb()
+    mode = "window" if xvfb or has_display() else "headless"
+    work_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    results = {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'mode': mode,
+        'display': "xvfb" if xvfb else ("native" if mode == "window" else None),
+        'runs': args.runs,
+        'pdf': args.pdf,
+        'editors': {},
+    }
+    print(f"\nMode: {mode}{' (Xvfb)' if xvfb else ''}, {args.runs} run(s) per metric")
+
+    failed = []
+    try:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = os.path.join(work_dir, "reference.pdf")
+            reference_pdf(pdf_path)
+
+        for n, module in enumerate(args.editor or EDITORS, 1):
+            print(f"\n[BENCH {n}] {module}")
+            try:
+                metrics = bench_editor(module, pdf_path, mode, args.runs)
+            except (RuntimeError, subprocess.CalledProcessError,
+                    subprocess.TimeoutExpired) as e:
+                print(f"  Failed: {e}")
+                failed.append(module)
+                continue
+            results['editors'][module] = metrics
+            print_editor(metrics)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if baseline is not None:
+        print(f"\n[COMPARE] against {baseline.get('commit') or args.compare}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Benchmark for the markdown-to-Word stage of PDF-to-Word conversion
+Feeds synthetic pymupdf4llm-style markdown and large tables straight into
+WordConverter, so no PDF parsing or layout analysis is included in the timings.
+
+    python benchmark_word_conversion.py
+    python benchmark_word_conversion.py --lines 20000 --max-rows 8000
+    python benchmark_word_conversion.py --pages 2000
+"""
+
+import argparse
+import concurrent.futures
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from docx import Document
+
+from pdf_engine import StreamingDocxWriter, StyleResolver, WordConverter, tokenize_markdown
+
+
+def synthetic_markdown(lines: int = 10000, seed: int = 7) -> str:
+    """Markdown mixing headings (all levels), lists, tables, code, rules and prose"""
+    rng = random.Random(seed)
+    out = []
+    while len(out) < lines:
+        kind = rng.random()
+        if kind < 0.2:
+            out.append("#" * rng.randint(1, 6) + f" Section {len(out)}")
+        elif kind < 0.35:
+            out.append(f"- item **bold {len(out)}** and *italic* with `code`")
+        elif kind < 0.45:
+            out.append(f"{rng.randint(1, 9)}. numbered __strong__ entry")
+        elif kind < 0.55:
+            out.append("| Account | Q1 | Q2 |")
+            out.append("|---|---:|---:|")
+            for row in range(rng.randint(2, 6)):
+                out.append(f"| Row {row} | {rng.randint(1, 999)} | **{rng.randint(1, 999)}** |")
+        elif kind < 0.58:
+            out.extend(["", "```", "total = sum(values)", "```"])
+        elif kind < 0.6:
+            out.append("---")
+        elif kind < 0.7:
+            out.append("")
+        else:
+            out.append(f"Plain paragraph {len(out)} with ***bold italic*** and _emph_ text.")
+    return "\n".join(out[:lines])
+
+
+def bench_markdown(lines: int):
+    markdown = synthetic_markdown(lines)
+    converter = WordConverter(None)
+
+    start = time.perf_counter()
+    tokens = list(tokenize_markdown(markdown))
+    tokenize_seconds = time.perf_counter() - start
+
+    doc = Document()
+    start = time.perf_counter()
+    converter._markdown_to_word(doc, markdown, 0, StyleResolver(doc))
+    build_seconds = time.perf_counter() - start
+
+    headings = sum(1 for kind, _ in tokens if kind == 'heading')
+    print(f"  Input:      {lines:,} lines -> {len(tokens):,} blocks ({headings:,} headings)")
+    print(f"  Tokenize:   {tokenize_seconds * 1000:8.1f} ms "
+          f"({lines / tokenize_seconds:,.0f} lines/s)")
+    print(f"  Build docx: {build_seconds * 1000:8.1f} ms "
+          f"({lines / build_seconds:,.0f} lines/s)")
+
+
+def bench_tables(row_counts, cols: int = 6):
+    """Time _create_word_table for growing tables; time per cell should stay flat"""
+    converter = WordConverter(None)
+    per_cell = []
+    for rows in row_counts:
+        table_rows = [[f"Column {c}" for c in range(cols)]]
+        table_rows += [[f"{r * cols + c:,}" for c in range(cols)] for r in range(rows - 1)]
+
+        doc = Document()
+        start = time.perf_counter()
+        converter._create_word_table(doc, table_rows, StyleResolver(doc))
+        seconds = time.perf_counter() - start
+
+        cells = rows * cols
+        per_cell.append(seconds / cells)
+        print(f"  {rows:6,} rows x {cols} cols = {cells:7,} cells: {seconds * 1000:8.1f} ms "
+              f"({per_cell[-1] * 1e6:6.1f} us/cell)")
+
+    growth = per_cell[-1] / per_cell[0]
+    print(f"  Per-cell cost growth from smallest to largest table: {growth:.2f}x "
+          f"({'linear' if growth < 2 else 'super-linear'})")
+
+
+def _build_pages(pages: int, page_md: str, streaming: bool):
+    """Build and save a long document in this (fresh) process; returns seconds, peak RSS"""
+    import resource
+
+    converter = WordConverter(None)
+    output = os.path.join(tempfile.gettempdir(), f"bench_streaming_{os.getpid()}.docx")
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    writer = StreamingDocxWriter(output) if streaming else None
+    doc = writer.document if writer else Document()
+    styles = StyleResolver(doc)
+    for page_num in range(pages):
+        converter._markdown_to_word(doc, page_md, page_num, styles)
+        doc.add_page_break()
+        if writer and (page_num + 1) % WordConverter.STREAMING_FLUSH_PAGES == 0:
+            writer.flush()
+            doc = writer.document
+            styles = StyleResolver(doc)
+    if writer:
+        writer.close()
+    else:
+        doc.save(output)
+    seconds = time.perf_counter() - start
+    os.remove(output)
+    # ru_maxrss is in KiB on Linux
+    return seconds, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) / 1024
+
+
+def bench_streaming(pages: int, lines_per_page: int = 60):
+    """Peak memory growth building a long document in memory vs. streamed"""
+    try:
+        import resource  # noqa: F401
+    except ImportError:
+        print("  Skipped: peak RSS needs the resource module (not available on Windows)")
+        return
+
+    page_md = synthetic_markdown(lines_per_page)
+    for streaming in (False, True):
+        # A fresh process per mode so one mode's peak does not hide the other's
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+            seconds, peak_mib = pool.submit(_build_pages, pages, page_md, streaming).result()
+        print(f"  {'Streaming' if streaming else 'In memory'}: {seconds:6.1f} s, "
+              f"peak RSS +{peak_mib:7.1f} MiB")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark markdown-to-Word conversion")
+    parser.add_argument("--lines", type=int, default=10000,
+                        help="Synthetic markdown lines (default: 10000)")
+    parser.add_argument("--max-rows", type=int, default=4000,
+                        help="Rows in the largest benchmark table (default: 4000)")
+    parser.add_argument("--pages", type=int, default=500,
+                        help="Pages in the streaming memory benchmark (default: 500)")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("WORD CONVERSION BENCHMARK")
+    print("=" * 60)
+
+    print(f"\n[BENCH 1] Markdown to Word ({args.lines:,} lines)")
+    bench_markdown(args.lines)
+
+    row_counts = [args.max_rows // 16, args.max_rows // 4, args.max_rows]
+    print("\n[BENCH 2] Table construction scaling")
+    bench_tables([max(2, rows) for rows in row_counts])
+
+    print(f"\n[BENCH 3] Streaming writer memory ({args.pages:,} pages)")
+    bench_streaming(args.pages)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
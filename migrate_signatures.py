@@ -0,0 +1,183 @@
+"""
+Signature Library Migration
+Copies signature libraries saved by older versions, where every PNG was a
+base64 string inside indented JSON, into the binary formats:
+
+    python migrate_signatures.py signatures.json                    # -> signatures.sigs
+    python migrate_signatures.py signatures.encrypted               # -> signatures.db
+    python migrate_signatures.py signatures.json -o signatures.db   # into the encrypted library
+    python migrate_signatures.py signatures.db -o export.sigs --decrypt
+
+signatures.json is the plaintext library of pdf_editor_full.py and becomes a
+SignatureContainer (.sigs). signatures.encrypted is the old library of
+pdf_editor_complete.py and becomes a SignatureStore (.db). Either source can
+go to either target, but an encrypted library is only written out as a
+plaintext .sigs file with --decrypt. Passwords are asked for on the terminal
+unless given as options. The source file is left untouched, and signatures
+that already exist in the target are replaced.
+"""
+
+import argparse
+import getpass
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from signature_container import MAGIC, SignatureContainer, load_json_file
+from signature_store import (LEGACY_HASH_SIZE, LEGACY_SALT_SIZE, SignatureStore,
+                             load_legacy_file)
+
+
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+# Default target for each source format; a .db store has none, as the only
+# other format is plaintext
+DEFAULT_TARGETS = {
+    'json': "signatures.sigs",
+    'encrypted': "signatures.db",
+    'container': "signatures.db",
+}
+
+
+def detect_format(path: str) -> str:
+    """'json', 'encrypted' (old signatures.encrypted), 'container' (.sigs) or 'store' (.db)"""
+    with open(path, 'rb') as f:
+        head = f.read(96)
+    if head.startswith(MAGIC):
+        return 'container'
+    if head.startswith(SQLITE_MAGIC):
+        return 'store'
+    # Checked before JSON: the random salt in front can itself start with "{"
+    password_hash = head[LEGACY_SALT_SIZE:LEGACY_SALT_SIZE + LEGACY_HASH_SIZE]
+    token_start = LEGACY_SALT_SIZE + LEGACY_HASH_SIZE
+    if (len(password_hash) == LEGACY_HASH_SIZE
+            and all(c in b"0123456789abcdef" for c in password_hash)
+            and head[token_start:token_start + 6] == b"gAAAAA"):
+        return 'encrypted'
+    if head.lstrip()[:1] == b"{":
+        return 'json'
+    raise ValueError(f"Not a signature library: {path}")
+
+
+def needs_password(fmt: str) -> bool:
+    return fmt in ('encrypted', 'store')
+
+
+def read_signatures(path: str, password: Optional[str] = None) -> Dict[str, dict]:
+    """Every signature in a library of any format, as name -> info with 'data' bytes"""
+    fmt = detect_format(path)
+    if fmt == 'json':
+        return load_json_file(path)
+    if fmt == 'encrypted':
+        signatures = load_legacy_file(path, password or "")
+        if signatures is None:
+            raise ValueError("Incorrect password")
+        return signatures
+
+    if fmt == 'container':
+        library = SignatureContainer(path)
+    else:
+        library = SignatureStore(path)
+        if not library.unlock(password or ""):
+            raise ValueError("Incorrect password")
+    try:
+        return {name: dict(info, data=library.get_data(name)) for name, info in library.entries()}
+    finally:
+        if fmt == 'store':
+            library.close()
+
+
+def write_signatures(signatures: Dict[str, dict], output_path: str,
+                     password: Optional[str] = None) -> int:
+    """Add signatures to a .sigs container or a .db store (created if missing)"""
+    entries = [dict(info, name=name) for name, info in signatures.items()]
+    if not output_path.lower().endswith(".db"):
+        return SignatureContainer(output_path).add_many(entries)
+
+    store = SignatureStore(output_path)
+    try:
+        if store.exists():
+            if not store.unlock(password or ""):
+                raise ValueError(f"Incorrect password for {output_path}")
+        else:
+            store.create(password)
+        return store.add_many(entries)
+    finally:
+        store.close()
+
+
+def migrate(source_path: str, output_path: str, password: Optional[str] = None,
+            new_password: Optional[str] = None) -> dict:
+    """Copy a library into output_path and return counts, sizes and timing"""
+    start = time.perf_counter()
+    signatures = read_signatures(source_path, password)
+    count = write_signatures(signatures, output_path, new_password or password)
+    return {
+        'signatures': count,
+        'source_bytes': os.path.getsize(source_path),
+        'output_bytes': os.path.getsize(output_path),
+        'seconds': round(time.perf_counter() - start, 4),
+    }
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Copy a signature library into the binary .sigs or encrypted .db format")
+    parser.add_argument("source", help="signatures.json, signatures.encrypted, .sigs or .db file")
+    parser.add_argument("-o", "--output",
+                        help="Target .sigs or .db file (default: signatures.sigs for JSON, "
+                             "signatures.db for the old encrypted library and .sigs files, "
+                             "next to the source)")
+    parser.add_argument("--password", help="Password of an encrypted source")
+    parser.add_argument("--new-password",
+                        help="Password of the .db target (default: the source password)")
+    parser.add_argument("--decrypt", action="store_true",
+                        help="Allow an encrypted source to be written to a plaintext .sigs file")
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = detect_format(args.source)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.output is None and fmt not in DEFAULT_TARGETS:
+        print("Error: choose a target with -o for an encrypted .db library", file=sys.stderr)
+        return 1
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.source)),
+                                         DEFAULT_TARGETS[fmt])
+    if needs_password(fmt) and not output.lower().endswith(".db") and not args.decrypt:
+        print(f"Error: {os.path.basename(output)} would hold the signatures unencrypted; "
+              f"pass --decrypt to allow it", file=sys.stderr)
+        return 1
+    if os.path.abspath(output) == os.path.abspath(args.source):
+        print("Error: source and output are the same file", file=sys.stderr)
+        return 1
+
+    password = args.password
+    if needs_password(fmt) and password is None:
+        password = getpass.getpass(f"Password for {os.path.basename(args.source)}: ")
+
+    new_password = args.new_password
+    if output.lower().endswith(".db") and new_password is None and not password:
+        new_password = getpass.getpass(f"Master password for {os.path.basename(output)}: ")
+        if not new_password or new_password != getpass.getpass("Confirm password: "):
+            print("Error: passwords do not match", file=sys.stderr)
+            return 1
+
+    try:
+        result = migrate(args.source, output, password, new_password)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Migrated {result['signatures']} signature(s) to {output}: "
+          f"{result['source_bytes'] / 1024:.1f} KB -> {result['output_bytes'] / 1024:.1f} KB "
+          f"in {result['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
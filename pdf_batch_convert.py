@@ -0,0 +1,258 @@
+"""
+Batch PDF to Word Conversion
+Converts folders or glob patterns of PDFs to .docx without the GUI, using the
+same WordConverter as File > Convert to Word, and writes a JSON report with the
+pages, tables, images and timings of every file:
+
+    python pdf_batch_convert.py statements/ -o word/
+    python pdf_batch_convert.py "incoming/*.pdf" archive/2023 -o word/ --workers 4
+    python pdf_batch_convert.py locked/ -o word/ --password-template "{stem}-2024"
+
+Files are converted in parallel worker processes. A single input file is
+converted in-process with its layout analysis spread over the workers instead.
+With --cache-dir, per-page layout analysis is kept on disk (see MarkdownCache),
+so converting the same PDFs again only rebuilds the Word documents. The cache
+holds plaintext, so it is off by default and never used for password-protected
+files.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from pdf_batch_encrypt import load_password_map, resolve_password, validate_template
+from pdf_engine import MarkdownCache, WordConverter, open_document
+from pdf_pipeline import iter_inputs
+
+
+REPORT_NAME = "conversion_report.json"
+
+
+def output_paths(input_paths: List[str], output_dir: Optional[str]) -> Dict[str, str]:
+    """Map each input PDF to its .docx, next to the PDF or in output_dir
+
+    Inputs from different folders that share a name get a numeric suffix
+    instead of overwriting each other in output_dir.
+    """
+    paths = {}
+    used = set()
+    for input_path in input_paths:
+        stem = os.path.splitext(os.path.basename(input_path))[0]
+        folder = output_dir or os.path.dirname(input_path)
+        candidate = os.path.join(folder, f"{stem}.docx")
+        counter = 2
+        while candidate in used:
+            candidate = os.path.join(folder, f"{stem}_{counter}.docx")
+            counter += 1
+        used.add(candidate)
+        paths[input_path] = candidate
+    return paths
+
+
+def convert_file(input_path: str, output_path: str, password: Optional[str] = None,
+                 cache_dir: Optional[str] = None, page_workers: int = 1) -> dict:
+    """Convert a single PDF to Word (runs inside a worker process)"""
+    start = time.perf_counter()
+    result = {
+        'input': input_path,
+        'output': output_path,
+        'status': 'ok',
+        'pages': 0,
+        'cached_pages': 0,
+        'tables': 0,
+        'images': 0,
+        'bytes': 0,
+        'timings': {},
+        'error': None,
+    }
+
+    try:
+        doc = open_document(input_path, password)
+        open_seconds = time.perf_counter() - start
+        try:
+            cache = MarkdownCache(cache_dir) if cache_dir else None
+            converter = WordConverter(doc, markdown_cache=cache)
+            converter.convert(output_path, workers=page_workers)
+        finally:
+            doc.close()
+
+        stats = converter.stats
+        for key in ('pages', 'cached_pages', 'tables', 'images'):
+            result[key] = stats[key]
+        result['bytes'] = os.path.getsize(output_path)
+        result['timings'] = {
+            'open': round(open_seconds, 4),
+            'layout': round(stats['layout_seconds'], 4),
+            'docx': round(stats['seconds'] - stats['layout_seconds'], 4),
+        }
+
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _failed_result(job: tuple, error: Exception) -> dict:
+    """Result for a file whose worker never reported back"""
+    input_path, output_path = job[:2]
+    return {
+        'input': input_path,
+        'output': output_path,
+        'status': 'error',
+        'pages': 0,
+        'cached_pages': 0,
+        'tables': 0,
+        'images': 0,
+        'bytes': 0,
+        'timings': {},
+        'error': str(error) or type(error).__name__,
+        'seconds': 0,
+    }
+
+
+def convert_batch(inputs: List[str], output_dir: Optional[str] = None,
+                  password: Optional[str] = None,
+                  password_template: Optional[str] = None,
+                  password_map: Optional[Dict[str, str]] = None,
+                  cache_dir: Optional[str] = None,
+                  workers: Optional[int] = None,
+                  report_path: Optional[str] = None,
+                  progress_callback: Optional[Callable[[int, int, dict], None]] = None) -> dict:
+    """Convert every PDF matched by inputs (folders, globs or files) and write the report
+
+    password applies to every encrypted file; password_map and password_template
+    resolve per-file passwords as in pdf_batch_encrypt and take precedence.
+    Passwords are never written to the report. A bad password_template raises
+    ValueError before any file is converted.
+    """
+    if password_template:
+        validate_template(password_template)
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    input_paths = list(iter_inputs(inputs))
+    targets = output_paths(input_paths, output_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [(input_path, targets[input_path],
+             resolve_password(input_path, password_template, password_map) or password,
+             cache_dir)
+            for input_path in input_paths]
+
+    results: List[dict] = []
+    total = len(jobs)
+    if total == 1:
+        # One file: parallelise its pages rather than the (single) file
+        results.append(convert_file(*jobs[0], page_workers=workers))
+        if progress_callback:
+            progress_callback(1, total, results[0])
+    elif jobs:
+        def report(result: dict):
+            results.append(result)
+            if progress_callback:
+                progress_callback(len(results), total, result)
+
+        with ProcessPoolExecutor(max_workers=min(workers, total)) as pool:
+            futures: Dict[Future, tuple] = {}
+            for job in jobs:
+                try:
+                    futures[pool.submit(convert_file, *job)] = job
+                except Exception as e:
+                    # The pool is broken once a worker has died; later files fail here
+                    report(_failed_result(job, e))
+            for future in as_completed(futures):
+                try:
+                    report(future.result())
+                except Exception as e:
+                    # A crashed worker fails the files it took down, not the batch
+                    report(_failed_result(futures[future], e))
+
+    results.sort(key=lambda r: r['input'])
+    report = {
+        'created': datetime.now().isoformat(),
+        'inputs': list(inputs),
+        'output_dir': os.path.abspath(output_dir) if output_dir else None,
+        'workers': workers,
+        'cache_dir': cache_dir,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] == 'error'),
+        'pages': sum(r['pages'] for r in results),
+        'seconds': round(time.perf_counter() - start, 4),
+        'files': results,
+    }
+
+    if report_path is None:
+        report_path = os.path.join(output_dir or os.getcwd(), REPORT_NAME)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Convert PDFs to Word documents in parallel and write a JSON report")
+    parser.add_argument("inputs", nargs="+",
+                        help="PDF files, folders or glob patterns (quote globs)")
+    parser.add_argument("-o", "--output-dir",
+                        help="Folder for the .docx files (default: next to each PDF)")
+    parser.add_argument("--report",
+                        help=f"Report path (default: OUTPUT_DIR/{REPORT_NAME})")
+    parser.add_argument("--password", help="Password for every encrypted PDF")
+    parser.add_argument("--password-template",
+                        help="Per-file password template, e.g. '{stem}-2024'")
+    parser.add_argument("--password-csv",
+                        help="CSV of filename,password rows (overrides the template per file)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir",
+                        help="Keep layout analysis in this folder so re-runs skip it "
+                             "(plaintext; password-protected files are never cached)")
+    args = parser.parse_args(argv)
+
+    if args.password_template:
+        try:
+            validate_template(args.password_template)
+        except ValueError as e:
+            parser.error(str(e))
+
+    password_map = load_password_map(args.password_csv) if args.password_csv else None
+    report_path = args.report or os.path.join(args.output_dir or os.getcwd(), REPORT_NAME)
+
+    def progress(done, total, result):
+        detail = (f"{result['pages']} pages, {result['tables']} tables, "
+                  f"{result['images']} images" if result['status'] == 'ok' else result['error'])
+        print(f"  [{done}/{total}] {os.path.basename(result['input'])}: {detail}")
+
+    report = convert_batch(args.inputs, output_dir=args.output_dir,
+                           password=args.password,
+                           password_template=args.password_template,
+                           password_map=password_map,
+                           cache_dir=args.cache_dir,
+                           workers=args.workers,
+                           report_path=report_path,
+                           progress_callback=progress)
+
+    if not report['total']:
+        print("No PDF files matched the inputs", file=sys.stderr)
+        return 2
+
+    print(f"Converted {report['succeeded']} of {report['total']} file(s), "
+          f"{report['pages']} pages in {report['seconds']:.2f}s ({report['failed']} failed)")
+    print(f"Report: {report_path}")
+
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
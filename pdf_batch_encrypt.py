@@ -0,0 +1,210 @@
+"""
+Batch PDF Encryption
+Encrypts a folder of PDFs with AES-256 across a process pool and writes a result manifest.
+Used by the Batch Encrypt dialog in pdf_editor.py and runnable headless:
+
+    python pdf_batch_encrypt.py INPUT_DIR OUTPUT_DIR --password-template "{stem}-2024"
+    python pdf_batch_encrypt.py INPUT_DIR OUTPUT_DIR --password-csv passwords.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from pypdf import PdfReader
+
+from pdf_engine import write_pages
+
+
+MANIFEST_NAME = "encryption_manifest.json"
+ALGORITHM = "AES-256"
+
+
+def load_password_map(csv_path: str) -> Dict[str, str]:
+    """Load per-file passwords from a CSV with 'filename,password' rows"""
+    password_map = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip():
+                continue
+            # Allow an optional header row
+            if row[0].strip().lower() == "filename" and row[1].strip().lower() == "password":
+                continue
+            password_map[row[0].strip()] = row[1]
+    return password_map
+
+
+def validate_template(template: str):
+    """Raise ValueError if a password template uses anything but {name} and {stem}"""
+    try:
+        template.format(name="example.pdf", stem="example")
+    except (KeyError, IndexError, ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid password template '{template}' ({e}); "
+                         f"use {{name}} and {{stem}}") from None
+
+
+def resolve_password(file_path: str, template: Optional[str] = None,
+                     password_map: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """Pick the password for a file: explicit CSV entry first, then the template
+
+    Templates use str.format fields {name} (file name) and {stem} (name without .pdf).
+    """
+    name = os.path.basename(file_path)
+    if password_map and name in password_map:
+        return password_map[name]
+    if template:
+        return template.format(name=name, stem=os.path.splitext(name)[0])
+    return None
+
+
+def encrypt_file(input_path: str, output_path: str, user_password: str,
+                 owner_password: Optional[str] = None) -> dict:
+    """Encrypt a single PDF with AES-256 (runs inside a worker process)"""
+    start = time.perf_counter()
+    result = {
+        'input': input_path,
+        'output': output_path,
+        'status': 'ok',
+        'pages': 0,
+        'bytes': 0,
+        'error': None,
+    }
+
+    try:
+        reader = PdfReader(input_path)
+        if reader.is_encrypted:
+            raise ValueError("File is already encrypted")
+
+        result['pages'] = write_pages(reader.pages, output_path,
+                                      user_password=user_password,
+                                      owner_password=owner_password,
+                                      algorithm=ALGORITHM)
+        result['bytes'] = os.path.getsize(output_path)
+
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def encrypt_folder(input_dir: str, output_dir: str,
+                   password_template: Optional[str] = None,
+                   password_map: Optional[Dict[str, str]] = None,
+                   owner_password: Optional[str] = None,
+                   workers: Optional[int] = None,
+                   progress_callback: Optional[Callable[[int, int], None]] = None) -> dict:
+    """Encrypt every PDF in input_dir into output_dir and write a JSON manifest
+
+    Files without a resolvable password are recorded as skipped. Passwords are
+    never written to the manifest. A bad password_template raises ValueError
+    before any file is touched.
+    """
+    if os.path.abspath(input_dir) == os.path.abspath(output_dir):
+        raise ValueError("Output folder must be different from the input folder")
+    if password_template:
+        validate_template(password_template)
+
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    file_paths = sorted(
+        os.path.join(input_dir, name) for name in os.listdir(input_dir)
+        if name.lower().endswith(".pdf") and os.path.isfile(os.path.join(input_dir, name))
+    )
+
+    results: List[dict] = []
+    jobs = []
+    for file_path in file_paths:
+        password = resolve_password(file_path, password_template, password_map)
+        output_path = os.path.join(output_dir, os.path.basename(file_path))
+        if not password:
+            results.append({'input': file_path, 'output': None, 'status': 'skipped',
+                            'pages': 0, 'bytes': 0, 'error': "No password for file",
+                            'seconds': 0})
+        else:
+            jobs.append((file_path, output_path, password, owner_password))
+
+    total = len(jobs)
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(encrypt_file, *job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                results.append(future.result())
+                if progress_callback:
+                    progress_callback(done, total)
+
+    results.sort(key=lambda r: r['input'])
+    manifest = {
+        'created': datetime.now().isoformat(),
+        'input_dir': os.path.abspath(input_dir),
+        'output_dir': os.path.abspath(output_dir),
+        'algorithm': ALGORITHM,
+        'workers': workers or os.cpu_count(),
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] == 'error'),
+        'skipped': sum(1 for r in results if r['status'] == 'skipped'),
+        'seconds': round(time.perf_counter() - start, 4),
+        'files': results,
+    }
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Encrypt a folder of PDFs with AES-256 using a process pool")
+    parser.add_argument("input_dir", help="Folder containing PDFs to encrypt")
+    parser.add_argument("output_dir", help="Folder for encrypted PDFs and the manifest")
+    parser.add_argument("--password-template",
+                        help="Password template, e.g. '{stem}-2024' ({name}, {stem} available)")
+    parser.add_argument("--password-csv",
+                        help="CSV of filename,password rows (overrides the template per file)")
+    parser.add_argument("--owner-password",
+                        help="Owner password for all files (defaults to each user password)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if not args.password_template and not args.password_csv:
+        parser.error("Provide --password-template and/or --password-csv")
+    if args.password_template:
+        try:
+            validate_template(args.password_template)
+        except ValueError as e:
+            parser.error(str(e))
+
+    password_map = load_password_map(args.password_csv) if args.password_csv else None
+
+    def progress(done, total):
+        print(f"  [{done}/{total}] encrypted")
+
+    manifest = encrypt_folder(args.input_dir, args.output_dir,
+                              password_template=args.password_template,
+                              password_map=password_map,
+                              owner_password=args.owner_password,
+                              workers=args.workers,
+                              progress_callback=progress)
+
+    print(f"Encrypted {manifest['succeeded']} of {manifest['total']} file(s) "
+          f"in {manifest['seconds']:.2f}s "
+          f"({manifest['failed']} failed, {manifest['skipped']} skipped)")
+    print(f"Manifest: {os.path.join(args.output_dir, MANIFEST_NAME)}")
+
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+"""
+Synthetic PDF Corpus
+Generates a reproducible set of large PDFs for scale testing the editors,
+batch tools and benchmarks:
+
+    python pdf_corpus.py corpus                       # medium: 4,700 pages, ~40 MB
+    python pdf_corpus.py corpus --scale large         # 34,500 pages, up to 5,000 per document
+    python pdf_corpus.py corpus --scale small --only text --only parts
+    python pdf_corpus.py corpus --pages 3000 --seed 7
+
+The corpus holds one long document per kind:
+
+    text.pdf        prose on every page
+    images.pdf      text with embedded JPEG and PNG images
+    tables.pdf      ruled tables (picked up by the Word conversion's layout analysis)
+    scanned.pdf     one skewed, speckled grayscale raster per page and no text layer
+    annotated.pdf   dozens of highlight, shape, ink, line, note and free text annotations per page
+
+plus parts/, many short documents for merge and batch runs, and encrypted/,
+AES-256 copies of every part and of text.pdf. encrypted/passwords.csv lists
+their passwords as filename,password rows, the format pdf_batch_encrypt.py,
+pdf_batch_convert.py and pdf_watch_folder.py read with --password-csv.
+
+Everything is drawn from a seeded random generator, and dates and document
+IDs are fixed, so the same seed and scale give byte-identical unencrypted
+files. Encrypted files have the same content each time but different bytes,
+because encryption uses random IVs. corpus_manifest.json records every file
+with its kind, page count, size, SHA-256 and, where it has one, password.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw, ImageFilter
+
+
+MANIFEST_NAME = "corpus_manifest.json"
+PASSWORDS_NAME = "passwords.csv"
+FORMAT_VERSION = 1
+
+# Page counts per kind; parts is the number of short documents of part_pages each
+SCALES = {
+    'small': {'text': 40, 'images': 20, 'tables': 20, 'scanned': 10, 'annotated': 20,
+              'annotations_per_page': 25, 'parts': 10, 'part_pages': 4},
+    'medium': {'text': 1000, 'images': 200, 'tables': 200, 'scanned': 100, 'annotated': 200,
+               'annotations_per_page': 50, 'parts': 100, 'part_pages': 10},
+    'large': {'text': 5000, 'images': 1000, 'tables': 2000, 'scanned': 500, 'annotated': 1000,
+              'annotations_per_page': 100, 'parts': 1000, 'part_pages': 10},
+}
+
+DOCUMENT_KINDS = ('text', 'images', 'tables', 'scanned', 'annotated')
+KINDS = DOCUMENT_KINDS + ('parts',)
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter
+MARGIN = 72
+SCAN_DPI = 150
+TABLE_FONT = fitz.Font("helv")
+
+# Fixed dates keep saved files byte-identical between runs
+FIXED_DATE = "D:20240101000000Z"
+
+WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+         "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+         "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure "
+         "in reprehenderit voluptate velit esse cillum fugiat nulla pariatur excepteur sint "
+         "occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim id est "
+         "invoice contract quarterly revenue signature approved pending schedule clause").split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return "\n\n".join(" ".join(_sentence(rng, rng.randint(6, 16)) for _ in range(rng.randint(2, 5)))
+                       for _ in range(count))
+
+
+def _new_document(title: str) -> fitz.Document:
+    doc = fitz.open()
+    doc.set_metadata({'title': title, 'author': "pdf_corpus.py", 'producer': "pdf_corpus.py",
+                      'creator': "pdf_corpus.py", 'creationDate': FIXED_DATE,
+                      'modDate': FIXED_DATE})
+    return doc
+
+
+def _save(doc: fitz.Document, path: str, password: Optional[str] = None):
+    options = {'garbage': 1, 'deflate': True, 'no_new_id': True}
+    if password:
+        options.update(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw=password)
+    doc.save(path, **options)
+
+
+def _text_page(doc: fitz.Document, rng: random.Random, heading: str, body_bottom: float = None):
+    """Heading plus prose down to body_bottom (default: the bottom margin)"""
+    page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+    page.insert_text((MARGIN, MARGIN), heading, fontsize=16, fontname="helv")
+    bottom = body_bottom if body_bottom is not None else PAGE_HEIGHT - MARGIN
+    page.insert_textbox(fitz.Rect(MARGIN, MARGIN + 20, PAGE_WIDTH - MARGIN, bottom),
+                        _paragraphs(rng, 6), fontsize=10, fontname="helv")
+    page.insert_text((PAGE_WIDTH / 2 - 20, PAGE_HEIGHT - 36), f"Page {doc.page_count}",
+                     fontsize=8, fontname="helv")
+    return page
+
+
+def _picture(rng: random.Random, width: int, height: int) -> Image.Image:
+    """Colourful shapes on a gradient, different for every call"""
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randint(8, 20)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        size = rng.randint(10, max(11, width // 3))
+        colour = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        if rng.random() < 0.5:
+            draw.ellipse((x, y, x + size, y + size), fill=colour)
+        else:
+            draw.rectangle((x, y, x + size, y + size // 2), fill=colour)
+    return image
+
+
+def _encoded(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        image.save(buffer, format="JPEG", quality=80)
+    else:
+        image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_text(path: str, pages: int, rng: random.Random):
+    doc = _new_document("Synthetic text")
+    for page_num in range(pages):
+        _text_page(doc, rng, f"Section {page_num + 1}: {_sentence(rng, 4)[:-1]}")
+    _save(doc, path)
+    doc.close()
+
+
+def make_images(path: str, pages: int, rng: random.Random):
+    doc = _new_document("Synthetic images")
+    for page_num in range(pages):
+        page = _text_page(doc, rng, f"Figure page {page_num + 1}", body_bottom=330)
+        # A photo-like JPEG and a flat-colour PNG, as scanners and charting tools produce
+        page.insert_image(fitz.Rect(MARGIN, 350, 320, 530),
+                          stream=_encoded(_picture(rng, 640, 460), "JPEG"))
+        page.insert_image(fitz.Rect(330, 350, PAGE_WIDTH - MARGIN, 530),
+                          stream=_encoded(_picture(rng, 420, 460), "PNG"))
+        page.insert_image(fitz.Rect(MARGIN, 550, PAGE_WIDTH - MARGIN, PAGE_HEIGHT - MARGIN),
+                          stream=_encoded(_picture(rng, 930, 340), "JPEG"))
+    _save(doc, path)
+    doc.close()
+
+
+def make_tables(path: str, pages: int, rng: random.Random):
+    doc = _new_document("Synthetic tables")
+    for page_num in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, MARGIN), f"Table {page_num + 1}", fontsize=16, fontname="helv")
+        rows, cols = rng.randint(12, 30), rng.randint(3, 7)
+        row_height = min(20, (PAGE_HEIGHT - 2 * MARGIN - 30) / rows)
+        col_width = (PAGE_WIDTH - 2 * MARGIN) / cols
+        top = MARGIN + 20
+
+        shape = page.new_shape()
+        for row in range(rows + 1):
+            y = top + row * row_height
+            shape.draw_line((MARGIN, y), (PAGE_WIDTH - MARGIN, y))
+        for col in range(cols + 1):
+            x = MARGIN + col * col_width
+            shape.draw_line((x, top), (x, top + rows * row_height))
+        shape.finish(color=(0, 0, 0), width=0.6)
+        shape.commit()
+
+        # One TextWriter per page; an insert_text call per cell is far slower
+        writer = fitz.TextWriter(page.rect)
+        for row in range(rows):
+            for col in range(cols):
+                if row == 0:
+                    text = f"{rng.choice(WORDS).title()} {col + 1}"
+                elif col == 0:
+                    text = f"{rng.choice(WORDS)} {row}"
+                else:
+                    text = f"{rng.uniform(0, 100000):,.2f}"
+                writer.append((MARGIN + col * col_width + 4, top + (row + 1) * row_height - 6),
+                              text, font=TABLE_FONT, fontsize=min(9, row_height - 6))
+        writer.write_text(page)
+    _save(doc, path)
+    doc.close()
+
+
+def make_scanned(path: str, pages: int, rng: random.Random):
+    doc = _new_document("Synthetic scan")
+    scratch = fitz.open()
+    for page_num in range(pages):
+        # Typeset a page, rasterise it and make it look like it came off a scanner
+        _text_page(scratch, rng, f"Scanned letter {page_num + 1}")
+        pixmap = scratch[-1].get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+        image = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+        image = image.rotate(rng.uniform(-1.5, 1.5), resample=Image.BILINEAR,
+                             fillcolor=rng.randint(235, 250))
+        draw = ImageDraw.Draw(image)
+        for _ in range(rng.randint(200, 600)):
+            x, y = rng.randrange(image.width), rng.randrange(image.height)
+            radius = rng.choice((0, 0, 1, 1, 2))
+            draw.ellipse((x, y, x + radius, y + radius), fill=rng.randint(0, 120))
+        image = image.filter(ImageFilter.GaussianBlur(0.6))
+
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_image(page.rect, stream=_encoded(image, "JPEG"))
+        scratch.delete_page(-1)
+    scratch.close()
+    _save(doc, path)
+    doc.close()
+
+
+def make_annotated(path: str, pages: int, per_page: int, rng: random.Random):
+    doc = _new_document("Synthetic annotations")
+    for page_num in range(pages):
+        page = _text_page(doc, rng, f"Review copy {page_num + 1}")
+        for _ in range(per_page):
+            x = rng.uniform(MARGIN, PAGE_WIDTH - MARGIN - 120)
+            y = rng.uniform(MARGIN, PAGE_HEIGHT - MARGIN - 60)
+            rect = fitz.Rect(x, y, x + rng.uniform(30, 120), y + rng.uniform(12, 60))
+            kind = rng.randrange(7)
+            if kind == 0:
+                annot = page.add_highlight_annot(rect)
+            elif kind == 1:
+                annot = page.add_rect_annot(rect)
+            elif kind == 2:
+                annot = page.add_circle_annot(rect)
+            elif kind == 3:
+                annot = page.add_line_annot(rect.tl, rect.br)
+            elif kind == 4:
+                annot = page.add_ink_annot([[(x + i * 6, y + rng.uniform(0, 20)) for i in range(12)]])
+            elif kind == 5:
+                annot = page.add_text_annot(rect.tl, _sentence(rng, 8))
+            else:
+                annot = page.add_freetext_annot(rect, _sentence(rng, 5), fontsize=8)
+            if kind not in (5, 6):
+                annot.set_colors(stroke=(rng.random(), rng.random(), rng.random()))
+            annot.set_info(title="Reviewer", creationDate=FIXED_DATE, modDate=FIXED_DATE)
+            annot.update()
+    _save(doc, path)
+    doc.close()
+
+
+def make_part(path: str, pages: int, rng: random.Random, name: str):
+    doc = _new_document(name)
+    for page_num in range(pages):
+        _text_page(doc, rng, f"{name} - page {page_num + 1}")
+    _save(doc, path)
+    doc.close()
+
+
+def encrypt_copy(source_path: str, output_path: str, password: str):
+    """AES-256 copy of source_path that opens with password"""
+    doc = fitz.open(source_path)
+    _save(doc, output_path, password)
+    doc.close()
+
+
+def make_password(rng: random.Random) -> str:
+    return f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{rng.randrange(10000):04d}"
+
+
+def _file_entry(output_dir: str, path: str, kind: str, password: Optional[str] = None) -> dict:
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    with fitz.open(path) as doc:
+        if password:
+            doc.authenticate(password)
+        pages = doc.page_count
+    entry = {'path': os.path.relpath(path, output_dir).replace(os.sep, "/"), 'kind': kind,
+             'pages': pages, 'bytes': os.path.getsize(path), 'sha256': digest}
+    if password:
+        entry['password'] = password
+    return entry
+
+
+def generate_corpus(output_dir: str, scale: str = "medium", seed: int = 1,
+                    kinds: Optional[List[str]] = None, pages: Optional[int] = None,
+                    progress_callback: Optional[Callable[[str], None]] = None) -> dict:
+    """Write the corpus into output_dir and return its manifest
+
+    kinds limits generation to some of KINDS ('parts' includes encrypted/);
+    pages overrides the page count of every single-document kind.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}' (choose from {', '.join(SCALES)})")
+    counts = dict(SCALES[scale])
+    if pages is not None:
+        counts.update({kind: pages for kind in DOCUMENT_KINDS})
+    kinds = list(kinds or KINDS)
+
+    def report(message):
+        if progress_callback:
+            progress_callback(message)
+
+    def rng_for(name):
+        # String seeds hash the same way in every process, unlike hash()
+        return random.Random(f"{seed}:{name}")
+
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    files = []
+
+    builders = {
+        'text': lambda path, n: make_text(path, n, rng_for('text')),
+        'images': lambda path, n: make_images(path, n, rng_for('images')),
+        'tables': lambda path, n: make_tables(path, n, rng_for('tables')),
+        'scanned': lambda path, n: make_scanned(path, n, rng_for('scanned')),
+        'annotated': lambda path, n: make_annotated(path, n, counts['annotations_per_page'],
+                                                    rng_for('annotated')),
+    }
+    for kind in DOCUMENT_KINDS:
+        if kind not in kinds:
+            continue
+        report(f"{kind}.pdf: {counts[kind]} pages")
+        path = os.path.join(output_dir, f"{kind}.pdf")
+        builders[kind](path, counts[kind])
+        files.append(_file_entry(output_dir, path, kind))
+
+    if 'parts' in kinds:
+        parts_dir = os.path.join(output_dir, "parts")
+        encrypted_dir = os.path.join(output_dir, "encrypted")
+        os.makedirs(parts_dir, exist_ok=True)
+        os.makedirs(encrypted_dir, exist_ok=True)
+        report(f"parts/ and encrypted/: {counts['parts']} documents of {counts['part_pages']} pages")
+
+        sources = []
+        for n in range(1, counts['parts'] + 1):
+            name = f"part_{n:04d}"
+            path = os.path.join(parts_dir, f"{name}.pdf")
+            make_part(path, counts['part_pages'], rng_for(name), name)
+            files.append(_file_entry(output_dir, path, 'part'))
+            sources.append(path)
+        if 'text' in kinds:
+            sources.append(os.path.join(output_dir, "text.pdf"))
+
+        password_rng = rng_for('passwords')
+        passwords: Dict[str, str] = {}
+        for source in sources:
+            name = os.path.basename(source)
+            passwords[name] = make_password(password_rng)
+            path = os.path.join(encrypted_dir, name)
+            encrypt_copy(source, path, passwords[name])
+            files.append(_file_entry(output_dir, path, 'encrypted', passwords[name]))
+
+        with open(os.path.join(encrypted_dir, PASSWORDS_NAME), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["filename", "password"])
+            writer.writerows(passwords.items())
+
+    manifest = {
+        'version': FORMAT_VERSION,
+        'scale': scale,
+        'seed': seed,
+        'counts': counts,
+        'total_pages': sum(entry['pages'] for entry in files),
+        'total_bytes': sum(entry['bytes'] for entry in files),
+        'seconds': round(time.perf_counter() - start, 2),
+        'files': files,
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(corpus_dir: str) -> dict:
+    """Read the manifest written by generate_corpus"""
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic PDF corpus")
+    parser.add_argument("output_dir", help="Folder for the corpus (created if missing)")
+    parser.add_argument("--scale", choices=list(SCALES), default="medium",
+                        help="Corpus size (default: medium)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--only", choices=KINDS, action="append",
+                        help="Generate only this kind (repeatable; 'parts' includes encrypted/)")
+    parser.add_argument("--pages", type=int,
+                        help="Pages in each single-document kind, overriding the scale")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = generate_corpus(args.output_dir, args.scale, args.seed, args.only, args.pages,
+                                   progress_callback=lambda message: print(f"  {message}"))
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {len(manifest['files'])} file(s), {manifest['total_pages']:,} pages, "
+          f"{manifest['total_bytes'] / (1024 * 1024):.1f} MB in {manifest['seconds']:.1f}s "
+          f"to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,21 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from tkinter.scrolledtext import ScrolledText
 import os
-from typing import List, Optional
+import io
+import queue
+import threading
+from typing import Iterable, List, Optional
 try:
     from pypdf import PdfReader, PdfWriter, Transformation
-    from pypdf.generic import RectangleObject
+    from pypdf.generic import RectangleObject, DictionaryObject, NameObject, NumberObject
 except ImportError:
     messagebox.showerror("Import Error",
                         "pypdf library not found. Please install it using:\npip install pypdf")
     exit(1)
 
+from pdf_batch_encrypt import encrypt_folder, load_password_map, validate_template
+from pdf_engine import PageRangeSet, write_pages
+
 
 class PDFEditorApp:
     """Main PDF Editor Application Class"""
@@ -74,6 +80,8 @@ class PDFEditorApp:
                   command=self.crop_pages, width=20).pack(pady=2)
         ttk.Button(edit_frame, text="Encrypt PDF",
                   command=self.encrypt_pdf, width=20).pack(pady=2)
+        ttk.Button(edit_frame, text="Batch Encrypt...",
+                  command=self.batch_encrypt_pdfs, width=20).pack(pady=2)
 
         # Text Operations Section
         text_frame = ttk.LabelFrame(left_panel, text="Text Operations", padding="10")
@@ -194,14 +202,10 @@ class PDFEditorApp:
 
             self.update_status("Merging PDFs...")
 
-            # Create new writer
-            merger = PdfWriter()
-
-            # Add all pages from all PDFs
+            # Collect all pages from all PDFs
+            pages = []
             for file_path in file_paths:
-                reader = PdfReader(file_path)
-                for page in reader.pages:
-                    merger.add_page(page)
+                pages.extend(PdfReader(file_path).pages)
 
             # Save merged PDF
             output_path = filedialog.asksaveasfilename(
@@ -211,8 +215,7 @@ class PDFEditorApp:
             )
 
             if output_path:
-                with open(output_path, "wb") as output_file:
-                    merger.write(output_file)
+                write_pages(pages, output_path)
 
                 self.update_status("Merge completed")
                 messagebox.showinfo("Success",
@@ -251,11 +254,8 @@ class PDFEditorApp:
             if mode == "individual":
                 # Split into individual pages
                 for i, page in enumerate(self.pdf_reader.pages, 1):
-                    writer = PdfWriter()
-                    writer.add_page(page)
                     output_path = os.path.join(output_dir, f"{base_name}_page_{i}.pdf")
-                    with open(output_path, "wb") as output_file:
-                        writer.write(output_file)
+                    write_pages([page], output_path)
 
                 messagebox.showinfo("Success",
                                   f"Split into {len(self.pdf_reader.pages)} individual pages")
@@ -263,15 +263,10 @@ class PDFEditorApp:
             elif mode == "range":
                 # Split by range
                 ranges = split_dialog.result['ranges']
-                for idx, (start, end) in enumerate(ranges, 1):
-                    writer = PdfWriter()
-                    for i in range(start - 1, end):
-                        if i < len(self.pdf_reader.pages):
-                            writer.add_page(self.pdf_reader.pages[i])
+                for idx, part in enumerate(ranges, 1):
                     output_path = os.path.join(output_dir,
-                                              f"{base_name}_part_{idx}_pages_{start}-{end}.pdf")
-                    with open(output_path, "wb") as output_file:
-                        writer.write(output_file)
+                                              f"{base_name}_part_{idx}_pages_{part.first + 1}-{part.last + 1}.pdf")
+                    write_pages((self.pdf_reader.pages[i] for i in part), output_path)
 
                 messagebox.showinfo("Success", f"Split into {len(ranges)} parts")
 
@@ -298,15 +293,22 @@ class PDFEditorApp:
             angle = rotate_dialog.result['angle']
             pages = rotate_dialog.result['pages']
 
+            if rotate_dialog.result['in_place']:
+                self.previous_xref(self.current_pdf_path, self.pdf_reader)
+
             self.update_status("Rotating pages...")
 
-            # Create new PDF with rotated pages
-            writer = PdfWriter()
+            for i in pages:
+                self.pdf_reader.pages[i].rotate(angle)
 
-            for i, page in enumerate(self.pdf_reader.pages):
-                if i + 1 in pages:
-                    page.rotate(angle)
-                writer.add_page(page)
+            if rotate_dialog.result['in_place']:
+                appended = self.save_in_place(pages)
+                self.update_status("Rotation completed")
+                messagebox.showinfo("Success",
+                                  f"Pages rotated by {angle} degrees\n"
+                                  f"Updated in place: {self.current_pdf_path}\n"
+                                  f"({appended:,} bytes appended)")
+                return
 
             # Save rotated PDF
             output_path = filedialog.asksaveasfilename(
@@ -316,8 +318,7 @@ class PDFEditorApp:
             )
 
             if output_path:
-                with open(output_path, "wb") as output_file:
-                    writer.write(output_file)
+                write_pages(self.pdf_reader.pages, output_path)
 
                 self.update_status("Rotation completed")
                 messagebox.showinfo("Success",
@@ -349,27 +350,35 @@ class PDFEditorApp:
             right = crop_dialog.result['right']
             top = crop_dialog.result['top']
 
+            if crop_dialog.result['in_place']:
+                self.previous_xref(self.current_pdf_path, self.pdf_reader)
+
             self.update_status("Cropping pages...")
 
-            # Create new PDF with cropped pages
-            writer = PdfWriter()
+            for i in pages:
+                page = self.pdf_reader.pages[i]
 
-            for i, page in enumerate(self.pdf_reader.pages):
-                if i + 1 in pages:
-                    # Get current mediabox
-                    media_box = page.mediabox
+                # Get current mediabox
+                media_box = page.mediabox
 
-                    # Calculate new coordinates
-                    new_left = float(media_box.left) + left
-                    new_bottom = float(media_box.bottom) + bottom
-                    new_right = float(media_box.right) - right
-                    new_top = float(media_box.top) - top
+                # Calculate new coordinates
+                new_left = float(media_box.left) + left
+                new_bottom = float(media_box.bottom) + bottom
+                new_right = float(media_box.right) - right
+                new_top = float(media_box.top) - top
 
-                    # Apply crop
-                    page.mediabox.lower_left = (new_left, new_bottom)
-                    page.mediabox.upper_right = (new_right, new_top)
+                # Apply crop
+                page.mediabox.lower_left = (new_left, new_bottom)
+                page.mediabox.upper_right = (new_right, new_top)
 
-                writer.add_page(page)
+            if crop_dialog.result['in_place']:
+                appended = self.save_in_place(pages)
+                self.update_status("Cropping completed")
+                messagebox.showinfo("Success",
+                                  f"Pages cropped successfully\n"
+                                  f"Updated in place: {self.current_pdf_path}\n"
+                                  f"({appended:,} bytes appended)")
+                return
 
             # Save cropped PDF
             output_path = filedialog.asksaveasfilename(
@@ -379,8 +388,7 @@ class PDFEditorApp:
             )
 
             if output_path:
-                with open(output_path, "wb") as output_file:
-                    writer.write(output_file)
+                write_pages(self.pdf_reader.pages, output_path)
 
                 self.update_status("Cropping completed")
                 messagebox.showinfo("Success",
@@ -456,6 +464,84 @@ class PDFEditorApp:
             messagebox.showerror("Error", f"Failed to encrypt PDF:\n{str(e)}")
             self.update_status("Error encrypting PDF")
 
+    def batch_encrypt_pdfs(self):
+        """Encrypt a folder of PDFs with AES-256 using a process pool"""
+        try:
+            batch_dialog = BatchEncryptDialog(self.root)
+            self.root.wait_window(batch_dialog.dialog)
+
+            if not batch_dialog.result:
+                return
+
+            options = batch_dialog.result
+            password_map = None
+            if options['password_csv']:
+                password_map = load_password_map(options['password_csv'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to batch encrypt PDFs:\n{str(e)}")
+            self.update_status("Error batch encrypting PDFs")
+            return
+
+        self.update_status("Batch encrypting PDFs...")
+
+        # The batch runs on a background thread (fanned out over a process pool)
+        # so the window stays responsive; progress comes back through a queue
+        messages: queue.Queue = queue.Queue()
+        outcome = {}
+
+        def run():
+            try:
+                outcome['manifest'] = encrypt_folder(
+                    options['input_dir'], options['output_dir'],
+                    password_template=options['password_template'],
+                    password_map=password_map,
+                    owner_password=options['owner_password'],
+                    workers=options['workers'],
+                    progress_callback=lambda done, total: messages.put(
+                        f"Batch encrypting PDFs... {done}/{total}"))
+            except Exception as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+
+        def poll():
+            while not messages.empty():
+                self.update_status(messages.get_nowait())
+
+            if worker.is_alive():
+                self.root.after(100, poll)
+                return
+
+            self._finish_batch_encrypt(options, outcome)
+
+        poll()
+
+    def _finish_batch_encrypt(self, options: dict, outcome: dict):
+        """Report the result of a background batch encryption"""
+        if 'error' in outcome:
+            messagebox.showerror("Error", f"Failed to batch encrypt PDFs:\n{str(outcome['error'])}")
+            self.update_status("Error batch encrypting PDFs")
+            return
+
+        # Show per-file results in the info panel
+        manifest = outcome['manifest']
+        lines = ["=" * 50, "BATCH ENCRYPTION RESULTS", "=" * 50]
+        for entry in manifest['files']:
+            name = os.path.basename(entry['input'])
+            if entry['status'] == 'ok':
+                lines.append(f"OK       {name} ({entry['pages']} pages, {entry['seconds']:.2f}s)")
+            else:
+                lines.append(f"{entry['status'].upper():8} {name}: {entry['error']}")
+        self.update_info_display("\n".join(lines))
+
+        self.update_status("Batch encryption completed")
+        messagebox.showinfo("Batch Encryption",
+                          f"Encrypted {manifest['succeeded']} of {manifest['total']} file(s) "
+                          f"in {manifest['seconds']:.1f}s\n"
+                          f"Failed: {manifest['failed']}, Skipped: {manifest['skipped']}\n\n"
+                          f"Manifest saved to: {options['output_dir']}")
+
     def extract_text(self):
         """Extract text from PDF pages"""
         if not self.pdf_reader:
@@ -473,11 +559,8 @@ class PDFEditorApp:
                 return
 
             # Parse page range
-            if page_range.lower() == 'all':
-                pages_to_extract = list(range(len(self.pdf_reader.pages)))
-            else:
-                pages_to_extract = self.parse_page_range(page_range,
-                                                         len(self.pdf_reader.pages))
+            pages_to_extract = self.parse_page_range(page_range,
+                                                     len(self.pdf_reader.pages))
 
             self.update_status("Extracting text...")
 
@@ -548,7 +631,7 @@ class PDFEditorApp:
                 writer = PdfWriter()
 
                 for i, page in enumerate(self.pdf_reader.pages):
-                    if i + 1 in pages:
+                    if i in pages:
                         # Create overlay
                         packet = io.BytesIO()
                         can = canvas.Canvas(packet)
@@ -640,24 +723,102 @@ class PDFEditorApp:
             messagebox.showerror("Error", f"Failed to save PDF:\n{str(e)}")
             self.update_status("Error saving PDF")
 
+    def save_in_place(self, pages: Iterable[int]) -> int:
+        """Append modified pages to the loaded file and reload it"""
+        appended = self.append_incremental_update(self.current_pdf_path,
+                                                  self.pdf_reader, pages)
+
+        self.pdf_reader = PdfReader(self.current_pdf_path)
+        self.loaded_pages = list(range(len(self.pdf_reader.pages)))
+        self.update_info_display(self.get_pdf_info())
+        return appended
+
     @staticmethod
-    def parse_page_range(range_str: str, total_pages: int) -> List[int]:
-        """Parse page range string into list of page indices"""
-        pages = []
-
-        for part in range_str.split(','):
-            part = part.strip()
-            if '-' in part:
-                start, end = part.split('-')
-                start = int(start.strip())
-                end = int(end.strip())
-                pages.extend(range(start - 1, end))
-            else:
-                pages.append(int(part) - 1)
+    def previous_xref(file_path: str, reader: PdfReader, block_size: int = 65536) -> int:
+        """Offset of the last cross-reference section of file_path, for an
+        incremental update; raises ValueError if the file cannot take one.
+
+        Called before any page is changed, so a refused in-place update leaves
+        the loaded document as it was. startxref is searched for backwards
+        through the whole file, past trailing comments or padding.
+        """
+        if reader.is_encrypted:
+            raise ValueError("In-place update is not supported for encrypted PDFs")
+
+        marker = b"startxref"
+        with open(file_path, "rb") as f:
+            # Markers starting before end have not been looked at yet
+            end = f.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(end - block_size, 0)
+                f.seek(start)
+                # Read on past end so a marker (and its offset) split between blocks is seen
+                block = f.read(end - start + len(marker) + 32)
+                pos = block.rfind(marker, 0, end - start - 1 + len(marker))
+                if pos < 0:
+                    end = start
+                    continue
+                fields = block[pos + len(marker):].split()
+                if fields and fields[0].isdigit():
+                    return int(fields[0])
+                end = start + pos
+        raise ValueError("Could not find startxref in PDF file")
 
-        # Validate and filter pages
-        pages = [p for p in pages if 0 <= p < total_pages]
-        return sorted(list(set(pages)))
+    @staticmethod
+    def append_incremental_update(file_path: str, reader: PdfReader,
+                                  pages: Iterable[int]) -> int:
+        """Append the given (already modified) page objects to file_path as a PDF
+        incremental update and return the number of bytes written.
+
+        Only the page dictionaries (/Rotate, /MediaBox, ...) are rewritten; content
+        streams, images and untouched pages stay where they are in the file.
+        """
+        prev_xref = PDFEditorApp.previous_xref(file_path, reader)
+        file_size = os.path.getsize(file_path)
+
+        update = io.BytesIO()
+        update.write(b"\n")
+
+        # Write new versions of the modified page objects
+        offsets = {}
+        for i in pages:
+            ref = reader.pages[i].indirect_reference
+            offsets[ref.idnum] = (file_size + update.tell(), ref.generation)
+            update.write(f"{ref.idnum} {ref.generation} obj\n".encode())
+            reader.pages[i].write_to_stream(update)
+            update.write(b"\nendobj\n")
+
+        if not offsets:
+            return 0
+
+        # Cross-reference section covering only the rewritten objects
+        xref_offset = file_size + update.tell()
+        update.write(b"xref\n")
+        for idnum in sorted(offsets):
+            offset, generation = offsets[idnum]
+            update.write(f"{idnum} 1\n{offset:010d} {generation:05d} n \n".encode())
+
+        trailer = DictionaryObject()
+        trailer[NameObject("/Size")] = NumberObject(max(int(reader.trailer["/Size"]),
+                                                        max(offsets) + 1))
+        trailer[NameObject("/Prev")] = NumberObject(prev_xref)
+        for key in ("/Root", "/Info", "/ID"):
+            if key in reader.trailer:
+                trailer[NameObject(key)] = reader.trailer.raw_get(key)
+
+        update.write(b"trailer\n")
+        trailer.write_to_stream(update)
+        update.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+
+        with open(file_path, "ab") as f:
+            f.write(update.getvalue())
+
+        return update.tell()
+
+    @staticmethod
+    def parse_page_range(range_str: str, total_pages: int) -> PageRangeSet:
+        """Parse page range string into a set of page indices"""
+        return PageRangeSet.parse(range_str, total_pages)
 
 
 class SplitDialog:
@@ -665,6 +826,7 @@ class SplitDialog:
 
     def __init__(self, parent, total_pages):
         self.result = None
+        self.total_pages = total_pages
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Split PDF")
         self.dialog.geometry("400x300")
@@ -705,14 +867,16 @@ class SplitDialog:
                 messagebox.showwarning("Warning", "Please enter page ranges")
                 return
             try:
-                # Parse ranges
+                # Parse ranges - each comma-separated part becomes one output file
                 ranges = []
                 for part in range_str.split(','):
-                    start, end = part.split('-')
-                    ranges.append((int(start.strip()), int(end.strip())))
+                    page_set = PageRangeSet.parse(part, self.total_pages)
+                    if not page_set:
+                        raise ValueError(f"Range '{part.strip()}' has no pages in this document")
+                    ranges.append(page_set)
                 self.result['ranges'] = ranges
-            except:
-                messagebox.showerror("Error", "Invalid range format")
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
                 return
 
         self.dialog.destroy()
@@ -729,7 +893,7 @@ class RotateDialog:
         self.result = None
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Rotate Pages")
-        self.dialog.geometry("400x250")
+        self.dialog.geometry("400x300")
 
         ttk.Label(self.dialog, text=f"Total Pages: {total_pages}",
                  font=('Arial', 10, 'bold')).pack(pady=10)
@@ -754,6 +918,11 @@ class RotateDialog:
         self.page_entry.insert(0, "all")
         self.page_entry.pack(fill=tk.X, pady=5)
 
+        # In-place update (appends only the changed page objects)
+        self.in_place_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(page_frame, text="Update original file in place",
+                       variable=self.in_place_var).pack(anchor=tk.W)
+
         # Buttons
         button_frame = ttk.Frame(self.dialog, padding="10")
         button_frame.pack(side=tk.BOTTOM, fill=tk.X)
@@ -768,19 +937,10 @@ class RotateDialog:
         page_str = self.page_entry.get().strip()
 
         try:
-            if page_str.lower() == 'all':
-                pages = list(range(1, self.total_pages + 1))
-            else:
-                pages = []
-                for part in page_str.split(','):
-                    part = part.strip()
-                    if '-' in part:
-                        start, end = part.split('-')
-                        pages.extend(range(int(start), int(end) + 1))
-                    else:
-                        pages.append(int(part))
-
-            self.result = {'angle': angle, 'pages': pages}
+            pages = PageRangeSet.parse(page_str, self.total_pages)
+
+            self.result = {'angle': angle, 'pages': pages,
+                           'in_place': self.in_place_var.get()}
             self.dialog.destroy()
 
         except Exception as e:
@@ -798,7 +958,7 @@ class CropDialog:
         self.result = None
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Crop Pages")
-        self.dialog.geometry("400x350")
+        self.dialog.geometry("400x380")
 
         ttk.Label(self.dialog, text=f"Total Pages: {total_pages}",
                  font=('Arial', 10, 'bold')).pack(pady=10)
@@ -829,6 +989,11 @@ class CropDialog:
         self.page_entry.insert(0, "all")
         self.page_entry.pack(fill=tk.X, pady=5)
 
+        # In-place update (appends only the changed page objects)
+        self.in_place_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(page_frame, text="Update original file in place",
+                       variable=self.in_place_var).pack(anchor=tk.W)
+
         # Buttons
         button_frame = ttk.Frame(self.dialog, padding="10")
         button_frame.pack(side=tk.BOTTOM, fill=tk.X)
@@ -848,24 +1013,15 @@ class CropDialog:
 
             # Get pages
             page_str = self.page_entry.get().strip()
-            if page_str.lower() == 'all':
-                pages = list(range(1, self.total_pages + 1))
-            else:
-                pages = []
-                for part in page_str.split(','):
-                    part = part.strip()
-                    if '-' in part:
-                        start, end = part.split('-')
-                        pages.extend(range(int(start), int(end) + 1))
-                    else:
-                        pages.append(int(part))
+            pages = PageRangeSet.parse(page_str, self.total_pages)
 
             self.result = {
                 'left': left,
                 'bottom': bottom,
                 'right': right,
                 'top': top,
-                'pages': pages
+                'pages': pages,
+                'in_place': self.in_place_var.get()
             }
             self.dialog.destroy()
 
@@ -930,6 +1086,127 @@ class EncryptDialog:
         self.dialog.destroy()
 
 
+class BatchEncryptDialog:
+    """Dialog for batch encryption options"""
+
+    def __init__(self, parent):
+        self.result = None
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Batch Encrypt PDFs")
+        self.dialog.geometry("480x420")
+
+        ttk.Label(self.dialog, text="Batch AES-256 Encryption",
+                 font=('Arial', 12, 'bold')).pack(pady=10)
+
+        # Folder inputs
+        folder_frame = ttk.Frame(self.dialog, padding="10")
+        folder_frame.pack(fill=tk.X, padx=20)
+
+        self.input_dir = self._folder_row(folder_frame, "Input Folder:")
+        self.output_dir = self._folder_row(folder_frame, "Output Folder:")
+
+        # Password inputs
+        pwd_frame = ttk.Frame(self.dialog, padding="10")
+        pwd_frame.pack(fill=tk.X, padx=20)
+
+        ttk.Label(pwd_frame, text="Password Template ({stem}, {name}):").pack(anchor=tk.W)
+        self.template_entry = ttk.Entry(pwd_frame, width=40)
+        self.template_entry.pack(fill=tk.X, pady=5)
+
+        ttk.Label(pwd_frame, text="Per-file Passwords CSV (optional):").pack(anchor=tk.W)
+        csv_frame = ttk.Frame(pwd_frame)
+        csv_frame.pack(fill=tk.X, pady=5)
+        self.csv_entry = ttk.Entry(csv_frame, width=32)
+        self.csv_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(csv_frame, text="Browse", command=self.browse_csv).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(pwd_frame, text="Owner Password (optional):").pack(anchor=tk.W)
+        self.owner_pwd = ttk.Entry(pwd_frame, show="*", width=40)
+        self.owner_pwd.pack(fill=tk.X, pady=5)
+
+        workers_frame = ttk.Frame(pwd_frame)
+        workers_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(workers_frame, text="Worker Processes:").pack(side=tk.LEFT)
+        self.workers_var = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Spinbox(workers_frame, from_=1, to=64, textvariable=self.workers_var,
+                   width=6).pack(side=tk.LEFT, padx=5)
+
+        # Buttons
+        button_frame = ttk.Frame(self.dialog, padding="10")
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X)
+
+        ttk.Button(button_frame, text="Encrypt", command=self.ok).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
+
+    def _folder_row(self, parent, label):
+        """Create a labelled folder entry with a Browse button"""
+        ttk.Label(parent, text=label).pack(anchor=tk.W)
+        row = ttk.Frame(parent)
+        row.pack(fill=tk.X, pady=5)
+        entry = ttk.Entry(row, width=32)
+        entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        def browse():
+            folder = filedialog.askdirectory(title=f"Select {label.rstrip(':')}")
+            if folder:
+                entry.delete(0, tk.END)
+                entry.insert(0, folder)
+
+        ttk.Button(row, text="Browse", command=browse).pack(side=tk.LEFT, padx=5)
+        return entry
+
+    def browse_csv(self):
+        csv_path = filedialog.askopenfilename(
+            title="Select Password CSV",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if csv_path:
+            self.csv_entry.delete(0, tk.END)
+            self.csv_entry.insert(0, csv_path)
+
+    def ok(self):
+        input_dir = self.input_dir.get().strip()
+        output_dir = self.output_dir.get().strip()
+        template = self.template_entry.get().strip()
+        password_csv = self.csv_entry.get().strip()
+
+        if not input_dir or not output_dir:
+            messagebox.showwarning("Warning", "Please select input and output folders")
+            return
+
+        if not template and not password_csv:
+            messagebox.showwarning("Warning",
+                                 "Please enter a password template or select a password CSV")
+            return
+
+        if template:
+            try:
+                validate_template(template)
+            except ValueError as e:
+                messagebox.showwarning("Warning", str(e))
+                return
+
+        try:
+            workers = int(self.workers_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Invalid number of worker processes")
+            return
+
+        self.result = {
+            'input_dir': input_dir,
+            'output_dir': output_dir,
+            'password_template': template or None,
+            'password_csv': password_csv or None,
+            'owner_password': self.owner_pwd.get() or None,
+            'workers': workers
+        }
+        self.dialog.destroy()
+
+    def cancel(self):
+        self.result = None
+        self.dialog.destroy()
+
+
 class TextOverlayDialog:
     """Dialog for text overlay options"""
 
@@ -1009,17 +1286,7 @@ class TextOverlayDialog:
 
             # Get pages
             page_str = self.page_entry.get().strip()
-            if page_str.lower() == 'all':
-                pages = list(range(1, self.total_pages + 1))
-            else:
-                pages = []
-                for part in page_str.split(','):
-                    part = part.strip()
-                    if '-' in part:
-                        start, end = part.split('-')
-                        pages.extend(range(int(start), int(end) + 1))
-                    else:
-                        pages.append(int(part))
+            pages = PageRangeSet.parse(page_str, self.total_pages)
 
             self.result = {
                 'text': text,
@@ -7,282 +7,14 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser, simpledialog
 from tkinter.scrolledtext import ScrolledText
 import fitz  # PyMuPDF
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk, ImageDraw
 import io
 from typing import Optional, List, Tuple, Dict
 import os
-from datetime import datetime
-import base64
-
-
-class Annotation:
-    """Base class for all annotations"""
-    def __init__(self, page_num: int):
-        self.page_num = page_num
-        self.selected = False
-
-    def draw(self, draw, zoom_level):
-        """Draw the annotation on PIL ImageDraw"""
-        pass
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        """Check if point is within annotation"""
-        return False
-
-
-class TextAnnotation(Annotation):
-    """Text annotation"""
-    def __init__(self, page_num: int, x: float, y: float, text: str,
-                 fontsize: int = 12, color: Tuple[float, float, float] = (0, 0, 0),
-                 fontname: str = "helv"):
-        super().__init__(page_num)
-        self.x = x
-        self.y = y
-        self.text = text
-        self.fontsize = fontsize
-        self.color = color
-        self.fontname = fontname
-
-    def draw(self, draw, zoom_level):
-        x = self.x * zoom_level
-        y = self.y * zoom_level
-        size = int(self.fontsize * zoom_level)
 
-        try:
-            font = ImageFont.truetype("arial.ttf", size)
-        except:
-            font = ImageFont.load_default()
-
-        color = tuple(int(c * 255) for c in self.color)
-        draw.text((x, y - size), self.text, fill=color, font=font)
-
-        if self.selected:
-            bbox = draw.textbbox((x, y - size), self.text, font=font)
-            draw.rectangle(bbox, outline="blue", width=2)
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        annot_x = self.x * zoom
-        annot_y = self.y * zoom
-        text_width = len(self.text) * self.fontsize * zoom * 0.6
-        text_height = self.fontsize * zoom * 1.2
-
-        return (annot_x <= x <= annot_x + text_width and
-                annot_y - text_height <= y <= annot_y)
-
-
-class SignatureAnnotation(Annotation):
-    """Electronic signature annotation"""
-    def __init__(self, page_num: int, x: float, y: float,
-                 signature_data: bytes, width: float = 150, height: float = 50):
-        super().__init__(page_num)
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.signature_data = signature_data  # PNG image data
-        self.image = None
-        self._load_image()
-
-    def _load_image(self):
-        """Load signature image from bytes"""
-        self.image = Image.open(io.BytesIO(self.signature_data))
-
-    def draw(self, draw, zoom_level):
-        x = int(self.x * zoom_level)
-        y = int(self.y * zoom_level)
-        w = int(self.width * zoom_level)
-        h = int(self.height * zoom_level)
-
-        # Resize signature
-        sig_resized = self.image.resize((w, h), Image.Resampling.LANCZOS)
-
-        # Get the image we're drawing on
-        img = draw._image
-        img.paste(sig_resized, (x, y), sig_resized if sig_resized.mode == 'RGBA' else None)
-
-        if self.selected:
-            draw.rectangle([x, y, x + w, y + h], outline="blue", width=2)
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        sx = self.x * zoom
-        sy = self.y * zoom
-        sw = self.width * zoom
-        sh = self.height * zoom
-        return sx <= x <= sx + sw and sy <= y <= sy + sh
-
-
-class ShapeAnnotation(Annotation):
-    """Shape annotation (rectangle, circle, line, arrow)"""
-    def __init__(self, page_num: int, x1: float, y1: float, x2: float, y2: float,
-                 shape_type: str = "rectangle", color: Tuple[int, int, int] = (255, 0, 0),
-                 thickness: int = 2, fill: bool = False):
-        super().__init__(page_num)
-        self.x1 = x1
-        self.y1 = y1
-        self.x2 = x2
-        self.y2 = y2
-        self.shape_type = shape_type  # rectangle, circle, line, arrow
-        self.color = color
-        self.thickness = thickness
-        self.fill = fill
-
-    def draw(self, draw, zoom_level):
-        x1 = int(self.x1 * zoom_level)
-        y1 = int(self.y1 * zoom_level)
-        x2 = int(self.x2 * zoom_level)
-        y2 = int(self.y2 * zoom_level)
-        thickness = max(1, int(self.thickness * zoom_level))
-
-        if self.shape_type == "rectangle":
-            if self.fill:
-                draw.rectangle([x1, y1, x2, y2], fill=self.color, outline=self.color, width=thickness)
-            else:
-                draw.rectangle([x1, y1, x2, y2], outline=self.color, width=thickness)
-
-        elif self.shape_type == "circle":
-            if self.fill:
-                draw.ellipse([x1, y1, x2, y2], fill=self.color, outline=self.color, width=thickness)
-            else:
-                draw.ellipse([x1, y1, x2, y2], outline=self.color, width=thickness)
-
-        elif self.shape_type == "line":
-            draw.line([x1, y1, x2, y2], fill=self.color, width=thickness)
-
-        elif self.shape_type == "arrow":
-            # Draw line
-            draw.line([x1, y1, x2, y2], fill=self.color, width=thickness)
-            # Draw arrowhead
-            import math
-            angle = math.atan2(y2 - y1, x2 - x1)
-            arrow_size = 10 * zoom_level
-            left_angle = angle + 2.7
-            right_angle = angle - 2.7
-            left_x = x2 - arrow_size * math.cos(left_angle)
-            left_y = y2 - arrow_size * math.sin(left_angle)
-            right_x = x2 - arrow_size * math.cos(right_angle)
-            right_y = y2 - arrow_size * math.sin(right_angle)
-            draw.polygon([x2, y2, left_x, left_y, right_x, right_y], fill=self.color)
-
-        if self.selected:
-            draw.rectangle([min(x1, x2) - 2, min(y1, y2) - 2,
-                          max(x1, x2) + 2, max(y1, y2) + 2],
-                          outline="blue", width=2)
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        sx1, sy1 = self.x1 * zoom, self.y1 * zoom
-        sx2, sy2 = self.x2 * zoom, self.y2 * zoom
-        margin = 5
-        return (min(sx1, sx2) - margin <= x <= max(sx1, sx2) + margin and
-                min(sy1, sy2) - margin <= y <= max(sy1, sy2) + margin)
-
-
-class HighlightAnnotation(Annotation):
-    """Highlight annotation"""
-    def __init__(self, page_num: int, x1: float, y1: float, x2: float, y2: float,
-                 color: Tuple[int, int, int] = (255, 255, 0)):
-        super().__init__(page_num)
-        self.x1 = x1
-        self.y1 = y1
-        self.x2 = x2
-        self.y2 = y2
-        self.color = color
-
-    def draw(self, draw, zoom_level):
-        x1 = int(self.x1 * zoom_level)
-        y1 = int(self.y1 * zoom_level)
-        x2 = int(self.x2 * zoom_level)
-        y2 = int(self.y2 * zoom_level)
-
-        # Create semi-transparent overlay
-        overlay = Image.new('RGBA', draw._image.size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        color_with_alpha = (*self.color, 100)  # 40% opacity
-        overlay_draw.rectangle([x1, y1, x2, y2], fill=color_with_alpha)
-
-        # Composite onto main image
-        draw._image.paste(Image.alpha_composite(draw._image.convert('RGBA'), overlay).convert('RGB'))
-
-        if self.selected:
-            draw.rectangle([x1, y1, x2, y2], outline="blue", width=2)
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        sx1, sy1 = self.x1 * zoom, self.y1 * zoom
-        sx2, sy2 = self.x2 * zoom, self.y2 * zoom
-        return (min(sx1, sx2) <= x <= max(sx1, sx2) and
-                min(sy1, sy2) <= y <= max(sy1, sy2))
-
-
-class StampAnnotation(Annotation):
-    """Stamp annotation (Approved, Confidential, etc.)"""
-    def __init__(self, page_num: int, x: float, y: float, stamp_type: str = "approved"):
-        super().__init__(page_num)
-        self.x = x
-        self.y = y
-        self.stamp_type = stamp_type
-        self.width = 100
-        self.height = 40
-
-    def draw(self, draw, zoom_level):
-        x = int(self.x * zoom_level)
-        y = int(self.y * zoom_level)
-        w = int(self.width * zoom_level)
-        h = int(self.height * zoom_level)
-
-        # Define stamp styles
-        stamps = {
-            "approved": ("APPROVED", (0, 150, 0)),
-            "rejected": ("REJECTED", (200, 0, 0)),
-            "confidential": ("CONFIDENTIAL", (200, 0, 0)),
-            "draft": ("DRAFT", (128, 128, 128)),
-            "final": ("FINAL", (0, 0, 200)),
-            "reviewed": ("REVIEWED", (150, 0, 150)),
-        }
-
-        text, color = stamps.get(self.stamp_type, ("APPROVED", (0, 150, 0)))
-
-        # Draw rounded rectangle
-        draw.rounded_rectangle([x, y, x + w, y + h], radius=5,
-                              outline=color, width=3)
-
-        # Draw text
-        try:
-            font_size = int(16 * zoom_level)
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
-
-        # Center text
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
-        text_x = x + (w - text_w) // 2
-        text_y = y + (h - text_h) // 2
-
-        draw.text((text_x, text_y), text, fill=color, font=font)
-
-        # Add date
-        date_text = datetime.now().strftime("%Y-%m-%d")
-        try:
-            date_font = ImageFont.truetype("arial.ttf", int(10 * zoom_level))
-        except:
-            date_font = ImageFont.load_default()
-
-        bbox = draw.textbbox((0, 0), date_text, font=date_font)
-        date_w = bbox[2] - bbox[0]
-        date_x = x + (w - date_w) // 2
-        date_y = y + h + 2
-        draw.text((date_x, date_y), date_text, fill=color, font=date_font)
-
-        if self.selected:
-            draw.rectangle([x - 2, y - 2, x + w + 2, y + h + 15],
-                          outline="blue", width=2)
-
-    def contains_point(self, x: float, y: float, zoom: float) -> bool:
-        sx = self.x * zoom
-        sy = self.y * zoom
-        sw = self.width * zoom
-        sh = self.height * zoom + 15
-        return sx <= x <= sx + sw and sy <= y <= sy + sh
+from pdf_engine import (Annotation, TextAnnotation, SignatureAnnotation, ShapeAnnotation,
+                        HighlightAnnotation, StampAnnotation, render_page, draw_annotations,
+                        apply_annotations, open_document, save_document)
 
 
 class SignaturePad(tk.Toplevel):
@@ -692,7 +424,7 @@ class EnhancedPDFEditor:
             if self.pdf_document:
                 self.pdf_document.close()
 
-            self.pdf_document = fitz.open(file_path)
+            self.pdf_document = open_document(file_path)
             self.pdf_path = file_path
             self.total_pages = len(self.pdf_document)
             self.current_page_num = 0
@@ -714,21 +446,15 @@ class EnhancedPDFEditor:
             return
 
         try:
-            page = self.pdf_document[self.current_page_num]
-            mat = fitz.Matrix(self.zoom_level, self.zoom_level)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-
-            img_data = pix.tobytes("ppm")
-            img = Image.open(io.BytesIO(img_data))
-
-            # Draw annotations
-            img = self.draw_annotations(img)
+            # Render page and draw annotations
+            img = render_page(self.pdf_document, self.current_page_num,
+                              self.zoom_level, annotations=self.annotations)
 
             self.current_photo = ImageTk.PhotoImage(img)
 
             self.canvas.delete("all")
             self.canvas.create_image(0, 0, anchor=tk.NW, image=self.current_photo)
-            self.canvas.config(scrollregion=(0, 0, pix.width, pix.height))
+            self.canvas.config(scrollregion=(0, 0, img.width, img.height))
 
             self.page_label.config(text=f"{self.current_page_num + 1} / {self.total_pages}")
             self.zoom_label.config(text=f"{int(self.zoom_level * 100)}%")
@@ -738,13 +464,7 @@ class EnhancedPDFEditor:
 
     def draw_annotations(self, img):
         """Draw all annotations on image"""
-        draw = ImageDraw.Draw(img)
-
-        for annot in self.annotations:
-            if annot.page_num == self.current_page_num:
-                annot.draw(draw, self.zoom_level)
-
-        return img
+        return draw_annotations(img, self.annotations, self.current_page_num, self.zoom_level)
 
     def canvas_to_pdf_coords(self, canvas_x: int, canvas_y: int) -> Tuple[float, float]:
         """Convert canvas to PDF coordinates"""
@@ -1012,7 +732,7 @@ class EnhancedPDFEditor:
 
         try:
             self.apply_annotations()
-            self.pdf_document.save(self.pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            save_document(self.pdf_document, self.pdf_path)
             self.update_status("Saved")
             messagebox.showinfo("Success", "PDF saved!")
         except Exception as e:
@@ -1032,7 +752,7 @@ class EnhancedPDFEditor:
         if output_path:
             try:
                 self.apply_annotations()
-                self.pdf_document.save(output_path)
+                save_document(self.pdf_document, output_path)
                 self.pdf_path = output_path
                 self.update_status(f"Saved as: {os.path.basename(output_path)}")
                 messagebox.showinfo("Success", "PDF saved!")
@@ -1041,44 +761,7 @@ class EnhancedPDFEditor:
 
     def apply_annotations(self):
         """Apply annotations to PDF"""
-        for annot in self.annotations:
-            page = self.pdf_document[annot.page_num]
-
-            if isinstance(annot, TextAnnotation):
-                page.insert_text((annot.x, annot.y), annot.text,
-                               fontsize=annot.fontsize, color=annot.color)
-
-            elif isinstance(annot, SignatureAnnotation):
-                # Insert signature as image
-                img_data = annot.signature_data
-                rect = fitz.Rect(annot.x, annot.y,
-                               annot.x + annot.width, annot.y + annot.height)
-                page.insert_image(rect, stream=img_data)
-
-            elif isinstance(annot, ShapeAnnotation):
-                # Draw shapes using PDF annotations
-                rect = fitz.Rect(annot.x1, annot.y1, annot.x2, annot.y2)
-                color = tuple(c / 255.0 for c in annot.color)
-
-                if annot.shape_type == "rectangle":
-                    page.draw_rect(rect, color=color, width=annot.thickness)
-                elif annot.shape_type == "circle":
-                    page.draw_circle((annot.x1 + annot.x2) / 2, (annot.y1 + annot.y2) / 2,
-                                   abs(annot.x2 - annot.x1) / 2, color=color, width=annot.thickness)
-                elif annot.shape_type == "line":
-                    page.draw_line((annot.x1, annot.y1), (annot.x2, annot.y2),
-                                 color=color, width=annot.thickness)
-
-            elif isinstance(annot, HighlightAnnotation):
-                # Add highlight annotation
-                rect = fitz.Rect(annot.x1, annot.y1, annot.x2, annot.y2)
-                color = tuple(c / 255.0 for c in annot.color)
-                page.add_highlight_annot(rect)
-
-            elif isinstance(annot, StampAnnotation):
-                # Add stamp as text
-                page.insert_text((annot.x, annot.y + 20), annot.stamp_type.upper(),
-                               fontsize=16, color=(0, 0.5, 0))
+        apply_annotations(self.pdf_document, self.annotations)
 
 
 def main():
@@ -8,24 +8,20 @@ from tkinter import ttk, filedialog, messagebox, colorchooser, font as tkfont
 from tkinter.scrolledtext import ScrolledText
 import fitz  # PyMuPDF
 from PIL import Image, ImageTk
-import io
 from typing import Optional, List, Tuple, Dict
 import os
 
+import pdf_engine
+from pdf_engine import open_document, render_page, apply_annotations, save_document
 
-class TextAnnotation:
+
+class TextAnnotation(pdf_engine.TextAnnotation):
     """Represents a text annotation on the PDF"""
 
     def __init__(self, page_num: int, x: float, y: float, text: str,
                  fontsize: int = 12, color: Tuple[float, float, float] = (0, 0, 0),
                  fontname: str = "helv"):
-        self.page_num = page_num
-        self.x = x
-        self.y = y
-        self.text = text
-        self.fontsize = fontsize
-        self.color = color  # RGB tuple (0-1 range)
-        self.fontname = fontname
+        super().__init__(page_num, x, y, text, fontsize, color, fontname)
         self.rect = None  # Bounding rectangle (calculated)
 
     def calculate_rect(self, page):
@@ -391,7 +387,7 @@ class InteractivePDFEditor:
                 self.pdf_document.close()
 
             # Open new document
-            self.pdf_document = fitz.open(file_path)
+            self.pdf_document = open_document(file_path)
             self.pdf_path = file_path
             self.total_pages = len(self.pdf_document)
             self.current_page_num = 0
@@ -425,13 +421,8 @@ class InteractivePDFEditor:
             # Create transformation matrix for zoom
             mat = fitz.Matrix(self.zoom_level, self.zoom_level)
 
-            # Render page to pixmap
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            self.current_pixmap = pix
-
-            # Convert to PIL Image
-            img_data = pix.tobytes("ppm")
-            img = Image.open(io.BytesIO(img_data))
+            # Render page to PIL Image
+            img = render_page(self.pdf_document, self.current_page_num, self.zoom_level)
 
             # Draw annotations
             img = self.draw_annotations(img, page, mat)
@@ -444,7 +435,7 @@ class InteractivePDFEditor:
             self.canvas.create_image(0, 0, anchor=tk.NW, image=self.current_photo)
 
             # Update scroll region
-            self.canvas.config(scrollregion=(0, 0, pix.width, pix.height))
+            self.canvas.config(scrollregion=(0, 0, img.width, img.height))
 
             # Update page label
             self.page_label.config(text=f"{self.current_page_num + 1} / {self.total_pages}")
@@ -807,7 +798,7 @@ class InteractivePDFEditor:
 
         try:
             self.apply_annotations_to_pdf()
-            self.pdf_document.save(self.pdf_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+            save_document(self.pdf_document, self.pdf_path)
             self.update_status("PDF saved")
             messagebox.showinfo("Success", "PDF saved successfully!")
 
@@ -831,7 +822,7 @@ class InteractivePDFEditor:
 
         try:
             self.apply_annotations_to_pdf()
-            self.pdf_document.save(output_path)
+            save_document(self.pdf_document, output_path)
             self.pdf_path = output_path
             self.update_status(f"Saved as: {os.path.basename(output_path)}")
             messagebox.showinfo("Success", f"PDF saved to:\n{output_path}")
@@ -841,17 +832,7 @@ class InteractivePDFEditor:
 
     def apply_annotations_to_pdf(self):
         """Apply text annotations to the actual PDF"""
-        for annot in self.text_annotations:
-            page = self.pdf_document[annot.page_num]
-
-            # Insert text at position
-            page.insert_text(
-                (annot.x, annot.y),
-                annot.text,
-                fontsize=annot.fontsize,
-                color=annot.color,
-                fontname=annot.fontname
-            )
+        apply_annotations(self.pdf_document, self.text_annotations)
 
 
 def main():
@@ -0,0 +1,1477 @@
+"""
+PDF Engine
+Headless core shared by the Tk editors: document open/unlock, page rendering,
+the annotation model and its application to PDF pages, saving, and PDF-to-Word
+conversion. Nothing in this module imports tkinter, so batch workers and
+benchmarks can drive the same code without a display.
+
+python-docx, lxml, pypdf and pymupdf4llm are imported by the functions that
+use them, so importing the engine (and starting an editor) does not pay for
+Word conversion or encryption up front; preload() fetches them in the
+background.
+"""
+
+import base64
+import concurrent.futures
+import copy
+import gc
+import hashlib
+import importlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from bisect import bisect_right
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import re
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw, ImageFont
+
+
+class PasswordRequiredError(Exception):
+    """Raised when a PDF stays locked after trying the supplied password"""
+
+
+class ConversionCancelled(Exception):
+    """Raised when a Word conversion is stopped through its cancel event"""
+
+
+# Imported on first use rather than with this module
+LAZY_IMPORTS = ("docx", "lxml.etree", "pypdf", "pymupdf4llm")
+
+
+def preload(modules: Iterable[str] = LAZY_IMPORTS) -> threading.Thread:
+    """Import modules in a daemon thread so their first real use does not wait
+
+    Modules that fail to import are skipped; the error surfaces again when
+    the feature that needs them is used.
+    """
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+
+# ---------------------------------------------------------------------------
+# Annotation model
+# ---------------------------------------------------------------------------
+
+class Annotation:
+    """Base class for all annotations"""
+    def __init__(self, page_num: int):
+        self.page_num = page_num
+        self.selected = False
+
+    def draw(self, draw, zoom_level):
+        pass
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        return False
+
+
+class TextAnnotation(Annotation):
+    """Text annotation"""
+    def __init__(self, page_num: int, x: float, y: float, text: str,
+                 fontsize: int = 12, color: Tuple[float, float, float] = (0, 0, 0),
+                 fontname: str = "helv"):
+        super().__init__(page_num)
+        self.x = x
+        self.y = y
+        self.text = text
+        self.fontsize = fontsize
+        self.color = color
+        self.fontname = fontname
+
+    def draw(self, draw, zoom_level):
+        x = self.x * zoom_level
+        y = self.y * zoom_level
+        size = int(self.fontsize * zoom_level)
+
+        try:
+            font = ImageFont.truetype("arial.ttf", size)
+        except:
+            font = ImageFont.load_default()
+
+        color = tuple(int(c * 255) for c in self.color)
+        draw.text((x, y - size), self.text, fill=color, font=font)
+
+        if self.selected:
+            bbox = draw.textbbox((x, y - size), self.text, font=font)
+            draw.rectangle(bbox, outline="blue", width=2)
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        annot_x = self.x * zoom
+        annot_y = self.y * zoom
+        text_width = len(self.text) * self.fontsize * zoom * 0.6
+        text_height = self.fontsize * zoom * 1.2
+        return (annot_x <= x <= annot_x + text_width and
+                annot_y - text_height <= y <= annot_y)
+
+
+class SignatureAnnotation(Annotation):
+    """Electronic signature annotation"""
+    def __init__(self, page_num: int, x: float, y: float,
+                 signature_data: bytes, width: float = 150, height: float = 50):
+        super().__init__(page_num)
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.signature_data = signature_data
+        self.image = None
+        self._load_image()
+
+    def _load_image(self):
+        """Load signature image from bytes"""
+        self.image = Image.open(io.BytesIO(self.signature_data))
+
+    def draw(self, draw, zoom_level):
+        x = int(self.x * zoom_level)
+        y = int(self.y * zoom_level)
+        w = int(self.width * zoom_level)
+        h = int(self.height * zoom_level)
+
+        sig_resized = self.image.resize((w, h), Image.Resampling.LANCZOS)
+        img = draw._image
+        img.paste(sig_resized, (x, y), sig_resized if sig_resized.mode == 'RGBA' else None)
+
+        if self.selected:
+            draw.rectangle([x, y, x + w, y + h], outline="blue", width=2)
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        sx = self.x * zoom
+        sy = self.y * zoom
+        sw = self.width * zoom
+        sh = self.height * zoom
+        return sx <= x <= sx + sw and sy <= y <= sy + sh
+
+
+class ShapeAnnotation(Annotation):
+    """Shape annotation"""
+    def __init__(self, page_num: int, x1: float, y1: float, x2: float, y2: float,
+                 shape_type: str = "rectangle", color: Tuple[int, int, int] = (255, 0, 0),
+                 thickness: int = 2, fill: bool = False):
+        super().__init__(page_num)
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.shape_type = shape_type
+        self.color = color
+        self.thickness = thickness
+        self.fill = fill
+
+    def draw(self, draw, zoom_level):
+        x1 = int(self.x1 * zoom_level)
+        y1 = int(self.y1 * zoom_level)
+        x2 = int(self.x2 * zoom_level)
+        y2 = int(self.y2 * zoom_level)
+        thickness = max(1, int(self.thickness * zoom_level))
+
+        if self.shape_type == "rectangle":
+            if self.fill:
+                draw.rectangle([x1, y1, x2, y2], fill=self.color, outline=self.color, width=thickness)
+            else:
+                draw.rectangle([x1, y1, x2, y2], outline=self.color, width=thickness)
+        elif self.shape_type == "circle":
+            if self.fill:
+                draw.ellipse([x1, y1, x2, y2], fill=self.color, outline=self.color, width=thickness)
+            else:
+                draw.ellipse([x1, y1, x2, y2], outline=self.color, width=thickness)
+        elif self.shape_type == "line":
+            draw.line([x1, y1, x2, y2], fill=self.color, width=thickness)
+        elif self.shape_type == "arrow":
+            draw.line([x1, y1, x2, y2], fill=self.color, width=thickness)
+            import math
+            angle = math.atan2(y2 - y1, x2 - x1)
+            arrow_size = 10 * zoom_level
+            left_angle = angle + 2.7
+            right_angle = angle - 2.7
+            left_x = x2 - arrow_size * math.cos(left_angle)
+            left_y = y2 - arrow_size * math.sin(left_angle)
+            right_x = x2 - arrow_size * math.cos(right_angle)
+            right_y = y2 - arrow_size * math.sin(right_angle)
+            draw.polygon([x2, y2, left_x, left_y, right_x, right_y], fill=self.color)
+
+        if self.selected:
+            draw.rectangle([min(x1, x2) - 2, min(y1, y2) - 2,
+                          max(x1, x2) + 2, max(y1, y2) + 2],
+                          outline="blue", width=2)
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        sx1, sy1 = self.x1 * zoom, self.y1 * zoom
+        sx2, sy2 = self.x2 * zoom, self.y2 * zoom
+        margin = 5
+        return (min(sx1, sx2) - margin <= x <= max(sx1, sx2) + margin and
+                min(sy1, sy2) - margin <= y <= max(sy1, sy2) + margin)
+
+
+class HighlightAnnotation(Annotation):
+    """Highlight annotation"""
+    def __init__(self, page_num: int, x1: float, y1: float, x2: float, y2: float,
+                 color: Tuple[int, int, int] = (255, 255, 0)):
+        super().__init__(page_num)
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.color = color
+
+    def draw(self, draw, zoom_level):
+        x1 = int(self.x1 * zoom_level)
+        y1 = int(self.y1 * zoom_level)
+        x2 = int(self.x2 * zoom_level)
+        y2 = int(self.y2 * zoom_level)
+
+        overlay = Image.new('RGBA', draw._image.size, (0, 0, 0, 0))
+        overlay_draw = ImageDraw.Draw(overlay)
+        color_with_alpha = (*self.color, 100)
+        overlay_draw.rectangle([x1, y1, x2, y2], fill=color_with_alpha)
+
+        draw._image.paste(Image.alpha_composite(draw._image.convert('RGBA'), overlay).convert('RGB'))
+
+        if self.selected:
+            draw.rectangle([x1, y1, x2, y2], outline="blue", width=2)
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        sx1, sy1 = self.x1 * zoom, self.y1 * zoom
+        sx2, sy2 = self.x2 * zoom, self.y2 * zoom
+        return (min(sx1, sx2) <= x <= max(sx1, sx2) and
+                min(sy1, sy2) <= y <= max(sy1, sy2))
+
+
+class StampAnnotation(Annotation):
+    """Stamp annotation"""
+    def __init__(self, page_num: int, x: float, y: float, stamp_type: str = "approved"):
+        super().__init__(page_num)
+        self.x = x
+        self.y = y
+        self.stamp_type = stamp_type
+        self.width = 100
+        self.height = 40
+
+    def draw(self, draw, zoom_level):
+        x = int(self.x * zoom_level)
+        y = int(self.y * zoom_level)
+        w = int(self.width * zoom_level)
+        h = int(self.height * zoom_level)
+
+        stamps = {
+            "approved": ("APPROVED", (0, 150, 0)),
+            "rejected": ("REJECTED", (200, 0, 0)),
+            "confidential": ("CONFIDENTIAL", (200, 0, 0)),
+            "draft": ("DRAFT", (128, 128, 128)),
+            "final": ("FINAL", (0, 0, 200)),
+            "reviewed": ("REVIEWED", (150, 0, 150)),
+        }
+
+        text, color = stamps.get(self.stamp_type, ("APPROVED", (0, 150, 0)))
+
+        draw.rounded_rectangle([x, y, x + w, y + h], radius=5,
+                              outline=color, width=3)
+
+        try:
+            font_size = int(16 * zoom_level)
+            font = ImageFont.truetype("arial.ttf", font_size)
+        except:
+            font = ImageFont.load_default()
+
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_w = bbox[2] - bbox[0]
+        text_h = bbox[3] - bbox[1]
+        text_x = x + (w - text_w) // 2
+        text_y = y + (h - text_h) // 2
+
+        draw.text((text_x, text_y), text, fill=color, font=font)
+
+        date_text = datetime.now().strftime("%Y-%m-%d")
+        try:
+            date_font = ImageFont.truetype("arial.ttf", int(10 * zoom_level))
+        except:
+            date_font = ImageFont.load_default()
+
+        bbox = draw.textbbox((0, 0), date_text, font=date_font)
+        date_w = bbox[2] - bbox[0]
+        date_x = x + (w - date_w) // 2
+        date_y = y + h + 2
+        draw.text((date_x, date_y), date_text, fill=color, font=date_font)
+
+        if self.selected:
+            draw.rectangle([x - 2, y - 2, x + w + 2, y + h + 15],
+                          outline="blue", width=2)
+
+    def contains_point(self, x: float, y: float, zoom: float) -> bool:
+        sx = self.x * zoom
+        sy = self.y * zoom
+        sw = self.width * zoom
+        sh = self.height * zoom + 15
+        return sx <= x <= sx + sw and sy <= y <= sy + sh
+
+
+ANNOTATION_TYPES = {
+    'text': TextAnnotation,
+    'signature': SignatureAnnotation,
+    'shape': ShapeAnnotation,
+    'highlight': HighlightAnnotation,
+    'stamp': StampAnnotation,
+}
+
+
+def annotation_from_dict(data: Dict) -> Annotation:
+    """Build an annotation from a JSON-style dict
+
+    The dict names its class in 'type' and its 1-based page in 'page'; the
+    remaining keys are the constructor arguments. Signatures take their image
+    from 'image_path' or base64 'image_base64' instead of raw bytes.
+    """
+    data = dict(data)
+    kind = data.pop('type', None)
+    if kind not in ANNOTATION_TYPES:
+        raise ValueError(f"Unknown annotation type: {kind!r}")
+    if 'page' not in data:
+        raise ValueError(f"{kind} annotation is missing 'page'")
+    page_num = int(data.pop('page')) - 1
+    if page_num < 0:
+        raise ValueError("Annotation pages are 1-based")
+
+    if kind == 'signature':
+        if 'image_path' in data:
+            with open(data.pop('image_path'), "rb") as f:
+                data['signature_data'] = f.read()
+        elif 'image_base64' in data:
+            data['signature_data'] = base64.b64decode(data.pop('image_base64'))
+    if 'color' in data:
+        data['color'] = tuple(data['color'])
+
+    try:
+        return ANNOTATION_TYPES[kind](page_num, **data)
+    except TypeError as e:
+        raise ValueError(f"Invalid {kind} annotation: {e}") from e
+
+
+# ---------------------------------------------------------------------------
+# Page ranges
+# ---------------------------------------------------------------------------
+
+class PageRangeSet:
+    """Sorted set of 0-based page indices stored as disjoint intervals
+
+    Ranges such as "1-1000000" are kept as a single (start, stop) pair, so
+    membership is a binary search and iteration never builds a full list.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._stops: List[int] = []
+
+        # Merge overlapping/adjacent half-open intervals
+        for start, stop in sorted(intervals):
+            if stop <= start:
+                continue
+            if self._stops and start <= self._stops[-1]:
+                self._stops[-1] = max(self._stops[-1], stop)
+            else:
+                self._starts.append(start)
+                self._stops.append(stop)
+
+        self._length = sum(stop - start for start, stop in zip(self._starts, self._stops))
+
+    @classmethod
+    def parse(cls, range_str: str, total_pages: int) -> 'PageRangeSet':
+        """Parse '1-5,7,9-12' or 'all' (1-based) into a set clamped to the document
+
+        Raises ValueError naming the part that is not a page number or range.
+        """
+        if range_str.strip().lower() == 'all':
+            return cls([(0, total_pages)])
+
+        intervals = []
+        for part in range_str.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                if '-' in part:
+                    start, end = part.split('-')
+                    start = int(start.strip())
+                    end = int(end.strip())
+                else:
+                    start = end = int(part)
+            except ValueError:
+                raise ValueError(f"Invalid page range '{part}'; "
+                                 f"use page numbers like 1-5,7") from None
+
+            # Convert to 0-based half-open interval and clamp
+            intervals.append((max(start - 1, 0), min(end, total_pages)))
+
+        return cls(intervals)
+
+    def __contains__(self, index: int) -> bool:
+        pos = bisect_right(self._starts, index) - 1
+        return pos >= 0 and index < self._stops[pos]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, stop in zip(self._starts, self._stops):
+            yield from range(start, stop)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __repr__(self) -> str:
+        return f"PageRangeSet({self.intervals()!r})"
+
+    @property
+    def first(self) -> Optional[int]:
+        return self._starts[0] if self._starts else None
+
+    @property
+    def last(self) -> Optional[int]:
+        return self._stops[-1] - 1 if self._stops else None
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        """Return the (start, stop) half-open intervals"""
+        return list(zip(self._starts, self._stops))
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+def unlock_document(doc: fitz.Document, password: Optional[str] = None) -> bool:
+    """Authenticate an encrypted document with an empty password, then password
+
+    Returns True if the document is readable afterwards.
+    """
+    if not doc.is_encrypted:
+        return True
+    if doc.authenticate(""):
+        return True
+    return password is not None and bool(doc.authenticate(password))
+
+
+def open_document(path: str, password: Optional[str] = None) -> fitz.Document:
+    """Open a PDF and unlock it, raising PasswordRequiredError if it stays locked"""
+    return _require_unlocked(fitz.open(path), password)
+
+
+def open_document_bytes(data: bytes, password: Optional[str] = None) -> fitz.Document:
+    """Open a PDF held in memory, with the same unlocking rules as open_document"""
+    return _require_unlocked(fitz.open(stream=data, filetype="pdf"), password)
+
+
+def _require_unlocked(doc: fitz.Document, password: Optional[str]) -> fitz.Document:
+    if not unlock_document(doc, password):
+        doc.close()
+        if password is None:
+            raise PasswordRequiredError("Password required")
+        raise PasswordRequiredError("Incorrect password")
+    return doc
+
+
+def is_password_protected(doc: fitz.Document) -> bool:
+    """True if the document was encrypted on disk (also after unlocking it)
+
+    Avoids doc.needs_pass: asking an unlocked AES file whether it needs a
+    password resets its decryption, and copies written afterwards come out garbled.
+    """
+    return bool(doc.is_encrypted) or bool((doc.metadata or {}).get('encryption'))
+
+
+def render_page(doc: fitz.Document, page_num: int, zoom: float = 1.0, rotation: int = 0,
+                annotations: Iterable[Annotation] = ()) -> Image.Image:
+    """Render a page to an RGB PIL image with annotations for that page drawn on top"""
+    page = doc[page_num]
+
+    mat = fitz.Matrix(zoom, zoom)
+    if rotation != 0:
+        mat = mat.prerotate(rotation)
+
+    pix = page.get_pixmap(matrix=mat, alpha=False)
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+    return draw_annotations(img, annotations, page_num, zoom)
+
+
+def draw_annotations(img: Image.Image, annotations: Iterable[Annotation],
+                     page_num: int, zoom: float) -> Image.Image:
+    """Draw the annotations belonging to page_num onto a rendered page image"""
+    draw = ImageDraw.Draw(img)
+
+    for annot in annotations:
+        if annot.page_num == page_num:
+            annot.draw(draw, zoom)
+
+    return img
+
+
+def apply_annotations(doc: fitz.Document, annotations: Iterable[Annotation],
+                      page_rotations: Optional[Dict[int, int]] = None):
+    """Apply view rotations and annotations permanently to the PDF pages"""
+    # First, apply rotations to pages
+    for page_num, rotation in (page_rotations or {}).items():
+        if 0 <= page_num < len(doc):
+            page = doc[page_num]
+            # Get current rotation and add our rotation
+            new_rotation = (page.rotation + rotation) % 360
+            page.set_rotation(new_rotation)
+
+    # Then apply annotations
+    for annot in annotations:
+        page = doc[annot.page_num]
+
+        if isinstance(annot, TextAnnotation):
+            # Non Base-14 names (e.g. Tk font families) fall back to Helvetica
+            fontname = annot.fontname if annot.fontname.lower() in fitz.Base14_fontdict else "helv"
+            page.insert_text((annot.x, annot.y), annot.text,
+                           fontsize=annot.fontsize, color=annot.color, fontname=fontname)
+
+        elif isinstance(annot, SignatureAnnotation):
+            rect = fitz.Rect(annot.x, annot.y,
+                           annot.x + annot.width, annot.y + annot.height)
+            page.insert_image(rect, stream=annot.signature_data)
+
+        elif isinstance(annot, ShapeAnnotation):
+            rect = fitz.Rect(annot.x1, annot.y1, annot.x2, annot.y2)
+            color = tuple(c / 255.0 for c in annot.color)
+
+            if annot.shape_type == "rectangle":
+                page.draw_rect(rect, color=color, width=annot.thickness)
+            elif annot.shape_type == "circle":
+                page.draw_circle((annot.x1 + annot.x2) / 2, (annot.y1 + annot.y2) / 2,
+                               abs(annot.x2 - annot.x1) / 2, color=color, width=annot.thickness)
+            elif annot.shape_type == "line":
+                page.draw_line((annot.x1, annot.y1), (annot.x2, annot.y2),
+                             color=color, width=annot.thickness)
+
+        elif isinstance(annot, HighlightAnnotation):
+            rect = fitz.Rect(annot.x1, annot.y1, annot.x2, annot.y2)
+            page.add_highlight_annot(rect)
+
+        elif isinstance(annot, StampAnnotation):
+            page.insert_text((annot.x, annot.y + 20), annot.stamp_type.upper(),
+                           fontsize=16, color=(0, 0.5, 0))
+
+
+def _is_open_file(doc: fitz.Document, path: str) -> bool:
+    """True if path names the file the document was opened from"""
+    if not doc.name:
+        return False
+    if os.path.exists(path) and os.path.exists(doc.name):
+        return os.path.samefile(path, doc.name)
+    return os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(doc.name))
+
+
+def save_document(doc: fitz.Document, output_path: Optional[str] = None):
+    """Save to output_path: an incremental update when that is the file the
+    document was opened from (or no path is given), otherwise a full copy
+
+    Editors pass their current path, which after Save As is no longer doc.name;
+    appending there would silently change the original file instead.
+    """
+    if output_path is None or _is_open_file(doc, output_path):
+        doc.save(doc.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+    else:
+        doc.save(output_path)
+
+
+def unprotected_path(file_path: str) -> str:
+    """Default output path for a decrypted copy: same folder, '_unprotected' suffix"""
+    base, ext = os.path.splitext(file_path)
+    return f"{base}_unprotected{ext}"
+
+
+def remove_password(doc: fitz.Document, output_path: str):
+    """Save an unlocked document without encryption"""
+    doc.save(output_path, encryption=fitz.PDF_ENCRYPT_NONE)
+
+
+def unlock_file(file_path: str, password: str, output_path: Optional[str] = None) -> str:
+    """Write a decrypted copy of a password-protected PDF and return its path"""
+    doc = fitz.open(file_path)
+    try:
+        if not doc.is_encrypted:
+            raise ValueError("Not password protected")
+
+        # Try empty password first, then provided password
+        if not unlock_document(doc, password):
+            raise PasswordRequiredError("Incorrect password")
+
+        output_path = output_path or unprotected_path(file_path)
+        remove_password(doc, output_path)
+        return output_path
+    finally:
+        doc.close()
+
+
+def write_pages(pages: Iterable, output_path: str, user_password: Optional[str] = None,
+                owner_password: Optional[str] = None, algorithm: str = "AES-256") -> int:
+    """Copy pypdf pages into a new PDF (optionally encrypted) and return the page count"""
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(page)
+
+    if user_password:
+        writer.encrypt(user_password=user_password,
+                       owner_password=owner_password or user_password,
+                       algorithm=algorithm)
+
+    with open(output_path, "wb") as output_file:
+        writer.write(output_file)
+
+    return len(writer.pages)
+
+
+# ---------------------------------------------------------------------------
+# PDF to Word conversion
+# ---------------------------------------------------------------------------
+
+# Markdown patterns, compiled once for every conversion
+TABLE_SEPARATOR_RE = re.compile(r'^\s*\|[\s\-:|\+]+\|\s*$')
+HEADING_RE = re.compile(r'^(#{1,6})')
+BULLET_RE = re.compile(r'^(\s*)[\*\-\+]\s+(.+)$')
+NUMBERED_RE = re.compile(r'^(\s*)(\d+)\.\s+(.+)$')
+RULE_RE = re.compile(r'^[\-\*_]{3,}\s*$')
+# **bold**, *italic*, ***bold italic***, `code`, __bold__, _italic_
+INLINE_FORMAT_RE = re.compile(r'(\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`|__(.+?)__|_(.+?)_)')
+
+
+def tokenize_markdown(markdown_text: str) -> Iterator[Tuple[str, object]]:
+    """Split pymupdf4llm markdown into block tokens in a single pass
+
+    Yields (kind, value) pairs: ('heading', (level, text)), ('text', str),
+    ('bullet', str), ('number', str), ('table', rows), ('code', lines) and
+    ('rule', None). Empty lines produce nothing.
+    """
+    table_rows: List[List[str]] = []
+    code_lines: Optional[List[str]] = None
+
+    for line in markdown_text.split('\n'):
+        stripped = line.strip()
+
+        # Handle code blocks
+        if stripped.startswith('```'):
+            if code_lines is None:
+                if table_rows:
+                    yield 'table', table_rows
+                    table_rows = []
+                code_lines = []
+            else:
+                if code_lines:
+                    yield 'code', code_lines
+                code_lines = None
+            continue
+
+        if code_lines is not None:
+            code_lines.append(line)
+            continue
+
+        # Handle tables (markdown format: | cell | cell |)
+        if stripped.startswith('|'):
+            # Skip separator lines (|---|---|)
+            if not TABLE_SEPARATOR_RE.match(line):
+                cells = [cell.strip() for cell in line.split('|')[1:-1]]
+                if cells:
+                    table_rows.append(cells)
+            continue
+
+        if table_rows:
+            # End of table; the current line is processed normally
+            yield 'table', table_rows
+            table_rows = []
+
+        # Handle headings
+        heading = HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            yield 'heading', (level, line[level:].strip())
+            continue
+
+        # Handle bullet points
+        bullet = BULLET_RE.match(line)
+        if bullet:
+            yield 'bullet', bullet.group(2)
+            continue
+
+        # Handle numbered lists
+        numbered = NUMBERED_RE.match(line)
+        if numbered:
+            yield 'number', numbered.group(3)
+            continue
+
+        # Handle horizontal rules
+        if RULE_RE.match(stripped):
+            yield 'rule', None
+            continue
+
+        # Regular text (empty lines are skipped)
+        if stripped:
+            yield 'text', stripped
+
+    # Handle any remaining table
+    if table_rows:
+        yield 'table', table_rows
+
+
+class StyleResolver:
+    """Style names -> style ids for one DocxDocument, looked up once
+
+    python-docx resolves a style name by walking the styles part on every
+    assignment; resolving up front and writing the id directly avoids that.
+    """
+
+    def __init__(self, doc):
+        from docx.enum.style import WD_STYLE_TYPE
+
+        self._ids = {}
+        self._table_ids = {}
+        for style in doc.styles:
+            if style.type == WD_STYLE_TYPE.PARAGRAPH:
+                self._ids[style.name] = style.style_id
+            elif style.type == WD_STYLE_TYPE.TABLE:
+                self._table_ids[style.name] = style.style_id
+
+    def heading(self, level: int) -> str:
+        """Heading style for a markdown level, falling back to Heading 3 if missing"""
+        name = f'Heading {level}'
+        return name if level <= 3 or name in self._ids else 'Heading 3'
+
+    def apply(self, paragraph, name: str):
+        paragraph._p.get_or_add_pPr().style = self._ids[name]
+
+    def apply_table(self, table, name: str):
+        table._tbl.tblPr.style = self._table_ids[name]
+
+
+# Layout analysis options; part of every MarkdownCache key
+MARKDOWN_OPTIONS = {
+    'page_chunks': True,  # Get per-page chunks
+    'write_images': False,  # We'll handle images separately
+    'show_progress': False,
+}
+
+
+def markdown_chunk(doc: fitz.Document, pages: List[int]) -> List[str]:
+    """Layout-analyse the given 0-based pages and return one markdown string per page"""
+    # pymupdf4llm pulls in the layout models, so load it on first conversion only
+    import pymupdf4llm
+
+    chunks = pymupdf4llm.to_markdown(doc, pages=pages, **MARKDOWN_OPTIONS)
+    return [chunk.get('text', '') if isinstance(chunk, dict) else str(chunk) for chunk in chunks]
+
+
+# Document opened once per conversion worker process from the bytes sent at start-up
+_worker_document: Optional[fitz.Document] = None
+
+
+def _init_markdown_worker(pdf_bytes: bytes):
+    global _worker_document
+    _worker_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def _worker_markdown_chunk(pages: List[int]) -> List[str]:
+    return markdown_chunk(_worker_document, pages)
+
+
+def decrypted_bytes(doc: fitz.Document) -> bytes:
+    """The document as unencrypted PDF bytes, for in-memory working copies
+
+    Copies that kept the encryption of an unlocked file would reopen locked,
+    with every stream unreadable. The file ID is kept so the same content
+    always gives the same bytes.
+    """
+    return doc.tobytes(no_new_id=True, encryption=fitz.PDF_ENCRYPT_NONE)
+
+
+def document_fingerprint(doc: fitz.Document) -> str:
+    """Content hash of an open document, read from its file when nothing is unsaved"""
+    digest = hashlib.sha256()
+    if doc.name and not doc.is_dirty and os.path.isfile(doc.name):
+        with open(doc.name, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    else:
+        # Keep the existing file ID so the same content always hashes the same
+        digest.update(doc.tobytes(no_new_id=True))
+    return digest.hexdigest()
+
+
+class MarkdownCache:
+    """Per-page markdown from layout analysis, kept on disk between conversions
+
+    Entries are keyed by document content hash, page index, MARKDOWN_OPTIONS
+    and the pymupdf4llm version, so re-converting an unchanged PDF skips
+    layout analysis. When the directory grows past max_bytes the least
+    recently used entries are removed. Entries are plaintext, so WordConverter
+    does not use the cache for password-protected documents.
+    """
+
+    DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".pdf_editor_cache", "markdown")
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or self.DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path, _ in self._entries())
+
+        try:
+            from importlib.metadata import version
+            analyser = version('pymupdf4llm')
+        except Exception:
+            analyser = 'unknown'
+        options = ",".join(f"{name}={value}" for name, value in sorted(MARKDOWN_OPTIONS.items()))
+        self._options_key = f"pymupdf4llm={analyser};{options}"
+
+    def _path(self, fingerprint: str, page_num: int) -> str:
+        key = hashlib.sha256(f"{fingerprint}:{page_num}:{self._options_key}".encode('utf-8'))
+        name = key.hexdigest()
+        return os.path.join(self.directory, name[:2], name + ".md")
+
+    def contains(self, fingerprint: str, page_num: int) -> bool:
+        return os.path.exists(self._path(fingerprint, page_num))
+
+    def get(self, fingerprint: str, page_num: int) -> Optional[str]:
+        path = self._path(fingerprint, page_num)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return text
+
+    def put(self, fingerprint: str, page_num: int, text: str):
+        path = self._path(fingerprint, page_num)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+        self._size += os.path.getsize(path) - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache is at 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        self._size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= stat.st_size
+            except OSError:
+                pass
+
+    def clear(self):
+        for path, _ in self._entries():
+            os.remove(path)
+        self._size = 0
+
+    def _entries(self) -> Iterator[Tuple[str, os.stat_result]]:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".md"):
+                    path = os.path.join(root, name)
+                    try:
+                        yield path, os.stat(path)
+                    except OSError:
+                        pass
+
+
+# Namespace declarations repeated on a serialized body element; the package's
+# document root already declares them
+XMLNS_RE = re.compile(r'\sxmlns:\w+="[^"]*"')
+
+
+class StreamingDocxWriter:
+    """Writes a .docx package chunk by chunk instead of holding it all in memory
+
+    Content is added to ``document``, a small python-docx document. Each
+    flush() spools that chunk's body XML to a temporary file, writes its
+    images straight into the output zip and starts a fresh chunk, so memory
+    is bounded by one chunk however many pages are converted. close() writes
+    word/document.xml from the spool and the remaining parts from the stock
+    python-docx template that every chunk is created from.
+    """
+
+    DOCUMENT_PART = 'word/document.xml'
+    DOCUMENT_RELS = 'word/_rels/document.xml.rels'
+    CONTENT_TYPES = '[Content_Types].xml'
+
+    def __init__(self, output_path):
+        from docx import Document as DocxDocument
+
+        self.output_path = output_path
+        template = io.BytesIO()
+        DocxDocument().save(template)
+        self._template = zipfile.ZipFile(template)
+        self._package = zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED)
+        self._body = tempfile.TemporaryFile()
+        self._media: Dict[str, Tuple[str, str]] = {}  # sha1 -> (rId, target)
+        self._content_types: Dict[str, str] = {}
+        self._shape_id = 0
+        self.document = DocxDocument()
+
+    def flush(self):
+        """Move the current chunk's body and images out of memory"""
+        from docx import Document as DocxDocument
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        from docx.oxml.ns import qn
+        from lxml import etree
+
+        chunk = self.document
+        rel_ids = {rel.rId: self._add_media(rel.target_part)
+                   for rel in chunk.part.rels.values()
+                   if rel.reltype == RT.IMAGE and not rel.is_external}
+
+        for element in chunk.element.body:
+            if element.tag == qn('w:sectPr'):
+                continue
+            # Relationship ids and drawing ids are only unique within a chunk
+            for blip in element.iter(qn('a:blip')):
+                blip.set(qn('r:embed'), rel_ids[blip.get(qn('r:embed'))])
+            for doc_pr in element.iter(qn('wp:docPr')):
+                self._shape_id += 1
+                doc_pr.set('id', str(self._shape_id))
+            xml = etree.tostring(element, encoding='unicode')
+            tag_end = xml.index('>')
+            self._body.write((XMLNS_RE.sub('', xml[:tag_end]) + xml[tag_end:]).encode('utf-8'))
+
+        self.document = DocxDocument()
+        # python-docx parts and their package form reference cycles, which
+        # only a full collection frees; without it finished chunks pile up
+        del chunk
+        gc.collect()
+
+    def _add_media(self, image_part) -> str:
+        """Write an image part once per distinct blob and return its package rId"""
+        digest = hashlib.sha1(image_part.blob).hexdigest()
+        if digest not in self._media:
+            number = len(self._media) + 1
+            ext = image_part.partname.ext
+            target = f"media/image{number}.{ext}"
+            self._package.writestr(f"word/{target}", image_part.blob)
+            self._media[digest] = (f"rIdImage{number}", target)
+            self._content_types[ext] = image_part.content_type
+        return self._media[digest][0]
+
+    def close(self):
+        """Flush the last chunk and finish the package"""
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        self.flush()
+        template = self._template
+        for name in template.namelist():
+            if name not in (self.DOCUMENT_PART, self.DOCUMENT_RELS, self.CONTENT_TYPES):
+                self._package.writestr(name, template.read(name))
+
+        rels = template.read(self.DOCUMENT_RELS).decode('utf-8')
+        image_rels = "".join(f'<Relationship Id="{rel_id}" Type="{RT.IMAGE}" Target="{target}"/>'
+                             for rel_id, target in self._media.values())
+        self._package.writestr(self.DOCUMENT_RELS,
+                               rels.replace('</Relationships>', image_rels + '</Relationships>'))
+
+        types = template.read(self.CONTENT_TYPES).decode('utf-8')
+        defaults = "".join(f'<Default Extension="{ext}" ContentType="{content_type}"/>'
+                           for ext, content_type in self._content_types.items()
+                           if f'Extension="{ext}"' not in types)
+        types_start = types.index('>', types.index('<Types')) + 1
+        self._package.writestr(self.CONTENT_TYPES,
+                               types[:types_start] + defaults + types[types_start:])
+
+        # The template body holds only the section properties, which stay last
+        document_xml = template.read(self.DOCUMENT_PART).decode('utf-8')
+        body_end = document_xml.index('<w:sectPr')
+        with self._package.open(self.DOCUMENT_PART, 'w') as part:
+            part.write(document_xml[:body_end].encode('utf-8'))
+            self._body.seek(0)
+            shutil.copyfileobj(self._body, part)
+            part.write(document_xml[body_end:].encode('utf-8'))
+
+        self._release()
+
+    def discard(self):
+        """Abandon the package, removing a partially written output file"""
+        self._release()
+        if isinstance(self.output_path, (str, os.PathLike)) and os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def _release(self):
+        self._package.close()
+        self._template.close()
+        self._body.close()
+
+
+class WordConverter:
+    """Converts an open PDF to a Word document using pymupdf4llm layout analysis
+
+    Works on the already-open (and, if encrypted, already authenticated)
+    document, so nothing is re-read from disk. Pending annotations and page
+    rotations are burned into an in-memory copy first, leaving the caller's
+    document untouched. Layout analysis runs over page chunks, optionally
+    spread over a process pool; pages are written to the .docx strictly in
+    order as chunks arrive. With a MarkdownCache, pages analysed by an earlier
+    conversion of the same content are read back instead of re-analysed;
+    password-protected documents bypass the cache.
+    """
+
+    # Pages per chunk when converting in a single process (bounds cancel latency)
+    SERIAL_CHUNK_SIZE = 25
+
+    # Documents this long are written with StreamingDocxWriter unless told otherwise
+    STREAMING_PAGE_THRESHOLD = 200
+    # Pages held in memory between flushes when streaming
+    STREAMING_FLUSH_PAGES = 20
+
+    # Images narrower or shorter than this many pixels are treated as artifacts
+    MIN_IMAGE_SIZE = 50
+    MAX_IMAGE_WIDTH_INCHES = 6
+
+    def __init__(self, pdf_document: fitz.Document,
+                 annotations: Iterable[Annotation] = (),
+                 page_rotations: Optional[Dict[int, int]] = None,
+                 markdown_cache: Optional[MarkdownCache] = None):
+        self.pdf_document = pdf_document
+        self.annotations = list(annotations)
+        self.page_rotations = page_rotations or {}
+        self.markdown_cache = markdown_cache
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, float]:
+        """Counters and timings for the most recent convert() call"""
+        return {'pages': 0, 'cached_pages': 0, 'tables': 0, 'images': 0,
+                'layout_seconds': 0.0, 'seconds': 0.0}
+
+    def convert(self, output_path,
+                progress_callback: Optional[Callable[[str], None]] = None,
+                workers: int = 1, chunk_size: Optional[int] = None,
+                cancel_event: Optional[threading.Event] = None,
+                streaming: Optional[bool] = None) -> int:
+        """Write the .docx to output_path (a path or binary stream) and return the page count
+
+        streaming writes the package incrementally so memory stays flat on very
+        long documents; by default it is used from STREAMING_PAGE_THRESHOLD pages.
+        Raises ConversionCancelled if cancel_event is set before the document is saved.
+        """
+        def report(message):
+            if progress_callback:
+                progress_callback(message)
+
+        report("Analyzing PDF layout... Please wait.")
+
+        self.stats = stats = self._new_stats()
+        start = time.perf_counter()
+        source = self._source_document()
+        writer = None
+        try:
+            total_pages = len(source)
+            if streaming is None:
+                streaming = total_pages >= self.STREAMING_PAGE_THRESHOLD
+
+            # Create a new Word document
+            if streaming:
+                writer = StreamingDocxWriter(output_path)
+                doc = writer.document
+            else:
+                from docx import Document as DocxDocument
+                doc = DocxDocument()
+
+            image_cache: Dict = {}
+            styles = StyleResolver(doc)
+            page_markdown = self._timed(
+                self._iter_page_markdown(source, workers, chunk_size, cancel_event),
+                'layout_seconds')
+
+            for page_num, page_md in enumerate(page_markdown):
+                if page_num == 0:
+                    report("Creating Word document...")
+                report(f"Converting page {page_num + 1} of {total_pages}...")
+
+                # Convert markdown to Word content
+                self._markdown_to_word(doc, page_md, page_num, styles)
+
+                # Extract images for this page
+                self._extract_images_from_page(doc, source[page_num], image_cache)
+
+                # Add page break (except for last page)
+                if page_num < total_pages - 1:
+                    doc.add_page_break()
+
+                if writer is not None and (page_num + 1) % self.STREAMING_FLUSH_PAGES == 0:
+                    writer.flush()
+                    doc = writer.document
+                    styles = StyleResolver(doc)
+                    # Repeated images are re-encoded once per flush at most and
+                    # the writer still stores them once
+                    image_cache.clear()
+
+            self._check_cancelled(cancel_event)
+
+            # Save the document
+            if writer is not None:
+                writer.close()
+            else:
+                doc.save(output_path)
+            stats['pages'] = total_pages
+            stats['seconds'] = time.perf_counter() - start
+            return total_pages
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        finally:
+            if source is not self.pdf_document:
+                source.close()
+
+    def _timed(self, items: Iterator[str], key: str) -> Iterator[str]:
+        """Yield from items, adding the time spent producing them to stats[key]"""
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            finally:
+                self.stats[key] += time.perf_counter() - start
+            yield item
+
+    def _source_document(self) -> fitz.Document:
+        """The open document, or an in-memory copy with pending edits applied"""
+        if not self.annotations and not self.page_rotations:
+            return self.pdf_document
+        # no_new_id leaves the file ID alone, so the same content hashes the same
+        snapshot = fitz.open(stream=decrypted_bytes(self.pdf_document), filetype="pdf")
+        apply_annotations(snapshot, self.annotations, self.page_rotations)
+        return snapshot
+
+    def _iter_page_markdown(self, source: fitz.Document, workers: int,
+                            chunk_size: Optional[int],
+                            cancel_event: Optional[threading.Event]) -> Iterator[str]:
+        """Yield each page's markdown in page order, from the cache where possible"""
+        total_pages = len(source)
+        cache = self.markdown_cache
+        # Never write the text of a password-protected PDF to disk in the clear
+        if cache is None or is_password_protected(self.pdf_document):
+            yield from self._analyse_pages(source, list(range(total_pages)), workers,
+                                           chunk_size, cancel_event)
+            return
+
+        fingerprint = document_fingerprint(source)
+        missing = [page_num for page_num in range(total_pages)
+                   if not cache.contains(fingerprint, page_num)]
+
+        # Layout analysis adds objects to the document it reads. When that is the
+        # caller's document, serial analysis runs on one private copy, made on
+        # first use, so the document keeps the fingerprint the cache is keyed on
+        private = []
+
+        def private_copy() -> fitz.Document:
+            if not private:
+                private.append(fitz.open(stream=decrypted_bytes(source), filetype="pdf"))
+            return private[0]
+
+        copy_source = private_copy if source is self.pdf_document else None
+        analysed = self._analyse_pages(source, missing, workers, chunk_size, cancel_event,
+                                       copy_source)
+        try:
+            missing_set = set(missing)
+            self.stats['cached_pages'] = total_pages - len(missing)
+            for page_num in range(total_pages):
+                text = None if page_num in missing_set else cache.get(fingerprint, page_num)
+                if text is None:
+                    if page_num in missing_set:
+                        text = next(analysed)
+                    else:
+                        # Evicted since the lookup above
+                        text = next(self._analyse_pages(source, [page_num], 1, None,
+                                                        cancel_event, copy_source))
+                    cache.put(fingerprint, page_num, text)
+                yield text
+        finally:
+            analysed.close()
+            for doc in private:
+                doc.close()
+
+    def _analyse_pages(self, source: fitz.Document, pages: List[int], workers: int,
+                       chunk_size: Optional[int],
+                       cancel_event: Optional[threading.Event],
+                       private_copy: Optional[Callable[[], fitz.Document]] = None
+                       ) -> Iterator[str]:
+        """Yield layout-analysed markdown for the given pages, in order
+
+        Serial analysis reads private_copy() instead of source when it is given.
+        """
+        workers = max(1, workers or 1)
+        if not chunk_size:
+            if workers > 1:
+                # A few chunks per worker keeps the pool busy when page costs vary
+                chunk_size = max(1, -(-len(pages) // (workers * 4)))
+            else:
+                chunk_size = self.SERIAL_CHUNK_SIZE
+        chunks = [pages[start:start + chunk_size] for start in range(0, len(pages), chunk_size)]
+
+        if workers == 1 or len(chunks) < 2:
+            if chunks and private_copy is not None:
+                source = private_copy()
+            for chunk in chunks:
+                self._check_cancelled(cancel_event)
+                yield from markdown_chunk(source, chunk)
+            return
+
+        # Workers get one decrypted in-memory copy each at start-up instead of
+        # reopening the file, so unsaved edits and unlocked files convert too
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_markdown_worker, initargs=(decrypted_bytes(source),))
+        try:
+            futures = [pool.submit(_worker_markdown_chunk, chunk) for chunk in chunks]
+            for future in futures:
+                while True:
+                    self._check_cancelled(cancel_event)
+                    try:
+                        texts = future.result(timeout=0.1)
+                        break
+                    except concurrent.futures.TimeoutError:
+                        continue
+                yield from texts
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _check_cancelled(cancel_event: Optional[threading.Event]):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ConversionCancelled("Conversion cancelled")
+
+    def _markdown_to_word(self, doc, markdown_text: str, page_num: int,
+                          styles: Optional["StyleResolver"] = None):
+        """Convert markdown text to Word content with proper formatting
+
+        Pass the same StyleResolver for every page of a document so style
+        lookups happen once per document rather than once per paragraph.
+        """
+        if styles is None:
+            styles = StyleResolver(doc)
+
+        for kind, value in tokenize_markdown(markdown_text):
+            if kind == 'heading':
+                level, text = value
+                para = doc.add_paragraph(text)
+                styles.apply(para, styles.heading(level))
+
+            elif kind == 'text':
+                para = doc.add_paragraph()
+                self._add_formatted_text(para, value)
+
+            elif kind in ('bullet', 'number'):
+                para = doc.add_paragraph()
+                styles.apply(para, 'List Bullet' if kind == 'bullet' else 'List Number')
+                self._add_formatted_text(para, value)
+
+            elif kind == 'table':
+                self._create_word_table(doc, value, styles)
+
+            elif kind == 'code':
+                from docx.shared import Pt
+                para = doc.add_paragraph()
+                styles.apply(para, 'No Spacing')
+                for code_line in value:
+                    run = para.add_run(code_line + '\n')
+                    run.font.name = 'Courier New'
+                    run.font.size = Pt(9)
+
+            elif kind == 'rule':
+                from docx.enum.text import WD_ALIGN_PARAGRAPH
+                para = doc.add_paragraph('_' * 50)
+                para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    def _add_formatted_text(self, paragraph, text: str):
+        """Add text to paragraph with markdown formatting (bold, italic, etc.)"""
+        if not text:
+            return
+        text = text.strip()
+
+        last_end = 0
+        for match in INLINE_FORMAT_RE.finditer(text):
+            # Add text before this match
+            if match.start() > last_end:
+                paragraph.add_run(text[last_end:match.start()])
+
+            # Determine formatting
+            full_match = match.group(0)
+            if full_match.startswith('***') or full_match.startswith('___'):
+                # Bold italic
+                content = match.group(2) or match.group(0)[3:-3]
+                run = paragraph.add_run(content)
+                run.bold = True
+                run.italic = True
+            elif full_match.startswith('**') or full_match.startswith('__'):
+                # Bold
+                content = match.group(3) or match.group(6) or full_match[2:-2]
+                run = paragraph.add_run(content)
+                run.bold = True
+            elif full_match.startswith('*') or full_match.startswith('_'):
+                # Italic
+                content = match.group(4) or match.group(7) or full_match[1:-1]
+                run = paragraph.add_run(content)
+                run.italic = True
+            elif full_match.startswith('`'):
+                # Code
+                from docx.shared import Pt
+                content = match.group(5) or full_match[1:-1]
+                run = paragraph.add_run(content)
+                run.font.name = 'Courier New'
+                run.font.size = Pt(9)
+
+            last_end = match.end()
+
+        # Add remaining text
+        if last_end < len(text):
+            paragraph.add_run(text[last_end:])
+
+    def _create_word_table(self, doc, table_rows: list,
+                           styles: Optional["StyleResolver"] = None):
+        """Create a Word table from parsed markdown table rows
+
+        Rows are cloned from one empty template row and filled through their
+        XML elements in a single pass; python-docx's table.cell() rebuilds the
+        whole cell grid on every call, which is quadratic for large tables.
+        """
+        if not table_rows:
+            return
+        from docx.enum.table import WD_TABLE_ALIGNMENT
+        from docx.table import _Cell
+
+        num_rows = len(table_rows)
+        num_cols = max(len(row) for row in table_rows)
+
+        if num_cols == 0:
+            return
+
+        if styles is None:
+            styles = StyleResolver(doc)
+
+        # Create table with a single template row, then append copies of it
+        table = doc.add_table(rows=1, cols=num_cols)
+        self.stats['tables'] += 1
+        styles.apply_table(table, 'Table Grid')
+        table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+        tbl = table._tbl
+        template = tbl.tr_lst[0]
+        for _ in range(num_rows - 1):
+            tbl.append(copy.deepcopy(template))
+
+        # Fill cells
+        for row_idx, (tr, row_data) in enumerate(zip(tbl.tr_lst, table_rows)):
+            for tc, cell_text in zip(tr.tc_lst, row_data):
+                para = _Cell(tc, table).paragraphs[0]
+                self._add_formatted_text(para, str(cell_text) if cell_text else "")
+
+                # Make first row bold (header)
+                if row_idx == 0:
+                    for run in para.runs:
+                        run.bold = True
+
+        # Add spacing after table
+        doc.add_paragraph()
+
+    def _extract_images_from_page(self, doc, page, image_cache: Optional[Dict] = None):
+        """Extract images from PDF page and add to Word document
+
+        image_cache is shared across the pages of one conversion so repeated
+        images (logos, letterheads) are decoded and re-encoded only once.
+        """
+        from docx.shared import Inches
+
+        if image_cache is None:
+            image_cache = {}
+        try:
+            image_list = page.get_images(full=True)
+        except Exception:
+            return
+
+        for img_info in image_list:
+            try:
+                xref, width, height = img_info[0], img_info[2], img_info[3]
+
+                # Skip very small images (likely artifacts) using the image
+                # dictionary, before any decoding
+                if width < self.MIN_IMAGE_SIZE or height < self.MIN_IMAGE_SIZE:
+                    continue
+
+                prepared = self._prepare_image(page.parent, xref, image_cache)
+                if prepared is None:
+                    continue
+
+                # python-docx stores identical image blobs as a single package part
+                png_bytes, width_inches = prepared
+                doc.add_picture(io.BytesIO(png_bytes), width=Inches(width_inches))
+                self.stats['images'] += 1
+
+            except Exception:
+                pass
+
+    def _prepare_image(self, pdf: fitz.Document, xref: int,
+                       image_cache: Dict) -> Optional[Tuple[bytes, float]]:
+        """PNG bytes and display width for an image xref, cached by xref and content"""
+        if xref in image_cache:
+            return image_cache[xref]
+
+        # Different xrefs can carry the same image, so also key on the raw stream
+        content_key = hashlib.sha1(pdf.xref_stream_raw(xref)).digest()
+        if content_key not in image_cache:
+            image_cache[content_key] = self._encode_image(pdf, xref)
+        image_cache[xref] = image_cache[content_key]
+        return image_cache[xref]
+
+    def _encode_image(self, pdf: fitz.Document, xref: int) -> Optional[Tuple[bytes, float]]:
+        base_image = pdf.extract_image(xref)
+        image_bytes = base_image["image"]
+
+        # Open and process image
+        img = Image.open(io.BytesIO(image_bytes))
+
+        # Skip very small images (likely artifacts)
+        if img.width < self.MIN_IMAGE_SIZE or img.height < self.MIN_IMAGE_SIZE:
+            return None
+
+        # Convert to RGB if necessary
+        if img.mode in ('RGBA', 'P'):
+            img = img.convert('RGB')
+
+        # Save to bytes
+        img_buffer = io.BytesIO()
+        img.save(img_buffer, format='PNG')
+
+        # Calculate appropriate width (max 6 inches)
+        img_width_inches = min(img.width / 96, self.MAX_IMAGE_WIDTH_INCHES)
+        return img_buffer.getvalue(), img_width_inches
@@ -0,0 +1,474 @@
+"""
+PDF HTTP Service
+Small local HTTP API over the editors' operations, backed by a process pool so
+internal tools can call them instead of driving the Tk apps:
+
+    python pdf_http_service.py --port 8765 --workers 4
+
+Endpoints (PDFs are sent as the raw request body unless noted):
+
+    POST /render?page=1&zoom=2                 -> image/png
+    POST /unlock                               -> application/pdf
+    POST /merge      JSON {"documents": [base64 PDF, ...]}            -> application/pdf
+    POST /split?ranges=1-3,4-6  or  ?every=N   -> application/zip of parts
+    POST /convert                              -> .docx
+    POST /annotate   JSON {"document": base64 PDF, "annotations": [...],
+                           "password": optional}                      -> application/pdf
+    GET  /health, GET /metrics                 -> JSON
+
+Passwords of encrypted PDFs go in the X-PDF-Password header (or the JSON body
+for /annotate), never in the URL, where access logs and proxies would keep
+them; a password in the query string is rejected.
+
+Requests wait in the pool's queue until a worker is free; once max_pending
+requests are queued or running, new ones get 429 with Retry-After. /metrics
+reports a latency histogram per endpoint, with requests to unknown paths
+counted together under "unknown". The server binds to 127.0.0.1 by
+default and needs no network access.
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import fitz  # PyMuPDF
+
+from pdf_engine import (PageRangeSet, PasswordRequiredError, WordConverter,
+                        annotation_from_dict, apply_annotations, is_password_protected,
+                        open_document_bytes, render_page)
+
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+PASSWORD_HEADER = "X-PDF-Password"
+
+# Metrics key for requests to paths that are not endpoints, so they cannot add histograms
+UNKNOWN_ENDPOINT = "unknown"
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# ---------------------------------------------------------------------------
+# Operations (run inside worker processes)
+# ---------------------------------------------------------------------------
+
+def render_png(data: bytes, page: int = 1, zoom: float = 1.0,
+               password: Optional[str] = None) -> bytes:
+    """Render a 1-based page to PNG"""
+    doc = open_document_bytes(data, password)
+    try:
+        if not 1 <= page <= len(doc):
+            raise ValueError(f"Page {page} out of range (1-{len(doc)})")
+        img = render_page(doc, page - 1, zoom)
+    finally:
+        doc.close()
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def unlock_pdf(data: bytes, password: Optional[str] = None) -> bytes:
+    """Return a decrypted copy of a password-protected PDF"""
+    doc = open_document_bytes(data, password)
+    try:
+        if not is_password_protected(doc):
+            raise ValueError("Not password protected")
+        return doc.tobytes(encryption=fitz.PDF_ENCRYPT_NONE)
+    finally:
+        doc.close()
+
+
+def merge_pdfs(documents: List[bytes]) -> bytes:
+    """Concatenate PDFs in the given order"""
+    if len(documents) < 2:
+        raise ValueError("Provide at least 2 documents to merge")
+    merged = fitz.open()
+    try:
+        for data in documents:
+            src = open_document_bytes(data)
+            merged.insert_pdf(src)
+            src.close()
+        return merged.tobytes(garbage=1)
+    finally:
+        merged.close()
+
+
+def split_pdf(data: bytes, ranges: Optional[str] = None, every: Optional[int] = None) -> bytes:
+    """Split by page ranges ("1-3,4-6") or every N pages into a zip of PDFs"""
+    src = open_document_bytes(data)
+    try:
+        total = len(src)
+        if ranges:
+            parts = [PageRangeSet.parse(part.strip(), total) for part in ranges.split(',')]
+        elif every and every > 0:
+            parts = [PageRangeSet([(start, min(start + every, total))])
+                     for start in range(0, total, every)]
+        else:
+            raise ValueError("Provide 'ranges' or a positive 'every'")
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for idx, part in enumerate((p for p in parts if p), 1):
+                out = fitz.open()
+                for start, stop in part.intervals():
+                    out.insert_pdf(src, from_page=start, to_page=stop - 1)
+                archive.writestr(f"part_{idx}_pages_{part.first + 1}-{part.last + 1}.pdf",
+                                 out.tobytes(garbage=1))
+                out.close()
+        return buffer.getvalue()
+    finally:
+        src.close()
+
+
+def convert_pdf(data: bytes, password: Optional[str] = None) -> bytes:
+    """Convert a PDF to a Word document"""
+    doc = open_document_bytes(data, password)
+    try:
+        buffer = io.BytesIO()
+        WordConverter(doc).convert(buffer)
+        return buffer.getvalue()
+    finally:
+        doc.close()
+
+
+def annotate_pdf(data: bytes, annotations: List[dict], password: Optional[str] = None) -> bytes:
+    """Burn JSON annotations (see pdf_engine.annotation_from_dict) into a PDF"""
+    items = [annotation_from_dict(a) for a in annotations]
+    doc = open_document_bytes(data, password)
+    try:
+        for item in items:
+            if item.page_num >= len(doc):
+                raise ValueError(f"Annotation page {item.page_num + 1} out of range (1-{len(doc)})")
+        apply_annotations(doc, items)
+        return doc.tobytes(encryption=fitz.PDF_ENCRYPT_KEEP)
+    finally:
+        doc.close()
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class LatencyHistogram:
+    """Per-bucket counts of request latencies for one endpoint"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.statuses: Dict[int, int] = {}
+
+    def observe(self, seconds: float, status: int):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            'count': self.total,
+            'mean_seconds': round(self.sum / self.total, 4) if self.total else None,
+            'max_seconds': round(self.max, 4),
+            'buckets': dict(zip(labels, self.counts)),
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+# ---------------------------------------------------------------------------
+# HTTP layer
+# ---------------------------------------------------------------------------
+
+class HTTPError(Exception):
+    """Error carrying the HTTP status to send"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PDFServiceHandler(BaseHTTPRequestHandler):
+    """Routes requests to the service's worker pool"""
+
+    server_version = "PDFService/1.0"
+    service: "PDFService" = None
+
+    def log_message(self, format, *args):
+        if self.service.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {'status': 'ok', 'workers': self.service.workers})
+        elif path == "/metrics":
+            self._send_json(200, self.service.metrics())
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/")
+        start = time.perf_counter()
+        status = 500
+        try:
+            if endpoint not in self.service.ROUTES:
+                endpoint = UNKNOWN_ENDPOINT
+                raise HTTPError(404, f"Unknown endpoint {url.path}")
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if 'password' in query:
+                raise HTTPError(400, f"Send the password in the {PASSWORD_HEADER} header, "
+                                     f"not in the URL")
+
+            # Take a slot before reading the body, so a busy server does not
+            # hold the uploads of every client it is about to turn away
+            if not self.service.slots.acquire(blocking=False):
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self._finish_json({'error': "Server busy, retry later"})
+                status = 429
+                return
+            try:
+                func, args, content_type = self.service.ROUTES[endpoint](
+                    self._read_body(), query, self._password())
+                body = self.service.run(func, *args)
+            finally:
+                self.service.slots.release()
+
+            status = 200
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        except HTTPError as e:
+            status = e.status
+            self._send_json(status, {'error': str(e)})
+        except PasswordRequiredError as e:
+            status = 401
+            self._send_json(status, {'error': str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            status = 400
+            self._send_json(status, {'error': str(e)})
+        except Exception as e:
+            status = 500
+            self._send_json(status, {'error': str(e)})
+        finally:
+            self.service.observe(endpoint, time.perf_counter() - start, status)
+
+    def _password(self) -> Optional[str]:
+        value = self.headers.get(PASSWORD_HEADER)
+        if value is None:
+            return None
+        # http.server decodes headers as Latin-1; clients send UTF-8
+        try:
+            return value.encode("latin-1").decode("utf-8")
+        except UnicodeError:
+            return value
+
+    def _read_body(self) -> bytes:
+        value = self.headers.get("Content-Length")
+        if value is None:
+            raise HTTPError(411, "Content-Length header required")
+        value = value.strip()
+        if not (value.isascii() and value.isdigit()):
+            raise HTTPError(400, f"Invalid Content-Length header: {value!r}")
+        length = int(value)
+        if length > self.service.max_body:
+            raise HTTPError(413, f"Request body larger than {self.service.max_body} bytes")
+        return self.rfile.read(length)
+
+    def _send_json(self, status: int, payload: dict):
+        self.send_response(status)
+        self._finish_json(payload)
+
+    def _finish_json(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _require_pdf(body: bytes) -> bytes:
+    if not body:
+        raise HTTPError(400, "Request body must be a PDF")
+    return body
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Request body must be JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return payload
+
+
+def _route_render(body, query, password) -> Tuple:
+    return (render_png, (_require_pdf(body), int(query.get('page', 1)),
+                         float(query.get('zoom', 1.0)), password), "image/png")
+
+
+def _route_unlock(body, query, password) -> Tuple:
+    return unlock_pdf, (_require_pdf(body), password), "application/pdf"
+
+
+def _route_merge(body, query, password) -> Tuple:
+    documents = [base64.b64decode(d) for d in _json_body(body).get('documents', [])]
+    return merge_pdfs, (documents,), "application/pdf"
+
+
+def _route_split(body, query, password) -> Tuple:
+    every = int(query['every']) if query.get('every') else None
+    return split_pdf, (_require_pdf(body), query.get('ranges'), every), "application/zip"
+
+
+def _route_convert(body, query, password) -> Tuple:
+    return convert_pdf, (_require_pdf(body), password), DOCX_TYPE
+
+
+def _route_annotate(body, query, password) -> Tuple:
+    payload = _json_body(body)
+    if 'document' not in payload:
+        raise HTTPError(400, "JSON body needs 'document' (base64 PDF)")
+    return (annotate_pdf, (base64.b64decode(payload['document']),
+                           payload.get('annotations', []), payload.get('password', password)),
+            "application/pdf")
+
+
+class PDFService:
+    """Threaded HTTP server in front of a process pool"""
+
+    ROUTES = {
+        'render': _route_render,
+        'unlock': _route_unlock,
+        'merge': _route_merge,
+        'split': _route_split,
+        'convert': _route_convert,
+        'annotate': _route_annotate,
+    }
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, max_body: int = 200 * 1024 * 1024,
+                 verbose: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.max_body = max_body
+        self.verbose = verbose
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._pool_lock = threading.Lock()
+
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._metrics_lock = threading.Lock()
+        self.started = time.time()
+
+        handler = type("BoundPDFServiceHandler", (PDFServiceHandler,), {'service': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def run(self, func, *args):
+        """Run func on the worker pool and return its result
+
+        A worker crash breaks the whole pool; it is replaced so later requests
+        work again, and this request is answered with 503 rather than retried,
+        as running it again may crash the new pool too.
+        """
+        pool = self.pool
+        try:
+            return pool.submit(func, *args).result()
+        except BrokenProcessPool:
+            with self._pool_lock:
+                if self.pool is pool:
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise HTTPError(503, "A worker process crashed; retry the request")
+
+    def observe(self, endpoint: str, seconds: float, status: int):
+        with self._metrics_lock:
+            if endpoint not in self._histograms:
+                self._histograms[endpoint] = LatencyHistogram()
+            self._histograms[endpoint].observe(seconds, status)
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            endpoints = {name: h.to_dict() for name, h in sorted(self._histograms.items())}
+        return {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'endpoints': endpoints,
+        }
+
+    def start(self):
+        """Serve in a background thread (used by tests and embedding apps)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        with self._pool_lock:
+            self.pool.shutdown(cancel_futures=True)
+        if self._thread:
+            self._thread.join()
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Local HTTP service for PDF operations")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Requests queued or running before answering 429 "
+                             "(default: 4 per worker)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = PDFService(args.host, args.port, args.workers, args.max_pending,
+                         verbose=args.verbose)
+    print(f"PDF service listening on {service.url} with {service.workers} worker(s)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
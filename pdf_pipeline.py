@@ -0,0 +1,564 @@
+"""
+PDF Job Pipeline
+Runs a declarative job spec (JSON or YAML) of ordered stages over a set of input
+PDFs and writes a per-file result manifest:
+
+    python pdf_pipeline.py nightly.yaml
+    python pdf_pipeline.py nightly.json --workers 4
+
+Example spec (YAML needs PyYAML; JSON works with the same keys):
+
+    inputs: ["incoming/*.pdf"]
+    output_dir: processed
+    workers: 4
+    max_in_flight: 8
+    stages:
+      - op: unlock
+        password: "{stem}-2024"
+      - op: rotate
+        pages: "1-3"
+        angle: 90
+      - op: annotate
+        annotations:
+          - {type: stamp, page: 1, x: 400, y: 40, stamp_type: approved}
+      - op: convert
+      - op: encrypt
+        password: "{stem}-out"
+
+Stages before a merge run per input file in worker processes, with at most
+max_in_flight files submitted at once so large input sets stream through with
+bounded memory. A merge stage combines the per-file results in input order and
+any later stages run on the merged document.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+from pdf_batch_encrypt import load_password_map, resolve_password
+from pdf_engine import (PageRangeSet, WordConverter, annotation_from_dict, apply_annotations,
+                        is_password_protected, open_document, remove_password,
+                        save_document, write_pages)
+
+
+MANIFEST_NAME = "pipeline_manifest.json"
+
+# A document flowing through the pipeline: (output label, current file path)
+Document = Tuple[str, str]
+
+
+class StageContext:
+    """Per-file state shared by the stages of one pipeline run"""
+
+    def __init__(self, source_path: str, work_dir: str, output_dir: str):
+        self.source_path = source_path
+        self.work_dir = work_dir
+        self.output_dir = output_dir
+        self.artifacts: List[str] = []
+        self._counter = 0
+
+    def temp_path(self, label: str, op: str) -> str:
+        """Unique intermediate file path inside the work directory"""
+        self._counter += 1
+        return os.path.join(self.work_dir, f"{label}.{self._counter}.{op}.pdf")
+
+    def password(self, stage: dict, key: str = 'password') -> Optional[str]:
+        """Resolve a stage password template against the original input name"""
+        password_map = load_password_map(stage['password_csv']) if stage.get('password_csv') else None
+        return resolve_password(self.source_path, stage.get(key), password_map)
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def _stage_unlock(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Remove password protection (unencrypted documents pass through)"""
+    result = []
+    for label, path in docs:
+        doc = open_document(path, ctx.password(stage))
+        try:
+            if is_password_protected(doc):
+                out_path = ctx.temp_path(label, 'unlock')
+                remove_password(doc, out_path)
+                path = out_path
+        finally:
+            doc.close()
+        result.append((label, path))
+    return result
+
+
+def _stage_rotate(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Rotate the selected pages clockwise by a multiple of 90 degrees"""
+    result = []
+    for label, path in docs:
+        reader = PdfReader(path)
+        for i in PageRangeSet.parse(str(stage.get('pages', 'all')), len(reader.pages)):
+            reader.pages[i].rotate(stage['angle'])
+        out_path = ctx.temp_path(label, 'rotate')
+        write_pages(reader.pages, out_path)
+        result.append((label, out_path))
+    return result
+
+
+def _stage_crop(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Trim margins (in points) from the selected pages"""
+    result = []
+    for label, path in docs:
+        reader = PdfReader(path)
+        for i in PageRangeSet.parse(str(stage.get('pages', 'all')), len(reader.pages)):
+            page = reader.pages[i]
+            media_box = page.mediabox
+            page.mediabox.lower_left = (float(media_box.left) + stage.get('left', 0),
+                                        float(media_box.bottom) + stage.get('bottom', 0))
+            page.mediabox.upper_right = (float(media_box.right) - stage.get('right', 0),
+                                         float(media_box.top) - stage.get('top', 0))
+        out_path = ctx.temp_path(label, 'crop')
+        write_pages(reader.pages, out_path)
+        result.append((label, out_path))
+    return result
+
+
+def _stage_annotate(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Burn annotations (same JSON shape as annotation_from_dict) into each document"""
+    annotations = [annotation_from_dict(a) for a in stage['annotations']]
+    result = []
+    for label, path in docs:
+        doc = open_document(path)
+        try:
+            apply_annotations(doc, [a for a in annotations if a.page_num < len(doc)])
+            out_path = ctx.temp_path(label, 'annotate')
+            save_document(doc, out_path)
+        finally:
+            doc.close()
+        result.append((label, out_path))
+    return result
+
+
+def _stage_encrypt(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Encrypt each document with AES-256"""
+    password = ctx.password(stage)
+    if not password:
+        raise ValueError("No password for file")
+    result = []
+    for label, path in docs:
+        out_path = ctx.temp_path(label, 'encrypt')
+        write_pages(PdfReader(path).pages, out_path, user_password=password,
+                    owner_password=ctx.password(stage, 'owner_password'))
+        result.append((label, out_path))
+    return result
+
+
+def _stage_split(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Split each document into parts, by 'ranges' ("1-3,4-6") or 'every' N pages"""
+    result = []
+    for label, path in docs:
+        reader = PdfReader(path)
+        total = len(reader.pages)
+        if stage.get('ranges'):
+            parts = [PageRangeSet.parse(part.strip(), total)
+                     for part in str(stage['ranges']).split(',')]
+        else:
+            every = int(stage['every'])
+            parts = [PageRangeSet([(start, min(start + every, total))])
+                     for start in range(0, total, every)]
+
+        for idx, part in enumerate((p for p in parts if p), 1):
+            part_label = f"{label}_part_{idx}"
+            out_path = ctx.temp_path(part_label, 'split')
+            write_pages((reader.pages[i] for i in part), out_path)
+            result.append((part_label, out_path))
+    return result
+
+
+def _stage_convert(docs: List[Document], stage: dict, ctx: StageContext) -> List[Document]:
+    """Write a Word document next to the outputs; the PDF continues unchanged"""
+    for label, path in docs:
+        docx_path = os.path.join(ctx.output_dir, f"{label}.docx")
+        doc = open_document(path)
+        try:
+            WordConverter(doc).convert(docx_path)
+        finally:
+            doc.close()
+        ctx.artifacts.append(docx_path)
+    return docs
+
+
+STAGES: Dict[str, Callable[[List[Document], dict, StageContext], List[Document]]] = {
+    'unlock': _stage_unlock,
+    'rotate': _stage_rotate,
+    'crop': _stage_crop,
+    'annotate': _stage_annotate,
+    'encrypt': _stage_encrypt,
+    'split': _stage_split,
+    'convert': _stage_convert,
+}
+
+# Stage options that must be present, by op
+REQUIRED_OPTIONS = {
+    'rotate': ('angle',),
+    'annotate': ('annotations',),
+    'encrypt': ('password',),
+}
+
+# Options that must be numbers, with the types accepted for each
+NUMERIC_OPTIONS = {
+    'rotate': {'angle': (int,)},
+    'split': {'every': (int,)},
+    'crop': {side: (int, float) for side in ('left', 'bottom', 'right', 'top')},
+}
+
+
+# ---------------------------------------------------------------------------
+# Job spec
+# ---------------------------------------------------------------------------
+
+def load_job(spec_path: str) -> dict:
+    """Read a JSON or YAML job spec and resolve its paths against the spec's folder"""
+    with open(spec_path, encoding="utf-8") as f:
+        text = f.read()
+
+    if spec_path.lower().endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML job specs need PyYAML:\npip install pyyaml")
+        job = yaml.safe_load(text)
+    else:
+        job = json.loads(text)
+
+    if not isinstance(job, dict):
+        raise ValueError("Job spec must be a mapping")
+
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+    job['inputs'] = [os.path.join(base_dir, p) for p in _as_list(job.get('inputs'))]
+    if job.get('output_dir'):
+        job['output_dir'] = os.path.join(base_dir, job['output_dir'])
+    for stage in job.get('stages') or []:
+        if isinstance(stage, dict) and stage.get('password_csv'):
+            stage['password_csv'] = os.path.join(base_dir, stage['password_csv'])
+
+    validate_job(job)
+    return job
+
+
+def validate_job(job: dict):
+    """Raise ValueError describing the first problem in a job spec"""
+    if not job.get('inputs'):
+        raise ValueError("Job spec needs at least one entry in 'inputs'")
+    if not job.get('output_dir'):
+        raise ValueError("Job spec needs an 'output_dir'")
+
+    stages = job.get('stages')
+    if not stages:
+        raise ValueError("Job spec needs at least one stage")
+
+    merges = 0
+    for number, stage in enumerate(stages, 1):
+        if not isinstance(stage, dict) or 'op' not in stage:
+            raise ValueError(f"Stage {number} must be a mapping with an 'op'")
+        op = stage['op']
+        if op == 'merge':
+            merges += 1
+            continue
+        if op not in STAGES:
+            raise ValueError(f"Stage {number}: unknown op '{op}'")
+        for option in REQUIRED_OPTIONS.get(op, ()):
+            if option not in stage:
+                raise ValueError(f"Stage {number} ({op}) needs '{option}'")
+        for option, types in NUMERIC_OPTIONS.get(op, {}).items():
+            value = stage.get(option)
+            # bool is an int subclass, but true/false in a spec is a mistake
+            if value is not None and (isinstance(value, bool) or not isinstance(value, types)):
+                kind = "a whole number" if types == (int,) else "a number"
+                raise ValueError(f"Stage {number} ({op}): '{option}' must be {kind}, "
+                                 f"not {value!r}")
+        if op == 'rotate' and stage['angle'] % 90:
+            raise ValueError(f"Stage {number}: angle must be a multiple of 90")
+        if op == 'split' and not (stage.get('ranges') or stage.get('every')):
+            raise ValueError(f"Stage {number} (split) needs 'ranges' or 'every'")
+        if op == 'split' and not stage.get('ranges') and stage['every'] < 1:
+            raise ValueError(f"Stage {number} (split): 'every' must be at least 1")
+
+    if merges > 1:
+        raise ValueError("Only one merge stage is allowed per job")
+
+
+def iter_inputs(patterns: Iterable[str]) -> Iterator[str]:
+    """Yield input PDFs for glob patterns or folders, each file once"""
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*.pdf")
+        for path in sorted(glob.glob(pattern)):
+            path = os.path.abspath(path)
+            if path not in seen and os.path.isfile(path):
+                seen.add(path)
+                yield path
+
+
+def label_inputs(paths: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Pair each input with its output label, the file stem
+
+    Inputs from different folders that share a name get a numeric suffix
+    instead of overwriting each other in the output folder.
+    """
+    used = set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        label = stem
+        counter = 2
+        while label in used:
+            label = f"{stem}_{counter}"
+            counter += 1
+        used.add(label)
+        yield path, label
+
+
+def _as_list(value) -> List:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def run_stages(docs: List[Document], stages: List[dict], ctx: StageContext,
+               timings: List[dict]) -> List[Document]:
+    """Run stages in order, recording per-stage wall time"""
+    for stage in stages:
+        start = time.perf_counter()
+        docs = STAGES[stage['op']](docs, stage, ctx)
+        timings.append({'op': stage['op'], 'seconds': round(time.perf_counter() - start, 4)})
+    return docs
+
+
+def publish(docs: List[Document], output_dir: str) -> List[str]:
+    """Copy finished documents to the output folder as <label>.pdf"""
+    outputs = []
+    for label, path in docs:
+        out_path = os.path.join(output_dir, f"{label}.pdf")
+        shutil.copyfile(path, out_path)
+        outputs.append(out_path)
+    return outputs
+
+
+def process_file(index: int, input_path: str, label: str, stages: List[dict], work_dir: str,
+                 output_dir: str, final: bool) -> dict:
+    """Run the per-file stages for one input (runs inside a worker process)
+
+    Intermediate files go to a folder of their own under work_dir, so inputs
+    that share a name never overwrite each other's stages. With final set the
+    folder is removed once the outputs are published; otherwise it holds the
+    documents a later merge reads.
+    """
+    start = time.perf_counter()
+    file_work_dir = os.path.join(work_dir, str(index))
+    os.makedirs(file_work_dir, exist_ok=True)
+    ctx = StageContext(input_path, file_work_dir, output_dir)
+    result = {
+        'index': index,
+        'input': input_path,
+        'status': 'ok',
+        'outputs': [],
+        'stages': [],
+        'error': None,
+    }
+
+    try:
+        docs = run_stages([(label, input_path)], stages, ctx, result['stages'])
+        if final:
+            result['outputs'] = publish(docs, output_dir)
+        else:
+            result['documents'] = docs
+        result['outputs'] += ctx.artifacts
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    finally:
+        if final or result['status'] == 'error':
+            shutil.rmtree(file_work_dir, ignore_errors=True)
+
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _failed_result(job: tuple, error: Exception) -> dict:
+    """Result for a file whose worker never reported back"""
+    index, input_path = job[:2]
+    return {
+        'index': index,
+        'input': input_path,
+        'status': 'error',
+        'outputs': [],
+        'stages': [],
+        'error': str(error) or type(error).__name__,
+        'seconds': 0,
+    }
+
+
+def _bounded_submit(pool: ProcessPoolExecutor, jobs: Iterable[tuple],
+                    max_in_flight: int) -> Iterator[dict]:
+    """Submit jobs lazily, keeping at most max_in_flight pending, and yield results
+
+    A worker that crashes or a job that cannot be sent to one fails that file
+    only; the error is reported in its result like any other failure.
+    """
+    pending: Dict[Future, tuple] = {}
+
+    def collect(done) -> Iterator[dict]:
+        for future in done:
+            job = pending.pop(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                yield _failed_result(job, e)
+
+    for job in jobs:
+        if len(pending) >= max_in_flight:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+        try:
+            pending[pool.submit(process_file, *job)] = job
+        except Exception as e:
+            # The pool is broken once a worker has died; later files fail here
+            yield _failed_result(job, e)
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        yield from collect(done)
+
+
+def run_job(job: dict, workers: Optional[int] = None,
+            progress_callback: Optional[Callable[[int, dict], None]] = None) -> dict:
+    """Execute a validated job spec and write its manifest to the output folder"""
+    validate_job(job)
+    start = time.perf_counter()
+    output_dir = job['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+
+    workers = workers or job.get('workers') or os.cpu_count() or 1
+    max_in_flight = max(1, int(job.get('max_in_flight') or workers * 2))
+
+    stages = job['stages']
+    ops = [s['op'] for s in stages]
+    merge_at = ops.index('merge') if 'merge' in ops else None
+    file_stages = stages if merge_at is None else stages[:merge_at]
+
+    results: List[dict] = []
+    merged = None
+    work_dir = tempfile.mkdtemp(prefix="pdf_pipeline_")
+    try:
+        file_jobs = ((index, path, label, file_stages, work_dir, output_dir, merge_at is None)
+                     for index, (path, label) in enumerate(label_inputs(iter_inputs(job['inputs']))))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, result in enumerate(_bounded_submit(pool, file_jobs, max_in_flight), 1):
+                results.append(result)
+                if progress_callback:
+                    progress_callback(done, result)
+
+        results.sort(key=lambda r: r['index'])
+
+        if merge_at is not None:
+            merged = _run_merge(results, stages[merge_at], stages[merge_at + 1:],
+                                work_dir, output_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for result in results:
+        result.pop('documents', None)
+
+    manifest = {
+        'created': datetime.now().isoformat(),
+        'output_dir': os.path.abspath(output_dir),
+        'stages': ops,
+        'workers': workers,
+        'max_in_flight': max_in_flight,
+        'total': len(results),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] == 'error'),
+        'seconds': round(time.perf_counter() - start, 4),
+        'files': results,
+    }
+    if merged is not None:
+        manifest['merged'] = merged
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def _run_merge(results: List[dict], merge_stage: dict, stages: List[dict],
+               work_dir: str, output_dir: str) -> dict:
+    """Merge successful per-file documents in input order, then run the remaining stages"""
+    start = time.perf_counter()
+    label = merge_stage.get('name', 'merged')
+    merged = {'status': 'ok', 'inputs': 0, 'outputs': [], 'stages': [], 'error': None}
+
+    try:
+        paths = [path for r in results if r['status'] == 'ok' for _, path in r['documents']]
+        if not paths:
+            raise ValueError("Nothing to merge")
+
+        ctx = StageContext(label + ".pdf", work_dir, output_dir)
+        merged_path = ctx.temp_path(label, 'merge')
+        write_pages((page for path in paths for page in PdfReader(path).pages), merged_path)
+        merged['inputs'] = len(paths)
+        merged['stages'].append({'op': 'merge', 'seconds': round(time.perf_counter() - start, 4)})
+
+        docs = run_stages([(label, merged_path)], stages, ctx, merged['stages'])
+        merged['outputs'] = publish(docs, output_dir) + ctx.artifacts
+    except Exception as e:
+        merged['status'] = 'error'
+        merged['error'] = str(e)
+
+    merged['seconds'] = round(time.perf_counter() - start, 4)
+    return merged
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Run a JSON/YAML PDF job spec as a parallel streaming pipeline")
+    parser.add_argument("spec", help="Job spec file (.json, .yaml or .yml)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (overrides the spec)")
+    args = parser.parse_args(argv)
+
+    try:
+        job = load_job(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"Invalid job spec: {e}", file=sys.stderr)
+        return 2
+
+    def progress(done, result):
+        print(f"  [{done}] {os.path.basename(result['input'])}: {result['status']}")
+
+    manifest = run_job(job, workers=args.workers, progress_callback=progress)
+
+    print(f"Processed {manifest['succeeded']} of {manifest['total']} file(s) "
+          f"in {manifest['seconds']:.2f}s ({manifest['failed']} failed)")
+    if 'merged' in manifest:
+        print(f"Merged output: {manifest['merged']['status']}")
+    print(f"Manifest: {os.path.join(job['output_dir'], MANIFEST_NAME)}")
+
+    failed = manifest['failed'] or manifest.get('merged', {}).get('status') == 'error'
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
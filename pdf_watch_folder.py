@@ -0,0 +1,420 @@
+"""
+PDF Watch Folder
+Long-running service that picks up PDFs dropped into an inbox folder, runs the
+editor's unlock / convert-to-Word / stamp operations on a worker pool and moves
+the results to an outbox (or the originals to an error folder on failure):
+
+    python pdf_watch_folder.py inbox/ outbox/ errors/ --unlock "{stem}-2024" --convert
+    python pdf_watch_folder.py inbox/ outbox/ errors/ --stamp approved --workers 4
+
+New files are noticed through Linux inotify when available and by polling
+otherwise. A file is only processed once its size and modification time have
+been unchanged for --settle seconds, so partially copied files are left alone.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pdf_pipeline import process_file, validate_job
+
+
+METRICS_NAME = "watch_metrics.json"
+
+
+def unique_destination(folder: str, name: str) -> str:
+    """Path for name in folder, with a timestamp (and counter) added if the name is taken"""
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(name)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(folder, f"{stem}_{stamp}{ext}")
+    counter = 2
+    while os.path.exists(path):
+        path = os.path.join(folder, f"{stem}_{stamp}_{counter}{ext}")
+        counter += 1
+    return path
+
+
+class InotifyWatcher:
+    """Wakes up on file changes in one directory using Linux inotify (via libc)"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives or timeout passes; True if events were read"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # The folder is rescanned on every wakeup, so the event payloads are discarded
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class WatchFolder:
+    """Inbox -> worker pool -> outbox/error folder processing loop"""
+
+    def __init__(self, inbox: str, outbox: str, error_dir: str, stages: List[dict],
+                 workers: Optional[int] = None, settle_seconds: float = 2.0,
+                 poll_interval: float = 1.0, archive_dir: Optional[str] = None,
+                 use_inotify: bool = True):
+        folders = [os.path.abspath(p) for p in (inbox, outbox, error_dir)]
+        if len(set(folders)) != 3:
+            raise ValueError("Inbox, outbox and error folders must be different")
+        validate_job({'inputs': [inbox], 'output_dir': outbox, 'stages': stages})
+        if any(stage['op'] == 'merge' for stage in stages):
+            raise ValueError("Watch folders process files one at a time; merge is not supported")
+
+        self.inbox, self.outbox, self.error_dir = folders
+        self.archive_dir = os.path.abspath(archive_dir or os.path.join(self.outbox, "originals"))
+        self.stages = stages
+        self.workers = workers or os.cpu_count() or 1
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+
+        for folder in (self.inbox, self.outbox, self.error_dir, self.archive_dir):
+            os.makedirs(folder, exist_ok=True)
+
+        # path -> (size, mtime, time the pair was last seen changing)
+        self._candidates: Dict[str, Tuple[int, float, float]] = {}
+        # future -> (path, time first seen, work dir, output label)
+        self._in_flight: Dict[Future, Tuple[str, float, str, str]] = {}
+        # path -> time first seen, for files that were in flight when a worker
+        # crashed; they are retried one at a time to find the file that crashed it
+        self._retry: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._index = 0
+
+        self.watcher_type = "polling"
+        self.started = time.time()
+        self.processed = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def stop(self):
+        """Ask a running loop to finish in-flight files and return"""
+        self._stop.set()
+
+    def find_ready_files(self) -> List[str]:
+        """Return inbox PDFs whose size and mtime have settled and are not yet queued"""
+        now = time.time()
+        queued = {path for path, _, _, _ in self._in_flight.values()} | set(self._retry)
+        present = set()
+        ready = []
+
+        for entry in os.scandir(self.inbox):
+            if not entry.is_file() or not entry.name.lower().endswith(".pdf"):
+                continue
+            path = entry.path
+            present.add(path)
+            if path in queued:
+                continue
+
+            stat = entry.stat()
+            previous = self._candidates.get(path)
+            if previous is None or previous[:2] != (stat.st_size, stat.st_mtime):
+                self._candidates[path] = (stat.st_size, stat.st_mtime, now)
+            elif stat.st_size > 0 and now - previous[2] >= self.settle_seconds:
+                ready.append(path)
+
+        # Forget files that were removed from the inbox by someone else
+        for path in list(self._candidates):
+            if path not in present:
+                del self._candidates[path]
+
+        return sorted(ready)
+
+    def _output_label(self, path: str) -> str:
+        """Label for a file's results that no earlier or in-flight result uses
+
+        A file sent again under the same name gets a timestamp (and counter)
+        added, as unique_destination does for originals, instead of
+        overwriting the earlier <label>.pdf, .docx or _part_ files.
+        """
+        stem = os.path.splitext(os.path.basename(path))[0]
+        taken = {label for _, _, _, label in self._in_flight.values()}
+        existing = [os.path.splitext(name)[0] for name in os.listdir(self.outbox)]
+
+        def is_free(label: str) -> bool:
+            return label not in taken and not any(
+                name == label or name.startswith(f"{label}_part_") for name in existing)
+
+        if is_free(stem):
+            return stem
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        label = f"{stem}_{stamp}"
+        counter = 2
+        while not is_free(label):
+            label = f"{stem}_{stamp}_{counter}"
+            counter += 1
+        return label
+
+    def _submit(self, pool: ProcessPoolExecutor, path: str, first_seen: Optional[float] = None):
+        if first_seen is None:
+            first_seen = self._candidates.pop(path)[2]
+            self.bytes_in += os.path.getsize(path)
+        work_dir = tempfile.mkdtemp(prefix="pdf_watch_")
+        label = self._output_label(path)
+        try:
+            future = pool.submit(process_file, self._index, path, label, self.stages,
+                                 work_dir, self.outbox, True)
+        except BrokenProcessPool:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            self._retry[path] = first_seen
+            raise
+        self._index += 1
+        self._in_flight[future] = (path, first_seen, work_dir, label)
+
+    def _recover(self, pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace a pool broken by a crashed worker and requeue the files it held
+
+        Results that arrived before the crash are kept. A file that was alone
+        in the pool when it broke is the one that crashed it and goes to the
+        error folder; other files are retried, one at a time.
+        """
+        pool.shutdown(wait=True, cancel_futures=True)
+        for future in list(self._in_flight):
+            if not future.cancelled() and not isinstance(future.exception(), BrokenProcessPool):
+                self._finish(future)
+
+        lost = list(self._in_flight)
+        if len(lost) == 1:
+            self._finish(lost[0])
+        else:
+            for future in lost:
+                path, first_seen, work_dir, _ = self._in_flight.pop(future)
+                shutil.rmtree(work_dir, ignore_errors=True)
+                self._retry[path] = first_seen
+        print(f"  Worker crashed; restarting the pool ({len(self._retry)} file(s) to retry)")
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def _finish(self, future: Future):
+        path, first_seen, work_dir, _ = self._in_flight.pop(future)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {'input': path, 'status': 'error', 'outputs': [], 'error': str(e)}
+
+        # Earlier files of the same name are kept, not overwritten
+        name = os.path.basename(path)
+        try:
+            if result['status'] == 'ok':
+                shutil.move(path, unique_destination(self.archive_dir, name))
+            else:
+                destination = unique_destination(self.error_dir, name)
+                shutil.move(path, destination)
+                with open(destination + ".error.txt", "w", encoding="utf-8") as f:
+                    f.write(f"{datetime.now().isoformat()}\n{result['error']}\n")
+        except OSError as e:
+            # Removed or locked by someone else; the loop carries on regardless
+            result = dict(result, status='error', error=f"Could not move {name}: {e}")
+        if result['status'] == 'ok':
+            self.processed += 1
+        else:
+            self.failed += 1
+
+        latency = time.time() - first_seen
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        print(f"  {name}: {result['status']} in {latency:.2f}s"
+              + (f" ({result['error']})" if result['error'] else ""))
+
+    def metrics(self) -> dict:
+        """Throughput and latency counters since the loop started"""
+        uptime = max(time.time() - self.started, 1e-9)
+        finished = self.processed + self.failed
+        return {
+            'updated': datetime.now().isoformat(),
+            'watcher': self.watcher_type,
+            'workers': self.workers,
+            'uptime_seconds': round(uptime, 1),
+            'processed': self.processed,
+            'failed': self.failed,
+            'in_flight': len(self._in_flight),
+            'waiting_to_settle': len(self._candidates),
+            'files_per_minute': round(finished * 60 / uptime, 2),
+            'mb_per_second': round(self.bytes_in / uptime / 1_000_000, 3),
+            'avg_latency_seconds': round(self.total_latency / finished, 3) if finished else None,
+            'max_latency_seconds': round(self.max_latency, 3),
+        }
+
+    def write_metrics(self):
+        with open(os.path.join(self.outbox, METRICS_NAME), "w", encoding="utf-8") as f:
+            json.dump(self.metrics(), f, indent=2)
+
+    def run(self, max_files: Optional[int] = None, metrics_interval: float = 60.0) -> dict:
+        """Watch the inbox until stop() is called (or max_files have finished)
+
+        Returns the final metrics.
+        """
+        watcher = None
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                watcher = InotifyWatcher(self.inbox)
+                self.watcher_type = "inotify"
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling")
+
+        self.started = time.time()
+        last_metrics = self.started
+        max_in_flight = self.workers * 2
+
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            while not self._stop.is_set():
+                try:
+                    done = [f for f in self._in_flight if f.done()]
+                    if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+                        pool = self._recover(pool)
+                        continue
+                    for future in done:
+                        self._finish(future)
+
+                    if max_files is not None and self.processed + self.failed >= max_files:
+                        break
+
+                    if self._retry:
+                        # Alone in the pool, so a second crash points at this file
+                        if not self._in_flight:
+                            path = next(iter(self._retry))
+                            self._submit(pool, path, self._retry.pop(path))
+                    else:
+                        for path in self.find_ready_files():
+                            if len(self._in_flight) >= max_in_flight:
+                                break
+                            self._submit(pool, path)
+                except BrokenProcessPool:
+                    pool = self._recover(pool)
+                    continue
+
+                if time.time() - last_metrics >= metrics_interval:
+                    self.write_metrics()
+                    last_metrics = time.time()
+
+                # Files still settling need a timed recheck even when inotify is quiet
+                timeout = self.poll_interval
+                if self._candidates or self._in_flight or self._retry:
+                    timeout = min(timeout, max(self.settle_seconds / 2, 0.05))
+                if watcher:
+                    watcher.wait(timeout)
+                else:
+                    self._stop.wait(timeout)
+
+            # _finish waits for each result and records failures
+            for future in list(self._in_flight):
+                self._finish(future)
+        finally:
+            pool.shutdown(wait=True)
+            if watcher:
+                watcher.close()
+
+        self.write_metrics()
+        return self.metrics()
+
+
+def build_stages(unlock_password: Optional[str] = None, password_csv: Optional[str] = None,
+                 stamp: Optional[str] = None, stamp_page: int = 1,
+                 stamp_position: Tuple[float, float] = (400, 40),
+                 convert: bool = False) -> List[dict]:
+    """Translate watch-folder options into pipeline stages (unlock, stamp, convert)"""
+    stages = []
+    if unlock_password or password_csv:
+        stages.append({'op': 'unlock', 'password': unlock_password, 'password_csv': password_csv})
+    if stamp:
+        x, y = stamp_position
+        stages.append({'op': 'annotate', 'annotations': [
+            {'type': 'stamp', 'page': stamp_page, 'x': x, 'y': y, 'stamp_type': stamp}]})
+    if convert:
+        stages.append({'op': 'convert'})
+    return stages
+
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Watch an inbox folder and unlock, stamp or convert incoming PDFs")
+    parser.add_argument("inbox", help="Folder to watch for new PDFs")
+    parser.add_argument("outbox", help="Folder for processed results")
+    parser.add_argument("error_dir", help="Folder for PDFs that failed processing")
+    parser.add_argument("--unlock", metavar="TEMPLATE",
+                        help="Remove passwords, e.g. '{stem}-2024' ({name}, {stem} available)")
+    parser.add_argument("--password-csv", help="CSV of filename,password rows for --unlock")
+    parser.add_argument("--stamp", choices=["approved", "rejected", "confidential",
+                                            "draft", "final", "reviewed"],
+                        help="Stamp the first page")
+    parser.add_argument("--convert", action="store_true", help="Also write a Word document")
+    parser.add_argument("--archive", help="Where to move originals after success "
+                                          "(default: OUTBOX/originals)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before processing")
+    parser.add_argument("--poll", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--no-inotify", action="store_true", help="Always use polling")
+    parser.add_argument("--metrics-interval", type=float, default=60.0,
+                        help="Seconds between metrics reports")
+    args = parser.parse_args(argv)
+
+    stages = build_stages(args.unlock, args.password_csv, args.stamp, convert=args.convert)
+    if not stages:
+        parser.error("Choose at least one of --unlock, --stamp or --convert")
+
+    try:
+        service = WatchFolder(args.inbox, args.outbox, args.error_dir, stages,
+                              workers=args.workers, settle_seconds=args.settle,
+                              poll_interval=args.poll, archive_dir=args.archive,
+                              use_inotify=not args.no_inotify)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: service.stop())
+
+    print(f"Watching {service.inbox} ({', '.join(s['op'] for s in stages)}); Ctrl+C to stop")
+    metrics = service.run(metrics_interval=args.metrics_interval)
+    print(f"Stopped: {metrics['processed']} processed, {metrics['failed']} failed, "
+          f"{metrics['files_per_minute']} files/min")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Signature Container
+Binary file format for the plaintext signature library of the full editor.
+Replaces signatures.json, where every PNG was a base64 string inside indented
+JSON and reading one signature meant parsing them all:
+
+    container = SignatureContainer("signatures.sigs")
+    container.add("Jane Doe", png_bytes, "signature", 150, 50)
+    png_bytes = container.get_data("Jane Doe")
+
+Layout: a fixed header (magic, index offset, index length), the raw PNG
+blobs, and a small JSON index of name -> offset, length and metadata. Opening
+a library reads the header and the index only; get_data() reads one blob.
+Writes append the new blobs and a new index, then rewrite the header, so the
+header update is the only in-place write. Space left by replaced or deleted
+signatures is reclaimed by compact(), which runs on its own once more than
+half of the file is unused.
+"""
+
+import base64
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+MAGIC = b"PDFSIGS\x01"
+FORMAT_VERSION = 1
+
+# magic, index offset, index length
+HEADER = struct.Struct("<8sQQ")
+
+# Compact once unused space is more than this share of a file of at least COMPACT_MIN_BYTES
+COMPACT_RATIO = 0.5
+COMPACT_MIN_BYTES = 64 * 1024
+
+
+class SignatureContainer:
+    """Signature library in a single binary file with an index of raw PNG blobs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[Dict[str, dict]] = None
+        self._index_offset = HEADER.size
+        self._index_length = 0
+
+    def exists(self) -> bool:
+        """Whether a container has been written at path"""
+        return os.path.exists(self.path)
+
+    def _load_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            if not self.exists():
+                self._index = {}
+                return self._index
+            with open(self.path, 'rb') as f:
+                magic, offset, length = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError(f"Not a signature container: {self.path}")
+                f.seek(offset)
+                index = json.loads(f.read(length).decode('utf-8'))
+            self._index = index['signatures']
+            self._index_offset, self._index_length = offset, length
+        return self._index
+
+    def names(self) -> List[str]:
+        """All signature names, oldest first"""
+        return list(self._load_index())
+
+    def entries(self) -> List[Tuple[str, dict]]:
+        """(name, info) for every signature, without reading any images"""
+        return [(name, self.get_info(name)) for name in self._load_index()]
+
+    def __len__(self) -> int:
+        return len(self._load_index())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._load_index()
+
+    def get_info(self, name: str) -> Optional[dict]:
+        """Type, width, height and created date of a signature"""
+        entry = self._load_index().get(name)
+        if entry is None:
+            return None
+        return {key: value for key, value in entry.items() if key not in ('offset', 'length')}
+
+    def get_data(self, name: str) -> Optional[bytes]:
+        """Read one signature's PNG bytes"""
+        entry = self._load_index().get(name)
+        if entry is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(entry['offset'])
+            return f.read(entry['length'])
+
+    def add(self, name: str, data: bytes, sig_type: str = "signature",
+            width: int = 150, height: int = 50, created: Optional[str] = None):
+        """Add or replace one signature"""
+        self.add_many([{'name': name, 'data': data, 'type': sig_type,
+                        'width': width, 'height': height, 'created': created}])
+
+    def add_many(self, entries: List[dict]) -> int:
+        """Add or replace signatures ('name', 'data', 'type', 'width', 'height',
+        optional 'created') with a single header update"""
+        index = dict(self._load_index())
+        now = datetime.now().isoformat()
+        self._write(index, entries, now)
+        return len(entries)
+
+    def delete(self, name: str) -> bool:
+        """Delete one signature; False if there was none by that name"""
+        index = dict(self._load_index())
+        if index.pop(name, None) is None:
+            return False
+        self._write(index, [], None)
+        return True
+
+    def _write(self, index: Dict[str, dict], entries: List[dict], now: Optional[str]):
+        if not self.exists():
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, HEADER.size, 0))
+
+        with open(self.path, 'r+b') as f:
+            # New blobs go after everything already in the file, so the old
+            # header, index and blobs stay valid until the header is rewritten
+            f.seek(0, os.SEEK_END)
+            for entry in entries:
+                index[entry['name']] = {
+                    'offset': f.tell(),
+                    'length': len(entry['data']),
+                    'type': entry.get('type', 'signature'),
+                    'width': entry.get('width', 150),
+                    'height': entry.get('height', 50),
+                    'created': entry.get('created') or now,
+                }
+                f.write(entry['data'])
+
+            offset = f.tell()
+            encoded = json.dumps({'version': FORMAT_VERSION, 'signatures': index},
+                                 separators=(',', ':')).encode('utf-8')
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, offset, len(encoded)))
+
+        self._index, self._index_offset, self._index_length = index, offset, len(encoded)
+        if self.unused_bytes() > max(COMPACT_MIN_BYTES * COMPACT_RATIO,
+                                     COMPACT_RATIO * os.path.getsize(self.path)):
+            self.compact()
+
+    def unused_bytes(self) -> int:
+        """Bytes taken by replaced or deleted signatures and old indexes"""
+        if not self.exists():
+            return 0
+        live = sum(entry['length'] for entry in self._load_index().values())
+        return os.path.getsize(self.path) - HEADER.size - live - self._index_length
+
+    def compact(self):
+        """Rewrite the file with only the live signatures"""
+        index = self._load_index()
+        temp_path = self.path + ".tmp"
+        with open(self.path, 'rb') as source, open(temp_path, 'wb') as target:
+            target.write(HEADER.pack(MAGIC, 0, 0))
+            compacted = {}
+            for name, entry in index.items():
+                source.seek(entry['offset'])
+                compacted[name] = dict(entry, offset=target.tell())
+                target.write(source.read(entry['length']))
+            offset = target.tell()
+            encoded = json.dumps({'version': FORMAT_VERSION, 'signatures': compacted},
+                                 separators=(',', ':')).encode('utf-8')
+            target.write(encoded)
+            target.seek(0)
+            target.write(HEADER.pack(MAGIC, offset, len(encoded)))
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp_path, self.path)
+        self._index, self._index_offset, self._index_length = compacted, offset, len(encoded)
+
+
+def load_json_file(path: str) -> Dict[str, dict]:
+    """Read an old plaintext signatures.json library
+
+    Returns name -> {'data' (PNG bytes), 'type', 'width', 'height', 'created'}.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        signatures = json.load(f)
+    for info in signatures.values():
+        info['data'] = base64.b64decode(info['data'])
+    return signatures
+
+
+def migrate_json_file(json_path: str, container: SignatureContainer) -> int:
+    """Move an old signatures.json library into container
+
+    The old file is kept beside it with a .bak suffix. Returns the number of
+    signatures moved. The container is written to a temporary file and only
+    put in place once it is complete, so a failed migration leaves nothing
+    behind and is retried on the next start.
+    """
+    if container.exists():
+        raise FileExistsError(f"Signature container already exists: {container.path}")
+    signatures = load_json_file(json_path)
+    temp = SignatureContainer(container.path + ".tmp")
+    try:
+        moved = temp.add_many([dict(info, name=name) for name, info in signatures.items()])
+        os.replace(temp.path, container.path)
+    except Exception:
+        if temp.exists():
+            os.remove(temp.path)
+        raise
+    container._index = None
+    os.replace(json_path, json_path + ".bak")
+    return moved
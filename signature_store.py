@@ -0,0 +1,444 @@
+"""
+Encrypted Signature Store
+Record-level storage for the signature library behind SignatureStorage. Every
+signature is its own encrypted row in a SQLite file, so adding or deleting one
+writes only that record, and image data is decrypted only when it is used:
+
+    store = SignatureStore("signatures.db")
+    if store.exists():
+        store.unlock(password)
+    else:
+        store.create(password)
+    store.add("Jane Doe", png_bytes, "signature", 150, 50)
+    png_bytes = store.get_data("Jane Doe")
+    preview = store.get_thumbnail("Jane Doe", (270, 170))
+
+Thumbnails are made once per signature and size, then kept encrypted in the
+same file and in a small in-memory cache. Names, types and sizes are encrypted
+as well. Rows are looked up by a keyed hash of the name, so the file does not
+reveal which signatures it holds. Libraries kept in the old single-blob
+signatures.encrypted file are moved over with migrate_legacy_file().
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+FORMAT_VERSION = 1
+KDF_ITERATIONS = 100000
+
+# Seconds without use after which an unlocked store forgets its key
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+# Decrypted thumbnails kept in memory, most recently used last
+THUMBNAIL_MEMORY_ITEMS = 512
+
+# cryptography is imported on first unlock so the editors start without it; see preload
+LAZY_IMPORTS = ("cryptography.fernet", "cryptography.hazmat.primitives.kdf.pbkdf2")
+
+# Encrypted into the meta table; decrypting it proves the password is right
+CHECK_TEXT = b"pdf-editor signature store"
+
+# Layout of the old signatures.encrypted file: salt, SHA-256 hex of the password, Fernet token
+LEGACY_SALT_SIZE = 16
+LEGACY_HASH_SIZE = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL UNIQUE,
+    info BLOB NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS thumbnails (
+    name_key TEXT NOT NULL,
+    size TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (name_key, size)
+);
+"""
+
+
+class StoreLockedError(Exception):
+    """Raised when the store is used before it has been unlocked"""
+    pass
+
+
+def derive_key(password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
+    """Derive a Fernet key from password using PBKDF2"""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+
+class SignatureStore:
+    """SQLite signature library with every record encrypted on its own
+
+    The small encrypted info records (name, type, size, created) are
+    decrypted into an in-memory index the first time the library is listed;
+    image data stays on disk until get_data() asks for it.
+
+    The derived key is the session: it is kept in memory, guarded by the
+    store's lock, so later reads and writes never repeat the key derivation.
+    With an idle_timeout (seconds) the store locks itself once it has not
+    been used for that long.
+    """
+
+    def __init__(self, path: str, idle_timeout: Optional[float] = None):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self._last_used = 0.0
+        self.cipher = None  # Fernet, while unlocked
+        self._name_key: Optional[bytes] = None
+        self._index: Optional[Dict[str, dict]] = None
+        self._thumbnails: "OrderedDict[Tuple[str, Tuple[int, int]], bytes]" = OrderedDict()
+        # Bumped whenever signatures change or the key is dropped
+        self._generation = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_unlocked(self) -> bool:
+        self.expire_if_idle()
+        return self.cipher is not None
+
+    def expire_if_idle(self) -> bool:
+        """Lock the store if it has been idle past idle_timeout; True if it locked now"""
+        with self._lock:
+            if (self.cipher is not None and self.idle_timeout is not None
+                    and time.monotonic() - self._last_used > self.idle_timeout):
+                self.lock()
+                return True
+        return False
+
+    def exists(self) -> bool:
+        """Whether a store has been created at path"""
+        return os.path.exists(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _meta(self, key: str) -> Optional[bytes]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _use_key(self, key: bytes):
+        from cryptography.fernet import Fernet
+
+        with self._lock:
+            self.cipher = Fernet(key)
+            self._name_key = hmac.new(base64.urlsafe_b64decode(key), b"name-index",
+                                      hashlib.sha256).digest()
+            self._index = None
+            self._last_used = time.monotonic()
+
+    def _seal(self, data: bytes, cipher=None) -> bytes:
+        # Fernet tokens are base64 text; store the raw bytes instead
+        return base64.urlsafe_b64decode((cipher or self.cipher).encrypt(data))
+
+    def _open(self, blob: bytes, cipher=None) -> bytes:
+        return (cipher or self.cipher).decrypt(base64.urlsafe_b64encode(blob))
+
+    def _key_for(self, name: str, name_key: Optional[bytes] = None) -> str:
+        return hmac.new(name_key or self._name_key, name.encode('utf-8'),
+                        hashlib.sha256).hexdigest()
+
+    def _require_unlocked(self):
+        self.expire_if_idle()
+        if self.cipher is None:
+            raise StoreLockedError("Signature store is locked")
+        self._last_used = time.monotonic()
+
+    def create(self, password: str):
+        """Create a new, empty store protected by password"""
+        if self.exists():
+            raise FileExistsError(f"Signature store already exists: {self.path}")
+        salt = os.urandom(16)
+        self._use_key(derive_key(password, salt))
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [
+                        ('version', str(FORMAT_VERSION).encode()),
+                        ('salt', salt),
+                        ('iterations', str(KDF_ITERATIONS).encode()),
+                        ('check', self._seal(CHECK_TEXT)),
+                    ])
+        except Exception:
+            self.lock()
+            raise
+        self._index = {}
+
+    def unlock(self, password: str) -> bool:
+        """Unlock with password; False if the password is wrong
+
+        This runs the slow key derivation, so GUIs call it off the UI thread.
+        The store only becomes unlocked once the key has been verified.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No signature store at {self.path}")
+        with self._lock:
+            salt = self._meta('salt')
+            iterations = int(self._meta('iterations') or KDF_ITERATIONS)
+            check = self._meta('check')
+        if salt is None or check is None:
+            raise ValueError(f"Not a signature store: {self.path}")
+
+        from cryptography.fernet import Fernet, InvalidToken
+
+        key = derive_key(password, salt, iterations)
+        try:
+            if Fernet(key).decrypt(base64.urlsafe_b64encode(check)) != CHECK_TEXT:
+                return False
+        except InvalidToken:
+            return False
+        self._use_key(key)
+        return True
+
+    def lock(self):
+        """Forget the key and the decrypted index"""
+        with self._lock:
+            self.cipher = None
+            self._name_key = None
+            self._index = None
+            self._thumbnails.clear()
+            self._generation += 1
+
+    def close(self):
+        """Lock the store and close the database"""
+        self.lock()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load_index(self) -> Dict[str, dict]:
+        self._require_unlocked()
+        if self._index is None:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT info FROM signatures ORDER BY id").fetchall()
+            index = {}
+            for (info,) in rows:
+                record = json.loads(self._open(info))
+                index[record.pop('name')] = record
+            self._index = index
+        return self._index
+
+    def names(self) -> List[str]:
+        """All signature names, oldest first"""
+        return list(self._load_index())
+
+    def entries(self) -> List[Tuple[str, dict]]:
+        """(name, info) for every signature, oldest first, without images"""
+        return [(name, dict(info)) for name, info in self._load_index().items()]
+
+    def __len__(self) -> int:
+        return len(self._load_index())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._load_index()
+
+    def get_info(self, name: str) -> Optional[dict]:
+        """Type, width, height and created date of a signature, without its image"""
+        info = self._load_index().get(name)
+        return dict(info) if info is not None else None
+
+    def get_data(self, name: str) -> Optional[bytes]:
+        """Decrypt and return one signature's PNG bytes"""
+        self._require_unlocked()
+        with self._lock:
+            row = self._connect().execute("SELECT data FROM signatures WHERE name_key = ?",
+                                          (self._key_for(name),)).fetchone()
+        return self._open(row[0]) if row else None
+
+    def get_thumbnail(self, name: str, size: Tuple[int, int]) -> Optional[bytes]:
+        """PNG thumbnail of a signature fitted within size, made on first request"""
+        return self.get_thumbnails([name], size).get(name)
+
+    def get_thumbnails(self, names: List[str], size: Tuple[int, int]) -> Dict[str, bytes]:
+        """Thumbnails of several signatures; new ones are saved in a single transaction
+
+        Names without a signature are left out of the result. Safe to call from
+        a worker thread while another thread adds, deletes or locks: thumbnails
+        made from signatures that changed in the meantime are returned but not kept.
+        """
+        self._require_unlocked()
+        size = (int(size[0]), int(size[1]))
+        size_key = f"{size[0]}x{size[1]}"
+        thumbnails = {}
+        with self._lock:
+            cipher, name_secret = self.cipher, self._name_key
+            if cipher is None:
+                raise StoreLockedError("Signature store is locked")
+            generation = self._generation
+            for name in names:
+                cached = self._thumbnails.get((name, size))
+                if cached is not None:
+                    self._thumbnails.move_to_end((name, size))
+                    thumbnails[name] = cached
+
+        made = {}
+        new_rows = []
+        for name in names:
+            if name in thumbnails or name in made:
+                continue
+            name_key = self._key_for(name, name_secret)
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT data FROM thumbnails WHERE name_key = ? AND size = ?",
+                    (name_key, size_key)).fetchone()
+                source = None if row else conn.execute(
+                    "SELECT data FROM signatures WHERE name_key = ?", (name_key,)).fetchone()
+            if row:
+                made[name] = self._open(row[0], cipher)
+            elif source:
+                from signature_processing import make_thumbnail
+                thumbnail = make_thumbnail(self._open(source[0], cipher), size)
+                new_rows.append((name_key, size_key, self._seal(thumbnail, cipher)))
+                made[name] = thumbnail
+
+        with self._lock:
+            if self._generation == generation:
+                if new_rows:
+                    conn = self._connect()
+                    with conn:
+                        conn.executemany("INSERT OR REPLACE INTO thumbnails "
+                                         "(name_key, size, data) VALUES (?, ?, ?)", new_rows)
+                for name, thumbnail in made.items():
+                    self._thumbnails[(name, size)] = thumbnail
+                    self._thumbnails.move_to_end((name, size))
+                while len(self._thumbnails) > THUMBNAIL_MEMORY_ITEMS:
+                    self._thumbnails.popitem(last=False)
+        thumbnails.update(made)
+        return thumbnails
+
+    def _forget_thumbnails(self, names):
+        # Callers hold self._lock
+        for key in [key for key in self._thumbnails if key[0] in names]:
+            del self._thumbnails[key]
+        self._generation += 1
+
+    def add(self, name: str, data: bytes, sig_type: str = "signature",
+            width: int = 150, height: int = 50, created: Optional[str] = None):
+        """Add or replace one signature"""
+        self.add_many([{'name': name, 'data': data, 'type': sig_type,
+                        'width': width, 'height': height, 'created': created}])
+
+    def add_many(self, entries: List[dict]) -> int:
+        """Add or replace signatures ('name', 'data', 'type', 'width', 'height',
+        optional 'created') in a single transaction"""
+        self._require_unlocked()
+        index = self._load_index()
+        now = datetime.now().isoformat()
+        rows = []
+        infos = {}
+        for entry in entries:
+            info = {
+                'type': entry.get('type', 'signature'),
+                'width': entry.get('width', 150),
+                'height': entry.get('height', 50),
+                'created': entry.get('created') or now,
+            }
+            sealed = self._seal(json.dumps(dict(info, name=entry['name'])).encode('utf-8'))
+            rows.append((self._key_for(entry['name']), sealed, self._seal(entry['data'])))
+            infos[entry['name']] = info
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO signatures (name_key, info, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name_key) DO UPDATE SET info = excluded.info, data = excluded.data",
+                    rows)
+                conn.executemany("DELETE FROM thumbnails WHERE name_key = ?",
+                                 [(row[0],) for row in rows])
+            self._forget_thumbnails(infos)
+        index.update(infos)
+        return len(rows)
+
+    def delete(self, name: str) -> bool:
+        """Delete one signature; False if there was none by that name"""
+        self._require_unlocked()
+        index = self._load_index()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                name_key = self._key_for(name)
+                deleted = conn.execute("DELETE FROM signatures WHERE name_key = ?",
+                                       (name_key,)).rowcount
+                conn.execute("DELETE FROM thumbnails WHERE name_key = ?", (name_key,))
+            self._forget_thumbnails({name})
+        index.pop(name, None)
+        return bool(deleted)
+
+
+def load_legacy_file(path: str, password: str) -> Optional[Dict[str, dict]]:
+    """Decrypt an old signatures.encrypted library; None if the password is wrong
+
+    Returns name -> {'data' (PNG bytes), 'type', 'width', 'height', 'created'}.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    salt = raw[:LEGACY_SALT_SIZE]
+    password_hash = raw[LEGACY_SALT_SIZE:LEGACY_SALT_SIZE + LEGACY_HASH_SIZE].decode('utf-8')
+    if hashlib.sha256(password.encode()).hexdigest() != password_hash:
+        return None
+
+    from cryptography.fernet import Fernet
+
+    cipher = Fernet(derive_key(password, salt))
+    signatures = json.loads(cipher.decrypt(raw[LEGACY_SALT_SIZE + LEGACY_HASH_SIZE:]))
+    for info in signatures.values():
+        info['data'] = base64.b64decode(info['data'])
+    return signatures
+
+
+def migrate_legacy_file(legacy_path: str, store: SignatureStore, password: str) -> Optional[int]:
+    """Create store from an old signatures.encrypted file with the same password
+
+    The old file is kept beside the new store with a .bak suffix. Returns the
+    number of signatures moved, or None if the password is wrong. If the copy
+    fails, the new store is removed and locked again, so the old file stays in
+    use and the migration is retried on the next start.
+    """
+    signatures = load_legacy_file(legacy_path, password)
+    if signatures is None:
+        return None
+
+    try:
+        store.create(password)
+        moved = store.add_many([dict(info, name=name) for name, info in signatures.items()])
+    except Exception:
+        store.close()
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(store.path + suffix):
+                os.remove(store.path + suffix)
+        raise
+    os.replace(legacy_path, legacy_path + ".bak")
+    return moved
@@ -0,0 +1,100 @@
+"""
+Test script for the startup benchmark (benchmark_startup.py)
+Checks the editor list and the comparison of two saved runs without launching editors
+"""
+
+import sys
+import os
+import contextlib
+import importlib
+import io
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("STARTUP BENCHMARK - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import benchmark
+print("\n[TEST 1] Benchmark Import")
+try:
+    from benchmark_startup import EDITORS, compare, main
+    print("✓ benchmark_startup imported")
+except Exception as e:
+    print(f"✗ Failed to import benchmark_startup: {e}")
+    sys.exit(1)
+
+
+def run(editors: dict, mode: str = "headless") -> dict:
+    """A saved benchmark run with the given per-editor metrics"""
+    return {'commit': "abc1234", 'mode': mode, 'editors': editors}
+
+
+# Test 2: Every editor is measured
+print("\n[TEST 2] Editor List")
+try:
+    assert sorted(EDITORS) == ["pdf_editor", "pdf_editor_complete", "pdf_editor_enhanced",
+                               "pdf_editor_full", "pdf_editor_interactive"], sorted(EDITORS)
+    for module, class_name in EDITORS.items():
+        assert hasattr(importlib.import_module(module), class_name), (module, class_name)
+    print(f"✓ {len(EDITORS)} editors listed, each with its main window class")
+except Exception as e:
+    print(f"✗ Editor list test failed: {e}")
+    sys.exit(1)
+
+# Test 3: Regressions past the threshold are reported
+print("\n[TEST 3] Compare Runs")
+try:
+    baseline = run({
+        'pdf_editor_full': {'import_ms': 100.0, 'window_ms': None, 'first_page_ms': 400.0,
+                            'idle_rss_mb': 80.0},
+        'pdf_editor': {'import_ms': 50.0, 'first_page_ms': 200.0, 'idle_rss_mb': 60.0},
+    })
+    current = run({
+        'pdf_editor_full': {'import_ms': 130.0, 'window_ms': None, 'first_page_ms': 410.0,
+                            'idle_rss_mb': 70.0},
+        'pdf_editor': {'import_ms': 40.0, 'first_page_ms': 200.0, 'idle_rss_mb': 60.0},
+        'pdf_editor_enhanced': {'import_ms': 90.0, 'first_page_ms': 300.0, 'idle_rss_mb': 70.0},
+    })
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        regressions = compare(current, baseline, threshold=0.25)
+    assert regressions == ["pdf_editor_full Import"], regressions
+    assert "REGRESSION" in out.getvalue() and "pdf_editor_enhanced" not in out.getvalue()
+
+    # Editors missing from the baseline and metrics without a value are skipped
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert compare(current, baseline, threshold=0.5) == []
+
+    # Runs from different modes only compare import time
+    windowed = run({'pdf_editor_full': dict(baseline['editors']['pdf_editor_full'],
+                                            first_page_ms=100.0)}, mode="window")
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        assert compare(current, windowed, threshold=0.5) == []
+    assert "comparing import time only" in out.getvalue()
+    print("✓ 30% import slowdown flagged at 25%; new editors and other modes handled")
+except Exception as e:
+    print(f"✗ Compare test failed: {e}")
+    sys.exit(1)
+
+# Test 4: An unreadable baseline stops the run before anything is measured
+print("\n[TEST 4] Command Line Baseline")
+try:
+    with tempfile.TemporaryDirectory(prefix="bench_startup_test_") as work_dir:
+        broken = os.path.join(work_dir, "broken.json")
+        with open(broken, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            assert main(["--compare", broken]) == 1
+        assert "cannot read" in err.getvalue()
+    print("✓ Unreadable --compare file exits 1")
+except Exception as e:
+    print(f"✗ Command line test failed: {e}")
+    sys.exit(1)
+
+print("\n" + "=" * 60)
+print("ALL STARTUP BENCHMARK TESTS PASSED")
+print("=" * 60)
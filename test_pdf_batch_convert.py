@@ -0,0 +1,176 @@
+"""
+Test script for the batch PDF-to-Word converter (pdf_batch_convert.py)
+Converts a temporary folder of PDFs and checks the .docx files and the JSON report
+"""
+
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF BATCH CONVERT - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import converter
+print("\n[TEST 1] Converter Import")
+try:
+    import fitz
+    from PIL import Image
+    from docx import Document
+    import pdf_batch_convert
+    from pdf_batch_convert import REPORT_NAME, convert_batch, main, output_paths
+    print("✓ pdf_batch_convert imported")
+except Exception as e:
+    print(f"✗ Failed to import pdf_batch_convert: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="pdf_batch_convert_test_")
+
+
+def make_report_pdf(path, password=None):
+    """One page with a ruled table and a chart image, one page of text"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 60), "Quarterly figures")
+    cols, rows = [72, 200, 330, 460], [80, 100, 120, 140]
+    for y in rows:
+        page.draw_line((cols[0], y), (cols[-1], y))
+    for x in cols:
+        page.draw_line((x, rows[0]), (x, rows[-1]))
+    for r, row in enumerate([["Item", "Q1", "Q2"], ["Rent", "100", "200"], ["Fees", "5", "6"]]):
+        for c, text in enumerate(row):
+            page.insert_text((cols[c] + 5, rows[r] + 15), text)
+    chart = io.BytesIO()
+    Image.new("RGB", (160, 90), (20, 120, 60)).save(chart, format="PNG")
+    page.insert_image(fitz.Rect(72, 200, 232, 290), stream=chart.getvalue())
+    doc.new_page().insert_text((72, 72), f"Notes for {os.path.basename(path)}")
+    if password:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw=password)
+    else:
+        doc.save(path)
+    doc.close()
+
+
+try:
+    inbox = os.path.join(work_dir, "inbox")
+    archive = os.path.join(work_dir, "archive")
+    outbox = os.path.join(work_dir, "word")
+    cache_dir = os.path.join(work_dir, "cache")
+    os.makedirs(inbox)
+    os.makedirs(archive)
+
+    make_report_pdf(os.path.join(inbox, "q1.pdf"))
+    make_report_pdf(os.path.join(inbox, "q2.pdf"), password="q2-pw")
+    make_report_pdf(os.path.join(archive, "q1.pdf"))
+    with open(os.path.join(archive, "broken.pdf"), "wb") as f:
+        f.write(b"not really a pdf")
+
+    # Test 2: Output naming
+    print("\n[TEST 2] Output Paths")
+    try:
+        paths = output_paths(["/a/q1.pdf", "/b/q1.pdf", "/b/q2.pdf"], "/out")
+        assert list(paths.values()) == ["/out/q1.docx", "/out/q1_2.docx", "/out/q2.docx"], paths
+        assert output_paths(["/a/q1.pdf"], None) == {"/a/q1.pdf": "/a/q1.docx"}
+        print("✓ Same-named inputs from different folders do not collide")
+    except Exception as e:
+        print(f"✗ Output path test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Folder plus glob, in parallel, with a report
+    print("\n[TEST 3] Batch Conversion Report")
+    try:
+        report = convert_batch([inbox, os.path.join(archive, "*.pdf")], output_dir=outbox,
+                               password_template="{stem}-pw", cache_dir=cache_dir, workers=2)
+        assert report['total'] == 4 and report['succeeded'] == 3 and report['failed'] == 1, report
+        with open(os.path.join(outbox, REPORT_NAME), encoding="utf-8") as f:
+            assert json.load(f)['pages'] == report['pages'] == 6
+
+        files = {os.path.relpath(r['input'], work_dir): r for r in report['files']}
+        q2 = files[os.path.join("inbox", "q2.pdf")]
+        assert q2['status'] == 'ok' and q2['output'].endswith("q2.docx")
+        assert (q2['pages'], q2['tables'], q2['images']) == (2, 1, 1), q2
+        assert set(q2['timings']) == {'open', 'layout', 'docx'}
+        assert files[os.path.join("archive", "broken.pdf")]['status'] == 'error'
+        assert "q2-pw" not in json.dumps(report)
+
+        text = "\n".join(p.text for p in Document(q2['output']).paragraphs)
+        assert "Notes for q2.pdf" in text
+        assert len(Document(q2['output']).tables) == 1
+        print(f"✓ 3 converted, 1 failed; q2: {q2['tables']} table, {q2['images']} image, "
+              f"layout {q2['timings']['layout']}s")
+    except Exception as e:
+        print(f"✗ Batch conversion test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Command line, served from the layout cache
+    print("\n[TEST 4] Command Line and Cache")
+    try:
+        report_path = os.path.join(work_dir, "rerun.json")
+        status = main([os.path.join(inbox, "q1.pdf"), "-o", outbox, "--cache-dir", cache_dir,
+                       "--report", report_path])
+        assert status == 0
+        with open(report_path, encoding="utf-8") as f:
+            rerun = json.load(f)
+        assert rerun['files'][0]['cached_pages'] == 2, rerun['files'][0]
+        assert main([os.path.join(work_dir, "missing", "*.pdf"), "-o", outbox]) == 2
+
+        # An unknown template field is rejected before anything is converted
+        try:
+            convert_batch([inbox], output_dir=outbox, password_template="{stem}-{year}")
+            raise AssertionError("ValueError not raised")
+        except ValueError as e:
+            assert "year" in str(e), str(e)
+        try:
+            main([inbox, "-o", outbox, "--password-template", "{stem}-{year}"])
+            raise AssertionError("SystemExit not raised")
+        except SystemExit as e:
+            assert e.code == 2
+        print("✓ Re-run of q1.pdf took both pages from the cache; empty match exits 2; "
+              "bad password template rejected")
+    except Exception as e:
+        print(f"✗ Command line test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: A worker that dies fails its own files, not the batch
+    print("\n[TEST 5] Worker Crash")
+    try:
+        original_convert_file = pdf_batch_convert.convert_file
+
+        def crashing_convert_file(input_path, *args, **kwargs):
+            if os.path.basename(input_path) == "broken.pdf":
+                os._exit(1)
+            return original_convert_file(input_path, *args, **kwargs)
+
+        pdf_batch_convert.convert_file = crashing_convert_file
+        progress = []
+        try:
+            report = convert_batch([archive, os.path.join(inbox, "q1.pdf")],
+                                   output_dir=os.path.join(work_dir, "crash"), workers=2,
+                                   progress_callback=lambda done, total, r: progress.append(done))
+        finally:
+            pdf_batch_convert.convert_file = original_convert_file
+
+        assert report['total'] == 3 and report['failed'] >= 1, report
+        assert progress == [1, 2, 3], progress
+        files = {os.path.basename(r['input']): r for r in report['files']}
+        assert files["broken.pdf"]['status'] == 'error' and files["broken.pdf"]['error'], files
+        assert all(r['error'] for r in report['files'] if r['status'] == 'error')
+        print(f"✓ Crashed worker reported per file ({report['failed']} of 3 failed)")
+    except Exception as e:
+        print(f"✗ Worker crash test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL BATCH CONVERT TESTS PASSED")
+print("=" * 60)
@@ -0,0 +1,115 @@
+"""
+Test script for the synthetic corpus generator (pdf_corpus.py)
+Generates a small corpus twice and checks its contents, passwords and reproducibility
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF CORPUS - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import generator
+print("\n[TEST 1] Generator Import")
+try:
+    import fitz
+    from pdf_batch_encrypt import load_password_map
+    from pdf_corpus import PASSWORDS_NAME, SCALES, generate_corpus, load_manifest, main
+    from pdf_engine import PasswordRequiredError, open_document
+    print("✓ pdf_corpus imported")
+except Exception as e:
+    print(f"✗ Failed to import pdf_corpus: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="pdf_corpus_test_")
+
+try:
+    # Test 2: Every kind of document is written and listed in the manifest
+    print("\n[TEST 2] Corpus Contents")
+    try:
+        corpus = os.path.join(work_dir, "first")
+        manifest = generate_corpus(corpus, "small", seed=3, pages=4)
+        assert load_manifest(corpus) == manifest
+        kinds = {entry['kind'] for entry in manifest['files']}
+        assert kinds == {'text', 'images', 'tables', 'scanned', 'annotated', 'part', 'encrypted'}, kinds
+
+        counts = SCALES['small']
+        with fitz.open(os.path.join(corpus, "annotated.pdf")) as doc:
+            assert len(doc) == 4
+            assert all(len(list(page.annots())) == counts['annotations_per_page'] for page in doc)
+        with fitz.open(os.path.join(corpus, "scanned.pdf")) as doc:
+            assert doc[0].get_text().strip() == "" and len(doc[0].get_images()) == 1
+        with fitz.open(os.path.join(corpus, "images.pdf")) as doc:
+            assert len(doc[0].get_images()) == 3
+        parts = [entry for entry in manifest['files'] if entry['kind'] == 'part']
+        assert len(parts) == counts['parts'] and parts[0]['pages'] == counts['part_pages']
+        print(f"✓ {len(manifest['files'])} files, {manifest['total_pages']} pages")
+    except Exception as e:
+        print(f"✗ Corpus contents test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Encrypted copies open with the passwords in the manifest and the CSV
+    print("\n[TEST 3] Encrypted Variants")
+    try:
+        passwords = load_password_map(os.path.join(corpus, "encrypted", PASSWORDS_NAME))
+        encrypted = [entry for entry in manifest['files'] if entry['kind'] == 'encrypted']
+        assert len(encrypted) == counts['parts'] + 1 and len(passwords) == len(encrypted)
+        for entry in encrypted:
+            name = os.path.basename(entry['path'])
+            assert passwords[name] == entry['password']
+            doc = open_document(os.path.join(corpus, entry['path']), entry['password'])
+            assert len(doc) == entry['pages']
+            doc.close()
+        try:
+            open_document(os.path.join(corpus, encrypted[0]['path']), "wrong")
+            raise AssertionError("opened with a wrong password")
+        except PasswordRequiredError:
+            pass
+        print(f"✓ {len(encrypted)} AES-256 files open with their listed passwords")
+    except Exception as e:
+        print(f"✗ Encrypted variants test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Same seed gives the same files; another seed does not
+    print("\n[TEST 4] Reproducibility")
+    try:
+        again = generate_corpus(os.path.join(work_dir, "second"), "small", seed=3, pages=4)
+        other = generate_corpus(os.path.join(work_dir, "third"), "small", seed=4, pages=4,
+                                kinds=['text'])
+        digests = {entry['path']: entry['sha256'] for entry in manifest['files']
+                   if entry['kind'] != 'encrypted'}
+        assert digests == {entry['path']: entry['sha256'] for entry in again['files']
+                           if entry['kind'] != 'encrypted'}
+        assert [entry['password'] for entry in again['files'] if entry['kind'] == 'encrypted'] == \
+            [entry['password'] for entry in encrypted]
+        assert other['files'][0]['sha256'] != digests['text.pdf'] and len(other['files']) == 1
+        print(f"✓ {len(digests)} unencrypted files byte-identical for the same seed")
+    except Exception as e:
+        print(f"✗ Reproducibility test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: Command line
+    print("\n[TEST 5] Command Line")
+    try:
+        target = os.path.join(work_dir, "cli")
+        assert main([target, "--scale", "small", "--only", "tables", "--pages", "2"]) == 0
+        assert [entry['path'] for entry in load_manifest(target)['files']] == ["tables.pdf"]
+        print("✓ --only and --pages limit the corpus")
+    except Exception as e:
+        print(f"✗ Command line test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL CORPUS TESTS PASSED")
+print("=" * 60)
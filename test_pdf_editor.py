@@ -5,6 +5,7 @@ Tests imports, class instantiation, and basic functionality without GUI interact
 
 import sys
 import os
+import io
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
@@ -84,17 +85,21 @@ except Exception as e:
 print("\n[TEST 7] Application Classes Check")
 try:
     assert hasattr(pdf_editor, 'PDFEditorApp'), "PDFEditorApp class not found"
+    assert hasattr(pdf_editor, 'PageRangeSet'), "PageRangeSet class not found"
     assert hasattr(pdf_editor, 'SplitDialog'), "SplitDialog class not found"
     assert hasattr(pdf_editor, 'RotateDialog'), "RotateDialog class not found"
     assert hasattr(pdf_editor, 'CropDialog'), "CropDialog class not found"
     assert hasattr(pdf_editor, 'EncryptDialog'), "EncryptDialog class not found"
+    assert hasattr(pdf_editor, 'BatchEncryptDialog'), "BatchEncryptDialog class not found"
     assert hasattr(pdf_editor, 'TextOverlayDialog'), "TextOverlayDialog class not found"
     print("✓ All application classes found:")
     print("  - PDFEditorApp")
+    print("  - PageRangeSet")
     print("  - SplitDialog")
     print("  - RotateDialog")
     print("  - CropDialog")
     print("  - EncryptDialog")
+    print("  - BatchEncryptDialog")
     print("  - TextOverlayDialog")
 except AssertionError as e:
     print(f"✗ {e}")
@@ -106,30 +111,51 @@ try:
     parse_func = pdf_editor.PDFEditorApp.parse_page_range
 
     # Test case 1: Single page
-    result = parse_func("1", 10)
+    result = list(parse_func("1", 10))
     assert result == [0], f"Expected [0], got {result}"
     print("✓ Single page: '1' → [0]")
 
     # Test case 2: Range
-    result = parse_func("1-5", 10)
+    result = list(parse_func("1-5", 10))
     assert result == [0, 1, 2, 3, 4], f"Expected [0,1,2,3,4], got {result}"
     print("✓ Range: '1-5' → [0, 1, 2, 3, 4]")
 
     # Test case 3: Multiple pages
-    result = parse_func("1,3,5", 10)
+    result = list(parse_func("1,3,5", 10))
     assert result == [0, 2, 4], f"Expected [0,2,4], got {result}"
     print("✓ Multiple: '1,3,5' → [0, 2, 4]")
 
     # Test case 4: Mixed
-    result = parse_func("1-3,5,7-9", 10)
+    result = list(parse_func("1-3,5,7-9", 10))
     assert result == [0, 1, 2, 4, 6, 7, 8], f"Expected [0,1,2,4,6,7,8], got {result}"
     print("✓ Mixed: '1-3,5,7-9' → [0, 1, 2, 4, 6, 7, 8]")
 
     # Test case 5: Out of bounds
-    result = parse_func("1-100", 10)
+    result = list(parse_func("1-100", 10))
     assert result == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], f"Out of bounds handling failed"
     print("✓ Out of bounds: '1-100' with 10 pages → [0-9] (clamped)")
 
+    # Test case 6: 'all' keyword
+    result = list(parse_func("all", 4))
+    assert result == [0, 1, 2, 3], f"Expected [0,1,2,3], got {result}"
+    print("✓ All: 'all' with 4 pages → [0, 1, 2, 3]")
+
+    # Test case 7: Huge range stays compact (no per-page list)
+    result = parse_func("1-1000000", 2000000)
+    assert len(result) == 1000000, f"Expected 1000000 pages, got {len(result)}"
+    assert result.intervals() == [(0, 1000000)], f"Expected one interval, got {result.intervals()}"
+    assert 999999 in result and 1000000 not in result, "Membership check failed"
+    print("✓ Huge range: '1-1000000' → single interval, O(log n) membership")
+
+    # Test case 8: Invalid input names the offending part
+    for bad in ("1-x", "1-2-3", "abc"):
+        try:
+            parse_func(f"1,{bad}", 10)
+            raise AssertionError(f"'{bad}' was accepted")
+        except ValueError as e:
+            assert f"'{bad}'" in str(e), str(e)
+    print("✓ Invalid: '1-x', '1-2-3', 'abc' → ValueError naming the part")
+
 except Exception as e:
     print(f"✗ Page range parser test failed: {e}")
     sys.exit(1)
@@ -139,7 +165,8 @@ print("\n[TEST 9] PDFEditorApp Methods Check")
 try:
     methods = [
         'load_pdf', 'save_pdf', 'merge_pdfs', 'split_pdf',
-        'rotate_pages', 'crop_pages', 'encrypt_pdf',
+        'rotate_pages', 'crop_pages', 'encrypt_pdf', 'save_in_place',
+        'batch_encrypt_pdfs',
         'extract_text', 'add_text_overlay', 'get_pdf_info',
         'update_status', 'update_info_display'
     ]
@@ -195,6 +222,103 @@ except Exception as e:
     print(f"⚠ Could not create test PDF: {e}")
     print("  This is optional - manual testing will be required")
 
+# Test 11: In-place incremental update for rotate/crop
+print("\n[TEST 11] In-Place Incremental Update")
+try:
+    import shutil
+
+    inplace_path = "test_inplace.pdf"
+    shutil.copy(test_pdf_path, inplace_path)
+    size_before = os.path.getsize(inplace_path)
+
+    reader = PdfReader(inplace_path)
+    pages = pdf_editor.PDFEditorApp.parse_page_range("2", len(reader.pages))
+    for i in pages:
+        reader.pages[i].rotate(90)
+
+    appended = pdf_editor.PDFEditorApp.append_incremental_update(inplace_path, reader, pages)
+    assert os.path.getsize(inplace_path) == size_before + appended, "File was rewritten, not appended"
+
+    updated = PdfReader(inplace_path)
+    rotations = [page.rotation for page in updated.pages]
+    assert rotations == [0, 90, 0], f"Expected [0, 90, 0], got {rotations}"
+
+    print(f"✓ Rotated page 2 in place ({appended} bytes appended to {size_before} byte file)")
+    print(f"  Rotations after reload: {rotations}")
+
+    # startxref is found behind trailing comments longer than the old 1 KB window
+    with open(inplace_path, "ab") as f:
+        f.write(b"% trailing padding\n" * 300)
+    reader = PdfReader(inplace_path)
+    reader.pages[2].rotate(180)
+    pdf_editor.PDFEditorApp.append_incremental_update(inplace_path, reader, [2])
+    rotations = [page.rotation for page in PdfReader(inplace_path).pages]
+    assert rotations == [0, 90, 180], f"Expected [0, 90, 180], got {rotations}"
+    print("✓ In-place update after 5 KB of trailing comments")
+
+    # Encrypted files are refused before any page is changed
+    from pypdf import PdfWriter
+    writer = PdfWriter(clone_from=test_pdf_path)
+    writer.encrypt("secret")
+    locked = io.BytesIO()
+    writer.write(locked)
+    locked_path = "test_inplace_locked.pdf"
+    with open(locked_path, "wb") as f:
+        f.write(locked.getvalue())
+    try:
+        pdf_editor.PDFEditorApp.previous_xref(locked_path, PdfReader(locked_path))
+        raise AssertionError("Encrypted PDF was accepted for an in-place update")
+    except ValueError as e:
+        assert "encrypted" in str(e), str(e)
+    finally:
+        os.remove(locked_path)
+    print("✓ Encrypted PDF refused for in-place update")
+
+except Exception as e:
+    print(f"✗ In-place update test failed: {e}")
+    sys.exit(1)
+
+# Test 12: Batch encryption with a process pool
+print("\n[TEST 12] Batch Encryption")
+try:
+    import tempfile
+    import pdf_batch_encrypt
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_dir = os.path.join(tmp_dir, "in")
+        output_dir = os.path.join(tmp_dir, "out")
+        os.makedirs(input_dir)
+        for name in ("statement_a.pdf", "statement_b.pdf"):
+            shutil.copy(test_pdf_path, os.path.join(input_dir, name))
+
+        manifest = pdf_batch_encrypt.encrypt_folder(input_dir, output_dir,
+                                                    password_template="{stem}-pw",
+                                                    workers=2)
+        assert manifest['succeeded'] == 2, f"Expected 2 encrypted files, got {manifest}"
+        assert os.path.exists(os.path.join(output_dir, pdf_batch_encrypt.MANIFEST_NAME))
+
+        encrypted = PdfReader(os.path.join(output_dir, "statement_a.pdf"))
+        assert encrypted.is_encrypted, "Output is not encrypted"
+        assert encrypted.decrypt("statement_a-pw"), "Templated password did not unlock file"
+        assert len(encrypted.pages) == 3
+
+        # A bad template is rejected before any file is written
+        rejected_dir = os.path.join(tmp_dir, "rejected")
+        try:
+            pdf_batch_encrypt.encrypt_folder(input_dir, rejected_dir,
+                                             password_template="{stem}-{year}")
+            raise AssertionError("Template with an unknown field was accepted")
+        except ValueError as e:
+            assert "{name} and {stem}" in str(e), str(e)
+        assert not os.path.exists(rejected_dir)
+
+    print(f"✓ Encrypted {manifest['succeeded']} files with AES-256 in {manifest['seconds']:.2f}s")
+    print("  Templated password '{stem}-pw' unlocks output; bad templates rejected up front")
+
+except Exception as e:
+    print(f"✗ Batch encryption test failed: {e}")
+    sys.exit(1)
+
 # Final Summary
 print("\n" + "=" * 60)
 print("TEST SUMMARY")
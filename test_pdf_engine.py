@@ -0,0 +1,442 @@
+"""
+Test script for the headless PDF engine (pdf_engine.py)
+Exercises open/render/annotate/save, password handling and Word conversion without Tk
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF ENGINE - HEADLESS TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import engine
+print("\n[TEST 1] Engine Import")
+try:
+    import fitz
+    import pdf_engine
+    from pdf_engine import (TextAnnotation, ShapeAnnotation, StampAnnotation,
+                            PasswordRequiredError, WordConverter, open_document,
+                            is_password_protected, render_page, apply_annotations,
+                            save_document, unlock_file, write_pages)
+    assert 'tkinter' not in sys.modules, "pdf_engine must not import tkinter"
+    print("✓ pdf_engine imported without tkinter")
+except Exception as e:
+    print(f"✗ Failed to import pdf_engine: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="pdf_engine_test_")
+
+
+def make_pdf(path, pages=2, password=None):
+    """Create a small text PDF, optionally AES-256 encrypted"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Engine test page {i + 1}", fontsize=14)
+    if password:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256,
+                 user_pw=password, owner_pw=password)
+    else:
+        doc.save(path)
+    doc.close()
+
+
+try:
+    # Test 2: Open and render
+    print("\n[TEST 2] Open and Render")
+    try:
+        plain_path = os.path.join(work_dir, "plain.pdf")
+        make_pdf(plain_path)
+        doc = open_document(plain_path)
+        assert not is_password_protected(doc)
+
+        img = render_page(doc, 0, zoom=2.0)
+        page_rect = doc[0].rect
+        assert img.width == round(page_rect.width * 2), img.width
+        assert img.mode == "RGB"
+
+        rotated = render_page(doc, 0, zoom=1.0, rotation=90)
+        assert rotated.width == round(page_rect.height), rotated.width
+        print(f"✓ Rendered page at 2x ({img.width}x{img.height}) and rotated")
+    except Exception as e:
+        print(f"✗ Render test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Apply annotations and save
+    print("\n[TEST 3] Apply Annotations and Save")
+    try:
+        annotations = [
+            TextAnnotation(0, 72, 200, "Headless note", fontname="Arial"),
+            ShapeAnnotation(0, 50, 300, 200, 400, "rectangle"),
+            StampAnnotation(1, 100, 100, "approved"),
+        ]
+        apply_annotations(doc, annotations, page_rotations={1: 90})
+        out_path = os.path.join(work_dir, "annotated.pdf")
+        save_document(doc, out_path)
+        doc.close()
+
+        saved = fitz.open(out_path)
+        assert "Headless note" in saved[0].get_text()
+        assert "APPROVED" in saved[1].get_text()
+        assert saved[1].rotation == 90
+        saved.close()
+
+        # Save after Save As goes to the new path, never back into the original
+        original_size = os.path.getsize(plain_path)
+        doc = open_document(plain_path)
+        copy_path = os.path.join(work_dir, "save_as_copy.pdf")
+        save_document(doc, copy_path)
+        apply_annotations(doc, [TextAnnotation(0, 72, 260, "After Save As")])
+        save_document(doc, copy_path)
+        doc.close()
+        assert os.path.getsize(plain_path) == original_size
+        resaved = fitz.open(copy_path)
+        assert "After Save As" in resaved[0].get_text()
+        resaved.close()
+        print("✓ Text, shape and stamp annotations written; rotation applied; "
+              "Save after Save As leaves the original alone")
+    except Exception as e:
+        print(f"✗ Annotation test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Password handling
+    print("\n[TEST 4] Password Handling")
+    try:
+        locked_path = os.path.join(work_dir, "locked.pdf")
+        make_pdf(locked_path, password="secret")
+
+        for password, message in ((None, "Password required"),
+                                  ("wrong", "Incorrect password")):
+            try:
+                open_document(locked_path, password)
+                raise AssertionError("PasswordRequiredError not raised")
+            except PasswordRequiredError as e:
+                assert str(e) == message, str(e)
+
+        doc = open_document(locked_path, "secret")
+        assert is_password_protected(doc)
+        doc.close()
+
+        unlocked_path = unlock_file(locked_path, "secret")
+        assert unlocked_path.endswith("_unprotected.pdf")
+        doc = open_document(unlocked_path)
+        assert not is_password_protected(doc)
+        doc.close()
+        print("✓ Locked PDF rejected without password and unlocked with it")
+    except Exception as e:
+        print(f"✗ Password test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: pypdf page writer
+    print("\n[TEST 5] Page Writer")
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(plain_path)
+        copy_path = os.path.join(work_dir, "copy.pdf")
+        assert write_pages(reader.pages, copy_path, user_password="pw") == 2
+        copy = PdfReader(copy_path)
+        assert copy.is_encrypted and copy.decrypt("pw")
+        print("✓ Pages copied into an encrypted PDF")
+    except Exception as e:
+        print(f"✗ Page writer test failed: {e}")
+        sys.exit(1)
+
+    # Test 6: Word conversion
+    print("\n[TEST 6] Word Conversion")
+    try:
+        docx_path = os.path.join(work_dir, "plain.docx")
+        messages = []
+        doc = open_document(plain_path)
+        pages = WordConverter(doc).convert(docx_path, messages.append)
+        doc.close()
+        assert pages == 2
+        assert os.path.getsize(docx_path) > 0
+        assert any("Converting page" in m for m in messages)
+
+        from docx import Document
+        text = "\n".join(p.text for p in Document(docx_path).paragraphs)
+        assert "Engine test page 1" in text
+        print(f"✓ Converted {pages} pages to Word ({len(messages)} progress messages)")
+    except Exception as e:
+        print(f"✗ Word conversion test failed: {e}")
+        sys.exit(1)
+
+    # Test 7: Parallel chunked conversion and cancellation
+    print("\n[TEST 7] Parallel Word Conversion")
+    try:
+        import threading
+        from docx import Document
+        from pdf_engine import ConversionCancelled
+
+        long_path = os.path.join(work_dir, "long.pdf")
+        make_pdf(long_path, pages=7, password="secret")
+        doc = open_document(long_path, "secret")
+
+        docx_path = os.path.join(work_dir, "long.docx")
+        converter = WordConverter(doc)
+        pages = converter.convert(docx_path, workers=2, chunk_size=2)
+        assert pages == 7
+        lines = [p.text for p in Document(docx_path).paragraphs if p.text.strip()]
+        assert lines == [f"Engine test page {i}" for i in range(1, 8)], lines
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        cancelled_path = os.path.join(work_dir, "cancelled.docx")
+        try:
+            converter.convert(cancelled_path, workers=2, chunk_size=2, cancel_event=cancel_event)
+            raise AssertionError("ConversionCancelled not raised")
+        except ConversionCancelled:
+            pass
+        assert not os.path.exists(cancelled_path)
+        doc.close()
+        print("✓ 4 chunks converted on 2 workers in page order; cancellation honoured")
+    except Exception as e:
+        print(f"✗ Parallel conversion test failed: {e}")
+        sys.exit(1)
+
+    # Test 8: Convert the open document with pending edits
+    print("\n[TEST 8] Convert Open Document with Pending Edits")
+    try:
+        edited_path = os.path.join(work_dir, "edited.pdf")
+        make_pdf(edited_path, pages=3, password="secret")
+        doc = open_document(edited_path, "secret")
+        # The converter must not reopen the file from disk
+        os.remove(edited_path)
+
+        pending = [TextAnnotation(1, 72, 300, "Pending note")]
+        docx_path = os.path.join(work_dir, "edited.docx")
+        for workers in (1, 2):
+            pages = WordConverter(doc, pending, {2: 90}).convert(docx_path, workers=workers,
+                                                                chunk_size=1)
+            text = "\n".join(p.text for p in Document(docx_path).paragraphs)
+            assert pages == 3 and "Pending note" in text, text
+
+        assert "Pending note" not in doc[1].get_text(), "open document was modified"
+        assert doc[2].rotation == 0
+        doc.close()
+        print("✓ Unlocked in-memory document converted with pending annotation and rotation")
+    except Exception as e:
+        print(f"✗ Open document conversion test failed: {e}")
+        sys.exit(1)
+
+    # Test 9: Repeated images decoded once
+    print("\n[TEST 9] Image Deduplication")
+    try:
+        import io
+        import time
+        import zipfile
+        from PIL import Image
+
+        logo = io.BytesIO()
+        Image.new("RGB", (200, 80), (30, 60, 200)).save(logo, format="PNG")
+        speck = io.BytesIO()
+        Image.new("RGB", (10, 10), (0, 0, 0)).save(speck, format="PNG")
+
+        # Pages merged from separate letters carry the same logo under distinct
+        # xrefs, so only the content hash can tell they are identical
+        logo_doc = fitz.open()
+        for i in range(30):
+            letter = fitz.open()
+            page = letter.new_page()
+            page.insert_image(fitz.Rect(72, 72, 272, 152), stream=logo.getvalue())
+            page.insert_image(fitz.Rect(300, 72, 310, 82), stream=speck.getvalue())
+            page.insert_text((72, 200), f"Letter {i + 1}")
+            logo_doc.insert_pdf(letter)
+            letter.close()
+        assert len({page.get_images()[0][0] for page in logo_doc}) == 30
+
+        calls = []
+        original_extract = fitz.Document.extract_image
+
+        def counting_extract(self, xref):
+            calls.append(xref)
+            return original_extract(self, xref)
+
+        fitz.Document.extract_image = counting_extract
+        try:
+            start = time.perf_counter()
+            docx_path = os.path.join(work_dir, "logos.docx")
+            WordConverter(logo_doc).convert(docx_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            fitz.Document.extract_image = original_extract
+        logo_doc.close()
+
+        assert len(calls) == 1, f"decoded {len(calls)} times"
+        assert len(Document(docx_path).inline_shapes) == 30
+        with zipfile.ZipFile(docx_path) as package:
+            media = [n for n in package.namelist() if n.startswith("word/media/")]
+        assert len(media) == 1, media
+        print(f"✓ Logo on 30 pages decoded once, stored once; specks skipped ({elapsed:.2f}s)")
+    except Exception as e:
+        print(f"✗ Image deduplication test failed: {e}")
+        sys.exit(1)
+
+    # Test 10: Markdown blocks and bulk tables
+    print("\n[TEST 10] Markdown Blocks and Tables")
+    try:
+        from pdf_engine import StyleResolver, tokenize_markdown
+
+        markdown = "\n".join([
+            "# Title", "#### Deep heading", "- bullet **bold**", "2. numbered",
+            "| Item | Amount |", "|---|---:|", "| Rent | 1,200 |", "| Fees |", "after table",
+            "```", "code line", "```", "---",
+        ])
+        kinds = [kind for kind, _ in tokenize_markdown(markdown)]
+        assert kinds == ['heading', 'heading', 'bullet', 'number', 'table', 'text',
+                         'code', 'rule'], kinds
+
+        word = Document()
+        WordConverter(None)._markdown_to_word(word, markdown, 0, StyleResolver(word))
+        styles = [p.style.name for p in word.paragraphs if p.text.strip()]
+        assert styles[:4] == ['Heading 1', 'Heading 4', 'List Bullet', 'List Number'], styles
+
+        table = word.tables[0]
+        assert table.style.name == 'Table Grid'
+        assert [[c.text for c in row.cells] for row in table.rows] == \
+            [["Item", "Amount"], ["Rent", "1,200"], ["Fees", ""]]
+        assert all(run.bold for run in table.rows[0].cells[0].paragraphs[0].runs)
+        assert not any(run.bold for run in table.rows[1].cells[0].paragraphs[0].runs)
+        print("✓ Blocks tokenized, styles resolved and ragged table filled")
+    except Exception as e:
+        print(f"✗ Markdown block test failed: {e}")
+        sys.exit(1)
+
+    # Test 11: Streaming writer
+    print("\n[TEST 11] Streaming Word Conversion")
+    try:
+        import re
+        streamed_doc = fitz.open()
+        for i in range(7):
+            page = streamed_doc.new_page()
+            page.insert_text((72, 72), f"Streamed page {i + 1}")
+            page.insert_image(fitz.Rect(72, 100, 272, 180), stream=logo.getvalue())
+            if i % 3 == 0:
+                photo = io.BytesIO()
+                Image.new("RGB", (120, 120), (i * 30, 0, 0)).save(photo, format="PNG")
+                page.insert_image(fitz.Rect(72, 300, 192, 420), stream=photo.getvalue())
+
+        converter = WordConverter(streamed_doc)
+        converter.STREAMING_FLUSH_PAGES = 2
+        streamed_path = os.path.join(work_dir, "streamed.docx")
+        in_memory_path = os.path.join(work_dir, "in_memory.docx")
+        assert converter.convert(streamed_path, streaming=True) == 7
+        converter.convert(in_memory_path, streaming=False)
+
+        streamed, in_memory = Document(streamed_path), Document(in_memory_path)
+        assert [p.text for p in streamed.paragraphs] == [p.text for p in in_memory.paragraphs]
+        assert len(streamed.inline_shapes) == len(in_memory.inline_shapes) == 10
+        with zipfile.ZipFile(streamed_path) as package:
+            media = [n for n in package.namelist() if n.startswith("word/media/")]
+            body = package.read("word/document.xml").decode("utf-8")
+        assert len(media) == 4, media
+        shape_ids = re.findall(r'<wp:docPr id="(\d+)"', body)
+        assert len(set(shape_ids)) == len(shape_ids) == 10, shape_ids
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        cancelled_path = os.path.join(work_dir, "cancelled_stream.docx")
+        try:
+            converter.convert(cancelled_path, streaming=True, cancel_event=cancel_event)
+            raise AssertionError("ConversionCancelled not raised")
+        except ConversionCancelled:
+            pass
+        assert not os.path.exists(cancelled_path)
+        streamed_doc.close()
+        print("✓ 4 flushed chunks match the in-memory document; images stored once")
+    except Exception as e:
+        print(f"✗ Streaming conversion test failed: {e}")
+        sys.exit(1)
+
+    # Test 12: Markdown cache
+    print("\n[TEST 12] Markdown Cache")
+    try:
+        from pdf_engine import MarkdownCache
+
+        cache = MarkdownCache(os.path.join(work_dir, "md_cache"))
+        cached_path = os.path.join(work_dir, "cached.pdf")
+        make_pdf(cached_path, pages=4)
+        doc = open_document(cached_path)
+        docx_path = os.path.join(work_dir, "cached.docx")
+
+        analysed = []
+        sources = []
+        original_chunk = pdf_engine.markdown_chunk
+
+        def counting_chunk(source, pages):
+            analysed.extend(pages)
+            sources.append(source)
+            return original_chunk(source, pages)
+
+        pdf_engine.markdown_chunk = counting_chunk
+        try:
+            WordConverter(doc, markdown_cache=cache).convert(docx_path)
+            assert analysed == [0, 1, 2, 3], analysed
+            first_text = [p.text for p in Document(docx_path).paragraphs]
+
+            analysed.clear()
+            WordConverter(doc, markdown_cache=cache).convert(docx_path)
+            assert analysed == [] and cache.hits == 4, (analysed, cache.hits)
+            assert [p.text for p in Document(docx_path).paragraphs] == first_text
+
+            # Pending edits change the content hash, so every page is analysed again
+            WordConverter(doc, [TextAnnotation(2, 72, 300, "Cached note")],
+                          markdown_cache=cache).convert(docx_path)
+            assert analysed == [0, 1, 2, 3], analysed
+
+            # Without a cache the open document is analysed directly, no copy
+            sources.clear()
+            WordConverter(doc).convert(docx_path)
+            assert sources and all(source is doc for source in sources)
+
+            # Pages evicted between lookup and read share one private copy,
+            # which is closed when the conversion ends
+            class EvictingCache(MarkdownCache):
+                def get(self, fingerprint, page_num):
+                    return None
+
+            clean = open_document(cached_path)
+            sources.clear()
+            WordConverter(clean, markdown_cache=EvictingCache(cache.directory)).convert(docx_path)
+            assert len(sources) == 4 and len({id(source) for source in sources}) == 1, sources
+            assert sources[0] is not clean and sources[0].is_closed
+            clean.close()
+            sources.clear()
+        finally:
+            pdf_engine.markdown_chunk = original_chunk
+        doc.close()
+
+        # Text of a password-protected PDF is never written to the cache
+        secret_cache = MarkdownCache(os.path.join(work_dir, "md_cache_secret"))
+        secret_path = os.path.join(work_dir, "cached_secret.pdf")
+        make_pdf(secret_path, pages=2, password="secret")
+        secret_doc = open_document(secret_path, "secret")
+        WordConverter(secret_doc, markdown_cache=secret_cache).convert(docx_path)
+        WordConverter(secret_doc, [TextAnnotation(0, 72, 300, "Note")],
+                      markdown_cache=secret_cache).convert(docx_path)
+        secret_doc.close()
+        assert os.listdir(secret_cache.directory) == [], os.listdir(secret_cache.directory)
+
+        small = MarkdownCache(cache.directory, max_bytes=60)
+        small.evict()
+        assert small._size <= 60 * 0.9, small._size
+        print(f"✓ Re-conversion served from cache ({cache.hits} hits); encrypted input not cached; "
+              f"eviction bounded size")
+    except Exception as e:
+        print(f"✗ Markdown cache test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL ENGINE TESTS PASSED")
+print("=" * 60)
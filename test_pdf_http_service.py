@@ -0,0 +1,243 @@
+"""
+Test script for the local HTTP service (pdf_http_service.py)
+Starts the service on a free localhost port and calls every endpoint offline
+"""
+
+import sys
+import os
+import io
+import json
+import base64
+import zipfile
+import http.client
+import urllib.request
+import urllib.error
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF HTTP SERVICE - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import and start
+print("\n[TEST 1] Start Service")
+try:
+    import fitz
+    from PIL import Image
+    from pdf_http_service import HTTPError, PDFService, PDFServiceHandler
+    service = PDFService(port=0, workers=2, max_pending=2)
+    service.start()
+    print(f"✓ Service listening on {service.url}")
+except Exception as e:
+    print(f"✗ Failed to start service: {e}")
+    sys.exit(1)
+
+
+def make_pdf(pages, label, password=None) -> bytes:
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"{label} page {i + 1}")
+    if password:
+        data = doc.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw=password)
+    else:
+        data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def call(method, path, body=None, json_body=None, password=None):
+    """Return (status, headers, body) for a request to the service"""
+    if json_body is not None:
+        body = json.dumps(json_body).encode("utf-8")
+    request = urllib.request.Request(service.url + path, data=body, method=method)
+    if password is not None:
+        request.add_header("X-PDF-Password", password)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def page_texts(data):
+    doc = fitz.open(stream=data, filetype="pdf")
+    texts = [page.get_text() for page in doc]
+    doc.close()
+    return texts
+
+
+try:
+    plain = make_pdf(3, "plain")
+    locked = make_pdf(2, "locked", password="secret")
+
+    # Test 2: Render
+    print("\n[TEST 2] Render Page to PNG")
+    try:
+        status, headers, body = call("POST", "/render?page=2&zoom=0.5", plain)
+        assert status == 200 and headers["Content-Type"] == "image/png", status
+        img = Image.open(io.BytesIO(body))
+        assert img.width == round(fitz.paper_size("a4")[0] * 0.5), img.size
+        status, _, _ = call("POST", "/render?page=9", plain)
+        assert status == 400
+        print(f"✓ Rendered page 2 at {img.size}; out-of-range page rejected")
+    except Exception as e:
+        print(f"✗ Render test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Unlock
+    print("\n[TEST 3] Unlock")
+    try:
+        assert call("POST", "/unlock", locked)[0] == 401
+        assert call("POST", "/unlock", locked, password="wrong")[0] == 401
+        status, _, body = call("POST", "/unlock", locked, password="secret")
+        assert status == 200
+        assert not fitz.open(stream=body, filetype="pdf").needs_pass
+        assert call("POST", "/unlock", plain)[0] == 400
+        status, _, body = call("POST", "/unlock?password=secret", locked)
+        assert status == 400 and b"X-PDF-Password" in body, body
+        print("✓ Locked PDF unlocked; missing/wrong passwords answered with 401, "
+              "passwords in the URL refused")
+    except Exception as e:
+        print(f"✗ Unlock test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Merge and split
+    print("\n[TEST 4] Merge and Split")
+    try:
+        status, _, merged = call("POST", "/merge", json_body={'documents': [
+            base64.b64encode(plain).decode(), base64.b64encode(make_pdf(1, "extra")).decode()]})
+        assert status == 200
+        texts = page_texts(merged)
+        assert len(texts) == 4 and "extra page 1" in texts[3]
+
+        status, headers, body = call("POST", "/split?ranges=1-2,4", merged)
+        assert status == 200 and headers["Content-Type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            names = archive.namelist()
+            assert names == ["part_1_pages_1-2.pdf", "part_2_pages_4-4.pdf"], names
+            assert len(page_texts(archive.read(names[0]))) == 2
+        print("✓ Merged 2 PDFs and split the result into a zip")
+    except Exception as e:
+        print(f"✗ Merge/split test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: Annotate from JSON
+    print("\n[TEST 5] Annotate from JSON")
+    try:
+        status, _, body = call("POST", "/annotate", json_body={
+            'document': base64.b64encode(locked).decode(),
+            'password': "secret",
+            'annotations': [
+                {'type': 'text', 'page': 1, 'x': 72, 'y': 200, 'text': "Service note"},
+                {'type': 'stamp', 'page': 2, 'x': 300, 'y': 50, 'stamp_type': "final"},
+            ]})
+        assert status == 200, body
+        doc = fitz.open(stream=body, filetype="pdf")
+        assert doc.needs_pass and doc.authenticate("secret")
+        assert "Service note" in doc[0].get_text() and "FINAL" in doc[1].get_text()
+        status, _, body = call("POST", "/annotate", json_body={
+            'document': base64.b64encode(plain).decode(),
+            'annotations': [{'type': 'balloon', 'page': 1}]})
+        assert status == 400 and b"Unknown annotation type" in body
+        print("✓ Annotations applied to an encrypted PDF; unknown types rejected")
+    except Exception as e:
+        print(f"✗ Annotate test failed: {e}")
+        sys.exit(1)
+
+    # Test 6: Convert to Word
+    print("\n[TEST 6] Convert to Word")
+    try:
+        status, headers, body = call("POST", "/convert", locked, password="secret")
+        assert status == 200, body
+        from docx import Document
+        text = "\n".join(p.text for p in Document(io.BytesIO(body)).paragraphs)
+        assert "locked page 2" in text
+        print(f"✓ Encrypted PDF converted to Word ({len(body):,} bytes)")
+    except Exception as e:
+        print(f"✗ Convert test failed: {e}")
+        sys.exit(1)
+
+    # Test 7: Backpressure
+    print("\n[TEST 7] Backpressure")
+    try:
+        held = [service.slots.acquire(blocking=False) for _ in range(service.max_pending)]
+        assert all(held)
+        # Turned away before the body is read: the request is not even parsed
+        def refuse_read(handler):
+            raise AssertionError("body read while busy")
+
+        read_body = PDFServiceHandler._read_body
+        PDFServiceHandler._read_body = refuse_read
+        try:
+            status, headers, _ = call("POST", "/render", plain)
+        finally:
+            PDFServiceHandler._read_body = read_body
+        for _ in held:
+            service.slots.release()
+        assert status == 429 and headers["Retry-After"] == "1", status
+        assert call("POST", "/render", plain)[0] == 200
+        print("✓ Full queue answered with 429 and recovered after draining")
+
+        # Missing, non-numeric or negative Content-Length is refused before reading
+        host, port = service.httpd.server_address[:2]
+        for headers, expected in (({}, 411), ({"Content-Length": "abc"}, 400),
+                                  ({"Content-Length": "-1"}, 400)):
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            connection.putrequest("POST", "/unlock")
+            for name, value in headers.items():
+                connection.putheader(name, value)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == expected, (headers, response.status)
+            connection.close()
+        print("✓ Bad Content-Length answered with 400/411")
+    except Exception as e:
+        print(f"✗ Backpressure test failed: {e}")
+        sys.exit(1)
+
+    # Test 8: A crashed worker is replaced
+    print("\n[TEST 8] Worker Crash")
+    try:
+        crashed_pool = service.pool
+        try:
+            service.run(os._exit, 1)
+            raise AssertionError("crash not reported")
+        except HTTPError as e:
+            assert e.status == 503, e.status
+        assert service.pool is not crashed_pool
+        assert call("POST", "/render", plain)[0] == 200
+        print("✓ Crash answered with 503; next request served by a new pool")
+    except Exception as e:
+        print(f"✗ Worker crash test failed: {e}")
+        sys.exit(1)
+
+    # Test 9: Metrics and routing
+    print("\n[TEST 9] Metrics")
+    try:
+        assert call("GET", "/nope")[0] == 404
+        for path in ("/nope", "/also-nope", "/render/extra"):
+            assert call("POST", path, plain)[0] == 404
+        status, _, body = call("GET", "/health")
+        assert status == 200 and json.loads(body)['status'] == "ok"
+        metrics = json.loads(call("GET", "/metrics")[2])
+        render = metrics['endpoints']['render']
+        assert render['count'] == 5, render
+        assert render['statuses'] == {'200': 3, '400': 1, '429': 1}, render['statuses']
+        assert sum(render['buckets'].values()) == render['count']
+        unknown = metrics['endpoints']['unknown']
+        assert unknown['count'] == 3 and unknown['statuses'] == {'404': 3}, unknown
+        assert set(metrics['endpoints']) <= set(service.ROUTES) | {'unknown'}, metrics['endpoints']
+        print(f"✓ Per-endpoint histograms for {', '.join(metrics['endpoints'])}")
+    except Exception as e:
+        print(f"✗ Metrics test failed: {e}")
+        sys.exit(1)
+
+finally:
+    service.stop()
+
+print("\n" + "=" * 60)
+print("ALL HTTP SERVICE TESTS PASSED")
+print("=" * 60)
@@ -0,0 +1,228 @@
+"""
+Test script for the declarative job pipeline (pdf_pipeline.py)
+Runs small JSON and YAML jobs end to end in a temporary folder
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF PIPELINE - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import pipeline
+print("\n[TEST 1] Pipeline Import")
+try:
+    import fitz
+    from pypdf import PdfReader
+    import pdf_pipeline
+    from pdf_pipeline import load_job, run_job, validate_job, MANIFEST_NAME
+    print("✓ pdf_pipeline imported")
+except Exception as e:
+    print(f"✗ Failed to import pdf_pipeline: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="pdf_pipeline_test_")
+
+
+def make_pdf(path, pages, password=None):
+    """Create a text PDF, optionally AES-256 encrypted"""
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"{os.path.basename(path)} page {i + 1}")
+    if password:
+        doc.save(path, encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw=password)
+    else:
+        doc.save(path)
+    doc.close()
+
+
+try:
+    inbox = os.path.join(work_dir, "inbox")
+    os.makedirs(inbox)
+    make_pdf(os.path.join(inbox, "a.pdf"), 3, password="a-pw")
+    make_pdf(os.path.join(inbox, "b.pdf"), 4, password="b-pw")
+    make_pdf(os.path.join(inbox, "c.pdf"), 2)
+
+    # Test 2: Spec validation
+    print("\n[TEST 2] Spec Validation")
+    bad_specs = [
+        {'output_dir': 'out', 'stages': [{'op': 'unlock'}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'shred'}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'rotate', 'angle': 45}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'merge'}, {'op': 'merge'}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'rotate', 'angle': "90"}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'split', 'every': "2"}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'split', 'every': -1}]},
+        {'inputs': ['x'], 'output_dir': 'out', 'stages': [{'op': 'crop', 'left': "5"}]},
+    ]
+    for spec in bad_specs:
+        try:
+            validate_job(spec)
+            print(f"✗ Spec accepted but should fail: {spec}")
+            sys.exit(1)
+        except ValueError:
+            pass
+    print(f"✓ {len(bad_specs)} invalid specs rejected")
+
+    # Test 3: Per-file JSON job
+    print("\n[TEST 3] Per-file JSON Job")
+    try:
+        spec_path = os.path.join(work_dir, "job.json")
+        with open(spec_path, "w") as f:
+            json.dump({
+                'inputs': ["inbox/*.pdf"],
+                'output_dir': "out",
+                'workers': 2,
+                'max_in_flight': 1,
+                'stages': [
+                    {'op': 'unlock', 'password': "{stem}-pw"},
+                    {'op': 'rotate', 'pages': "1", 'angle': 90},
+                    {'op': 'annotate', 'annotations': [
+                        {'type': 'text', 'page': 1, 'x': 72, 'y': 300, 'text': "Nightly"}]},
+                    {'op': 'split', 'every': 2},
+                    {'op': 'encrypt', 'password': "{stem}-out"},
+                ],
+            }, f)
+
+        job = load_job(spec_path)
+        manifest = run_job(job)
+        out_dir = os.path.join(work_dir, "out")
+
+        assert manifest['total'] == 3 and manifest['succeeded'] == 3, manifest
+        assert os.path.exists(os.path.join(out_dir, MANIFEST_NAME))
+        a_outputs = manifest['files'][0]['outputs']
+        assert [os.path.basename(p) for p in a_outputs] == ["a_part_1.pdf", "a_part_2.pdf"]
+        assert [s['op'] for s in manifest['files'][0]['stages']] == \
+            ['unlock', 'rotate', 'annotate', 'split', 'encrypt']
+
+        reader = PdfReader(a_outputs[0])
+        assert reader.is_encrypted and reader.decrypt("a-out")
+        assert len(reader.pages) == 2
+        assert reader.pages[0].rotation == 90
+        assert "Nightly" in reader.pages[0].extract_text()
+        print(f"✓ 3 files unlocked, rotated, annotated, split and re-encrypted "
+              f"in {manifest['seconds']:.2f}s")
+    except Exception as e:
+        print(f"✗ Per-file job failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Failures recorded per file
+    print("\n[TEST 4] Per-file Failure Reporting")
+    try:
+        job = {
+            'inputs': [inbox],
+            'output_dir': os.path.join(work_dir, "out_fail"),
+            'stages': [{'op': 'unlock', 'password': "wrong"}],
+        }
+        manifest = run_job(job, workers=1)
+        statuses = {os.path.basename(r['input']): r['status'] for r in manifest['files']}
+        assert statuses == {'a.pdf': 'error', 'b.pdf': 'error', 'c.pdf': 'ok'}, statuses
+        assert manifest['files'][0]['error'] == "Incorrect password"
+
+        # A worker that dies fails its file (and the ones queued behind it),
+        # but the job still finishes and writes its manifest
+        original_process_file = pdf_pipeline.process_file
+
+        def crashing_process_file(index, input_path, *args):
+            if os.path.basename(input_path) == "b.pdf":
+                os._exit(1)
+            return original_process_file(index, input_path, *args)
+
+        pdf_pipeline.process_file = crashing_process_file
+        try:
+            job = {'inputs': [inbox], 'output_dir': os.path.join(work_dir, "out_crash"),
+                   'stages': [{'op': 'rotate', 'angle': 90}]}
+            manifest = run_job(job, workers=1)
+        finally:
+            pdf_pipeline.process_file = original_process_file
+        assert os.path.exists(os.path.join(work_dir, "out_crash", MANIFEST_NAME))
+        statuses = {os.path.basename(r['input']): r['status'] for r in manifest['files']}
+        assert manifest['total'] == 3 and statuses['b.pdf'] == 'error', statuses
+        print("✓ Wrong passwords and a crashed worker reported without stopping the job")
+    except Exception as e:
+        print(f"✗ Failure reporting test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: YAML job with merge and convert
+    print("\n[TEST 5] YAML Job with Merge")
+    try:
+        import yaml
+    except ImportError:
+        yaml = None
+        print("⚠ PyYAML not installed, skipping YAML job")
+
+    if yaml:
+        try:
+            spec_path = os.path.join(work_dir, "job.yaml")
+            with open(spec_path, "w") as f:
+                f.write(
+                    "inputs: [inbox/c.pdf, inbox/b.pdf]\n"
+                    "output_dir: out_merged\n"
+                    "workers: 2\n"
+                    "stages:\n"
+                    "  - op: unlock\n"
+                    "    password: '{stem}-pw'\n"
+                    "  - op: merge\n"
+                    "    name: nightly\n"
+                    "  - op: convert\n"
+                )
+            manifest = run_job(load_job(spec_path))
+            merged = manifest['merged']
+            assert merged['status'] == 'ok', merged
+            names = sorted(os.path.basename(p) for p in merged['outputs'])
+            assert names == ["nightly.docx", "nightly.pdf"], names
+
+            reader = PdfReader(os.path.join(work_dir, "out_merged", "nightly.pdf"))
+            assert len(reader.pages) == 6
+            assert "c.pdf page 1" in reader.pages[0].extract_text()
+            print("✓ Merged 2 files in input order and converted to Word")
+        except Exception as e:
+            print(f"✗ YAML merge job failed: {e}")
+            sys.exit(1)
+
+    # Test 6: Inputs from different folders that share a name
+    print("\n[TEST 6] Same-named Inputs")
+    try:
+        for folder, pages in (("x", 2), ("y", 3)):
+            os.makedirs(os.path.join(work_dir, folder))
+            make_pdf(os.path.join(work_dir, folder, "report.pdf"), pages)
+        inputs = [os.path.join(work_dir, "x", "*.pdf"), os.path.join(work_dir, "y", "*.pdf")]
+
+        manifest = run_job({'inputs': inputs, 'output_dir': os.path.join(work_dir, "out_same"),
+                            'stages': [{'op': 'rotate', 'angle': 90}]}, workers=2)
+        outputs = [r['outputs'][0] for r in manifest['files']]
+        assert [os.path.basename(p) for p in outputs] == ["report.pdf", "report_2.pdf"], outputs
+        assert [len(PdfReader(p).pages) for p in outputs] == [2, 3]
+
+        manifest = run_job({'inputs': inputs, 'output_dir': os.path.join(work_dir, "out_same_merged"),
+                            'stages': [{'op': 'rotate', 'angle': 90}, {'op': 'merge'}]}, workers=2)
+        assert len(PdfReader(manifest['merged']['outputs'][0]).pages) == 5
+
+        # A file's intermediates are removed once its outputs are published
+        stage_dir = os.path.join(work_dir, "stages")
+        os.makedirs(os.path.join(work_dir, "out_single"))
+        result = pdf_pipeline.process_file(0, os.path.join(work_dir, "x", "report.pdf"), "report",
+                                           [{'op': 'rotate', 'angle': 90}], stage_dir,
+                                           os.path.join(work_dir, "out_single"), True)
+        assert result['status'] == 'ok', result
+        assert not os.path.exists(os.path.join(stage_dir, "0")), os.listdir(stage_dir)
+        print("✓ Same-named inputs keep separate intermediates and outputs")
+    except Exception as e:
+        print(f"✗ Same-named inputs test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL PIPELINE TESTS PASSED")
+print("=" * 60)
@@ -0,0 +1,208 @@
+"""
+Test script for the watch-folder service (pdf_watch_folder.py)
+Drops files into a temporary inbox and checks outbox, error folder and metrics
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("PDF WATCH FOLDER - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import service
+print("\n[TEST 1] Service Import")
+try:
+    import fitz
+    from pypdf import PdfReader
+    import pdf_watch_folder
+    from pdf_watch_folder import WatchFolder, build_stages, METRICS_NAME
+    print("✓ pdf_watch_folder imported")
+except Exception as e:
+    print(f"✗ Failed to import pdf_watch_folder: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="pdf_watch_test_")
+
+
+def make_pdf_bytes(password=None) -> bytes:
+    """Return a one-page PDF, optionally AES-256 encrypted"""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Incoming document")
+    if password:
+        data = doc.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw=password)
+    else:
+        data = doc.tobytes()
+    doc.close()
+    return data
+
+
+try:
+    inbox = os.path.join(work_dir, "inbox")
+    outbox = os.path.join(work_dir, "outbox")
+    errors = os.path.join(work_dir, "errors")
+
+    # Test 2: Debounce of partially written files
+    print("\n[TEST 2] Debounce Partial Writes")
+    try:
+        stages = build_stages(unlock_password="{stem}-pw", stamp="approved")
+        assert [s['op'] for s in stages] == ['unlock', 'annotate']
+
+        service = WatchFolder(inbox, outbox, errors, stages, workers=1,
+                              settle_seconds=0.3, poll_interval=0.05)
+        data = make_pdf_bytes("report-pw")
+        partial = os.path.join(inbox, "report.pdf")
+        with open(partial, "wb") as f:
+            f.write(data[:len(data) // 2])
+
+        assert service.find_ready_files() == []
+        time.sleep(0.1)
+        with open(partial, "ab") as f:
+            f.write(data[len(data) // 2:])
+        assert service.find_ready_files() == [], "file picked up while still growing"
+        time.sleep(0.4)
+        assert service.find_ready_files() == [partial]
+        print("✓ File only becomes ready after it stops changing")
+    except Exception as e:
+        print(f"✗ Debounce test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Processing loop
+    print("\n[TEST 3] Unlock and Stamp Loop")
+    try:
+        with open(os.path.join(inbox, "broken.pdf"), "wb") as f:
+            f.write(b"not really a pdf")
+
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(service.run(max_files=3)))
+        thread.start()
+
+        # A file arriving while the service is running is picked up too
+        time.sleep(0.2)
+        with open(os.path.join(inbox, "late.pdf"), "wb") as f:
+            f.write(make_pdf_bytes())
+
+        thread.join(timeout=60)
+        if thread.is_alive():
+            service.stop()
+            thread.join()
+            raise AssertionError("service did not finish 3 files")
+
+        assert sorted(os.listdir(inbox)) == []
+        assert os.path.exists(os.path.join(outbox, "report.pdf"))
+        assert os.path.exists(os.path.join(outbox, "late.pdf"))
+        assert os.path.exists(os.path.join(outbox, "originals", "report.pdf"))
+        assert os.path.exists(os.path.join(errors, "broken.pdf"))
+        assert os.path.exists(os.path.join(errors, "broken.pdf.error.txt"))
+
+        reader = PdfReader(os.path.join(outbox, "report.pdf"))
+        assert not reader.is_encrypted
+        assert "APPROVED" in reader.pages[0].extract_text()
+
+        assert result['processed'] == 2 and result['failed'] == 1, result
+        assert result['files_per_minute'] > 0
+        assert os.path.exists(os.path.join(outbox, METRICS_NAME))
+        print(f"✓ 2 processed, 1 moved to errors via {result['watcher']} "
+              f"(avg latency {result['avg_latency_seconds']}s)")
+    except Exception as e:
+        print(f"✗ Processing loop failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Polling fallback
+    print("\n[TEST 4] Polling Fallback")
+    try:
+        service = WatchFolder(inbox, outbox, errors, build_stages(stamp="draft"), workers=1,
+                              settle_seconds=0.1, poll_interval=0.05, use_inotify=False)
+        with open(os.path.join(inbox, "polled.pdf"), "wb") as f:
+            f.write(make_pdf_bytes())
+        metrics = service.run(max_files=1)
+        assert metrics['watcher'] == "polling" and metrics['processed'] == 1, metrics
+        print("✓ Polling picked up and processed a file")
+    except Exception as e:
+        print(f"✗ Polling test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: Same-named files never overwrite earlier results, originals or failures
+    print("\n[TEST 5] Repeated File Names")
+    try:
+        service = WatchFolder(inbox, outbox, errors, build_stages(stamp="draft"), workers=1,
+                              settle_seconds=0.1, poll_interval=0.05, use_inotify=False)
+        with open(os.path.join(inbox, "broken.pdf"), "wb") as f:
+            f.write(b"still not a pdf")
+        with open(os.path.join(inbox, "late.pdf"), "wb") as f:
+            f.write(make_pdf_bytes())
+        metrics = service.run(max_files=2)
+        assert metrics['processed'] == 1 and metrics['failed'] == 1, metrics
+
+        failed = sorted(n for n in os.listdir(errors) if n.startswith("broken"))
+        assert len(failed) == 4, failed
+        with open(os.path.join(errors, "broken.pdf"), "rb") as f:
+            assert f.read() == b"not really a pdf"
+        originals = [n for n in os.listdir(os.path.join(outbox, "originals")) if n.startswith("late")]
+        assert len(originals) == 2, originals
+
+        # The first late.pdf result (stamped APPROVED) is kept next to the new one
+        outputs = sorted(n for n in os.listdir(outbox) if n.startswith("late"))
+        assert len(outputs) == 2 and "late.pdf" in outputs, outputs
+        assert "APPROVED" in PdfReader(os.path.join(outbox, "late.pdf")).pages[0].extract_text()
+        second = [n for n in outputs if n != "late.pdf"][0]
+        assert "DRAFT" in PdfReader(os.path.join(outbox, second)).pages[0].extract_text()
+
+        renamed = [n for n in failed if n.startswith("broken_") and n.endswith(".pdf")]
+        print(f"✓ Second failure kept as {renamed[0]} next to broken.pdf; "
+              f"second result kept as {second}")
+    except Exception as e:
+        print(f"✗ Repeated names test failed: {e}")
+        sys.exit(1)
+
+    # Test 6: A crashed worker or a vanished file does not stop the service
+    print("\n[TEST 6] Worker Crash Recovery")
+    try:
+        original_process_file = pdf_watch_folder.process_file
+
+        def flaky_process_file(index, input_path, *args):
+            name = os.path.basename(input_path)
+            if name == "crash.pdf":
+                os._exit(1)
+            result = original_process_file(index, input_path, *args)
+            if name == "gone.pdf":
+                os.remove(input_path)
+            return result
+
+        for name in ("crash.pdf", "first.pdf", "gone.pdf", "second.pdf"):
+            with open(os.path.join(inbox, name), "wb") as f:
+                f.write(make_pdf_bytes())
+        service = WatchFolder(inbox, outbox, errors, build_stages(stamp="final"), workers=2,
+                              settle_seconds=0.1, poll_interval=0.05, use_inotify=False)
+        pdf_watch_folder.process_file = flaky_process_file
+        try:
+            metrics = service.run(max_files=4)
+        finally:
+            pdf_watch_folder.process_file = original_process_file
+
+        assert metrics['processed'] == 2 and metrics['failed'] == 2, metrics
+        assert os.listdir(inbox) == [], os.listdir(inbox)
+        assert os.path.exists(os.path.join(errors, "crash.pdf"))
+        for name in ("first.pdf", "second.pdf"):
+            assert os.path.exists(os.path.join(outbox, "originals", name)), name
+        print("✓ Pool restarted after a crash; only the crashing file failed; "
+              "vanished file recorded as failed")
+    except Exception as e:
+        print(f"✗ Crash recovery test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL WATCH FOLDER TESTS PASSED")
+print("=" * 60)
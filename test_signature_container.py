@@ -0,0 +1,187 @@
+"""
+Test script for the binary signature container (signature_container.py) and the
+library migration tool (migrate_signatures.py)
+"""
+
+import sys
+import os
+import base64
+import hashlib
+import json
+import shutil
+import tempfile
+import time
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("SIGNATURE CONTAINER - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import modules
+print("\n[TEST 1] Module Import")
+try:
+    from cryptography.fernet import Fernet
+    from signature_container import SignatureContainer
+    from signature_store import SignatureStore, derive_key
+    from migrate_signatures import detect_format, main
+    print("✓ signature_container and migrate_signatures imported")
+except Exception as e:
+    print(f"✗ Failed to import modules: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="signature_container_test_")
+
+
+def fake_png(n, size=4000):
+    """Distinct incompressible bytes standing in for a PNG"""
+    return hashlib.sha256(str(n).encode()).digest() * (size // 32)
+
+
+def write_json_library(path, count):
+    """Library in the old pdf_editor_full.py format"""
+    library = {f"Person {n}": {'data': base64.b64encode(fake_png(n)).decode('utf-8'),
+                               'type': 'signature', 'created': "2024-05-06T07:08:09"}
+               for n in range(count)}
+    with open(path, "w") as f:
+        json.dump(library, f, indent=2)
+
+
+try:
+    # Test 2: Container reads, writes and compaction
+    print("\n[TEST 2] Container Format")
+    try:
+        path = os.path.join(work_dir, "library.sigs")
+        container = SignatureContainer(path)
+        container.add_many([{'name': f"Person {n}", 'data': fake_png(n), 'type': 'signature',
+                             'width': 150, 'height': 50} for n in range(3000)])
+        container_size = os.path.getsize(path)
+        container.add("Jane Doe (initials)", fake_png(-1), "initials", 60, 30)
+        assert container.delete("Person 5") and not container.delete("Person 5")
+
+        json_path = os.path.join(work_dir, "library.json")
+        write_json_library(json_path, 3000)
+        start = time.perf_counter()
+        with open(json_path) as f:
+            base64.b64decode(json.load(f)["Person 2999"]['data'])
+        json_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = SignatureContainer(path)
+        assert reopened.get_data("Person 2999") == fake_png(2999)
+        container_seconds = time.perf_counter() - start
+        assert reopened.get_info("Jane Doe (initials)")['width'] == 60
+        assert len(reopened) == 3000 and "Person 5" not in reopened
+
+        ratio = container_size / os.path.getsize(json_path)
+        assert ratio < 0.8, ratio
+
+        # Replacing most signatures leaves enough unused space to trigger compaction
+        reopened.add_many([{'name': f"Person {n}", 'data': fake_png(n + 10000)}
+                           for n in range(6, 3000)])
+        assert reopened.unused_bytes() < os.path.getsize(path) / 2
+        assert SignatureContainer(path).get_data("Person 42") == fake_png(10042)
+        assert SignatureContainer(path).get_data("Person 1") == fake_png(1)
+        print(f"✓ {ratio:.0%} of the JSON size; one signature read in "
+              f"{container_seconds * 1000:.1f}ms vs {json_seconds * 1000:.0f}ms from JSON")
+    except Exception as e:
+        print(f"✗ Container format test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Full editor storage migrates signatures.json on first use
+    print("\n[TEST 3] Full Editor Storage")
+    try:
+        from pdf_editor_full import SignatureStorage
+
+        legacy_json = os.path.join(work_dir, "signatures.json")
+        write_json_library(legacy_json, 3)
+
+        # A migration that fails part way leaves no container, so it runs again next time
+        sigs_file = os.path.join(work_dir, "signatures.sigs")
+        original_write = SignatureContainer._write
+
+        def failing_write(self, index, entries, now):
+            with open(self.path, 'wb') as f:
+                f.write(b"partial")
+            raise OSError("disk full")
+        SignatureContainer._write = failing_write
+        try:
+            SignatureStorage(sigs_file, legacy_json)
+        finally:
+            SignatureContainer._write = original_write
+        assert not os.path.exists(sigs_file) and not os.path.exists(sigs_file + ".tmp")
+        assert os.path.exists(legacy_json)
+
+        storage = SignatureStorage(sigs_file, legacy_json)
+        assert storage.get_all_names() == ["Person 0", "Person 1", "Person 2"]
+        assert storage.get_signature("Person 2") == fake_png(2)
+        assert os.path.exists(legacy_json + ".bak") and not os.path.exists(legacy_json)
+        storage.add_signature("New", fake_png(7))
+        storage.delete_signature("Person 0")
+        reloaded = SignatureStorage(os.path.join(work_dir, "signatures.sigs"), legacy_json)
+        assert reloaded.get_all_names() == ["Person 1", "Person 2", "New"]
+        assert reloaded.get_signature_info("New")['type'] == "signature"
+        print("✓ signatures.json moved into signatures.sigs and kept as .bak")
+    except Exception as e:
+        print(f"✗ Full editor storage test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Migration tool for both old formats
+    print("\n[TEST 4] Migration Tool")
+    try:
+        json_source = os.path.join(work_dir, "old", "signatures.json")
+        os.makedirs(os.path.dirname(json_source))
+        write_json_library(json_source, 4)
+        assert main([json_source]) == 0
+        sigs_path = os.path.join(work_dir, "old", "signatures.sigs")
+        assert detect_format(sigs_path) == 'container' and os.path.exists(json_source)
+        assert len(SignatureContainer(sigs_path)) == 4
+
+        encrypted_source = os.path.join(work_dir, "old", "signatures.encrypted")
+        # A salt that starts with "{" must not make the file look like JSON
+        salt = b"{ " + os.urandom(14)
+        with open(json_source) as f:
+            library = json.load(f)
+        with open(encrypted_source, "wb") as f:
+            f.write(salt)
+            f.write(hashlib.sha256(b"old-pw").hexdigest().encode('utf-8'))
+            f.write(Fernet(derive_key("old-pw", salt)).encrypt(json.dumps(library).encode('utf-8')))
+        assert detect_format(encrypted_source) == 'encrypted'
+        assert main([encrypted_source, "--password", "wrong"]) == 1
+        assert main([encrypted_source, "--password", "old-pw"]) == 0
+
+        store = SignatureStore(os.path.join(work_dir, "old", "signatures.db"))
+        assert store.unlock("old-pw") and store.get_data("Person 3") == fake_png(3)
+        assert store.get_info("Person 3")['created'] == "2024-05-06T07:08:09"
+        store.close()
+
+        # An encrypted library is only written out as plaintext when asked to
+        db_path = os.path.join(work_dir, "old", "signatures.db")
+        export_path = os.path.join(work_dir, "export.sigs")
+        assert main([db_path, "--password", "old-pw"]) == 1
+        assert main([db_path, "--password", "old-pw", "-o", export_path]) == 1
+        assert not os.path.exists(export_path)
+        assert main([db_path, "--password", "old-pw", "-o", export_path, "--decrypt"]) == 0
+        assert len(SignatureContainer(export_path)) == 4
+
+        # The plaintext library can go straight into an encrypted one
+        assert main([sigs_path, "-o", os.path.join(work_dir, "new.db"),
+                     "--new-password", "new-pw"]) == 0
+        store = SignatureStore(os.path.join(work_dir, "new.db"))
+        assert store.unlock("new-pw") and len(store) == 4
+        store.close()
+        print("✓ JSON -> .sigs, encrypted -> .db and .sigs -> .db migrations; "
+              ".db -> .sigs only with --decrypt")
+    except Exception as e:
+        print(f"✗ Migration tool test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL SIGNATURE CONTAINER TESTS PASSED")
+print("=" * 60)
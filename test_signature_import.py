@@ -0,0 +1,161 @@
+"""
+Test script for batch signature import (signature_processing.py)
+Prepares a temporary folder of signature images in parallel and stores them in one write
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("SIGNATURE IMPORT - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import module
+print("\n[TEST 1] Module Import")
+try:
+    from PIL import Image, ImageDraw
+    import signature_processing
+    from signature_processing import (MAPPING_NAME, SIGNATURE_SIZES, import_signature_folder,
+                                      signature_from_filename)
+    print("✓ signature_processing imported")
+except Exception as e:
+    print(f"✗ Failed to import signature_processing: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="signature_import_test_")
+
+
+def make_scan(path, size=(1200, 900)):
+    """Off-white scan with a dark scribble in the middle"""
+    img = Image.new('RGB', size, (248, 247, 245))
+    draw = ImageDraw.Draw(img)
+    draw.line([(300, 450), (500, 380), (700, 500), (900, 420)], fill=(15, 15, 40), width=8)
+    img.save(path)
+
+
+try:
+    # Test 2: Naming convention
+    print("\n[TEST 2] File Naming Convention")
+    try:
+        assert signature_from_filename("Jane_Doe.png") == ("Jane Doe", "signature")
+        assert signature_from_filename("Jane_Doe_initials.jpg") == ("Jane Doe (initials)", "initials")
+        assert signature_from_filename("Sam Lee-Initials.png") == ("Sam Lee (initials)", "initials")
+        print("✓ Names and types derived from file names")
+    except Exception as e:
+        print(f"✗ Naming convention test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Parallel folder import with a CSV mapping
+    print("\n[TEST 3] Parallel Folder Import")
+    try:
+        folder = os.path.join(work_dir, "department")
+        os.makedirs(folder)
+        for stem in ("Jane_Doe", "Jane_Doe_initials", "Sam_Lee", "Ann_Park", "mapped"):
+            make_scan(os.path.join(folder, f"{stem}.png"))
+        make_scan(os.path.join(folder, "Big_Scan.jpg"), size=(4000, 3000))
+        with open(os.path.join(folder, "broken.png"), "wb") as f:
+            f.write(b"not an image")
+        with open(os.path.join(folder, "notes.txt"), "w") as f:
+            f.write("ignored")
+        with open(os.path.join(folder, MAPPING_NAME), "w", encoding="utf-8") as f:
+            f.write("filename,name,type\nmapped.png,Dr. Alex Kim,initials\nAnn_Park.png,Ann,stamp\n"
+                    "Big_Scan.jpg,Sam Lee\n")
+
+        progress = []
+        results = import_signature_folder(folder, workers=2,
+                                          progress_callback=lambda done, total: progress.append(done))
+        by_name = {r['name']: r for r in results}
+        assert len(results) == 7 and progress[-1] == 7, (len(results), progress)
+        assert by_name["Dr. Alex Kim"]['type'] == "initials"
+        assert by_name["Jane Doe (initials)"]['width'] == SIGNATURE_SIZES['initials'][0]
+        assert (by_name["Jane Doe"]['width'], by_name["Jane Doe"]['height']) == SIGNATURE_SIZES['signature']
+        assert "Unknown signature type" in by_name["Ann"]['error']
+        failures = {os.path.basename(r['file']): r['error'] for r in results if r['error']}
+        assert sorted(failures) == ["Ann_Park.png", "Sam_Lee.png", "broken.png"], failures
+        assert failures["Sam_Lee.png"].startswith("Duplicate name")
+
+        import io
+        big_scan = next(r for r in results if r['file'].endswith("Big_Scan.jpg"))
+        big = Image.open(io.BytesIO(big_scan['data']))
+        assert big.size == SIGNATURE_SIZES['signature'] and big.getchannel('A').getbbox()
+        print(f"✓ {len(results) - 3} images prepared on 2 workers; 3 failures reported")
+    except Exception as e:
+        print(f"✗ Folder import test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Single transaction
+    print("\n[TEST 4] Single Encrypted Transaction")
+    try:
+        from pdf_editor_complete import SignatureStorage
+        from signature_store import SignatureStore
+
+        # Bypass the unlock dialogs and set up an unlocked store directly
+        storage = SignatureStorage.__new__(SignatureStorage)
+        storage.storage_file = os.path.join(work_dir, "signatures.db")
+        storage.store = SignatureStore(storage.storage_file)
+        storage.store.create("master")
+
+        writes = []
+        original_add_many = storage.store.add_many
+        storage.store.add_many = lambda entries: (writes.append(1), original_add_many(entries))[1]
+        prepared = [r for r in results if r['data']]
+        assert storage.add_signatures(prepared) == 4
+        assert len(writes) == 1, writes
+        storage.store.close()
+
+        reopened = SignatureStore(storage.storage_file)
+        assert reopened.unlock("master")
+        assert sorted(reopened.names()) == sorted(r['name'] for r in prepared)
+        assert reopened.get_data("Sam Lee") == big_scan['data']
+        reopened.close()
+        print("✓ 4 signatures committed in one encrypted transaction and read back")
+    except Exception as e:
+        print(f"✗ Encrypted write test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: A worker that dies fails its own files, not the import
+    print("\n[TEST 5] Worker Crash")
+    try:
+        crash_folder = os.path.join(work_dir, "crash")
+        os.makedirs(crash_folder)
+        for stem in ("Jane_Doe", "Crash_Test", "Sam_Lee"):
+            make_scan(os.path.join(crash_folder, f"{stem}.png"))
+
+        original_process = signature_processing.process_signature_file
+
+        def crashing_process(path, *args):
+            if path.endswith("Crash_Test.png"):
+                os._exit(1)
+            return original_process(path, *args)
+
+        signature_processing.process_signature_file = crashing_process
+        progress = []
+        try:
+            results = import_signature_folder(crash_folder, workers=2,
+                                              progress_callback=lambda done, total: progress.append(done))
+        finally:
+            signature_processing.process_signature_file = original_process
+
+        assert len(results) == 3 and progress[-1] == 3, (len(results), progress)
+        by_file = {os.path.basename(r['file']): r for r in results}
+        assert by_file["Crash_Test.png"]['error'] and by_file["Crash_Test.png"]['data'] is None
+        assert all(r['error'] or r['data'] for r in results), results
+        failed = sum(1 for r in results if r['error'])
+        print(f"✓ Crashed worker reported per file ({failed} of 3 failed)")
+    except Exception as e:
+        print(f"✗ Worker crash test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL SIGNATURE IMPORT TESTS PASSED")
+print("=" * 60)
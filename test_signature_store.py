@@ -0,0 +1,268 @@
+"""
+Test script for the record-level encrypted signature store (signature_store.py)
+Creates a temporary store, checks per-record reads and writes, and migrates an old library
+"""
+
+import sys
+import os
+import base64
+import hashlib
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    import codecs
+    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+print("=" * 60)
+print("SIGNATURE STORE - TEST SUITE")
+print("=" * 60)
+
+# Test 1: Import module
+print("\n[TEST 1] Module Import")
+try:
+    from cryptography.fernet import Fernet
+    from signature_store import (SignatureStore, StoreLockedError, derive_key,
+                                 migrate_legacy_file)
+    print("✓ signature_store imported")
+except Exception as e:
+    print(f"✗ Failed to import signature_store: {e}")
+    sys.exit(1)
+
+work_dir = tempfile.mkdtemp(prefix="signature_store_test_")
+
+
+def fake_png(n, size=3000):
+    """Distinct incompressible bytes standing in for a PNG"""
+    return hashlib.sha256(str(n).encode()).digest() * (size // 32)
+
+
+try:
+    path = os.path.join(work_dir, "signatures.db")
+
+    # Test 2: Create, lock and unlock
+    print("\n[TEST 2] Password and Locking")
+    try:
+        store = SignatureStore(path)
+        store.create("master")
+        store.add("Jane Doe", fake_png(1), "signature", 150, 50)
+        store.add("Jane Doe (initials)", fake_png(2), "initials", 60, 30)
+        store.close()
+
+        store = SignatureStore(path)
+        try:
+            store.names()
+            raise AssertionError("locked store listed its names")
+        except StoreLockedError:
+            pass
+        assert not store.unlock("wrong") and not store.is_unlocked
+        assert store.unlock("master")
+        assert store.names() == ["Jane Doe", "Jane Doe (initials)"]
+        assert store.get_info("Jane Doe (initials)")['width'] == 60
+        assert store.get_data("Jane Doe") == fake_png(1)
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        assert b"Jane" not in raw and b"initials" not in raw
+        print("✓ Wrong password rejected; names and images are encrypted on disk")
+    except Exception as e:
+        print(f"✗ Password test failed: {e}")
+        sys.exit(1)
+
+    # Test 3: Per-record writes and lazy data
+    print("\n[TEST 3] Record-Level Writes")
+    try:
+        entries = [{'name': f"Person {n}", 'data': fake_png(n), 'type': 'signature',
+                    'width': 150, 'height': 50} for n in range(2000)]
+        assert store.add_many(entries) == 2000
+
+        start = time.perf_counter()
+        store.add("Late Addition", fake_png(-1))
+        assert store.delete("Person 7") and not store.delete("Person 7")
+        edit_seconds = time.perf_counter() - start
+        store.close()
+
+        store = SignatureStore(path)
+        assert store.unlock("master")
+        start = time.perf_counter()
+        names = store.names()
+        list_seconds = time.perf_counter() - start
+        assert len(names) == 2002 and "Person 7" not in names and names[-1] == "Late Addition"
+        assert store.get_data("Person 1999") == fake_png(1999)
+
+        store.add("Jane Doe", fake_png(3), "signature", 150, 50)
+        assert store.get_data("Jane Doe") == fake_png(3) and len(store) == 2002
+
+        # Raw ciphertext is stored, not base64 text
+        with sqlite3.connect(path) as conn:
+            longest = conn.execute("SELECT MAX(LENGTH(data)) FROM signatures").fetchone()[0]
+        assert longest < 3000 + 100, longest
+        print(f"✓ Add + delete in a 2000-entry library: {edit_seconds * 1000:.1f}ms; "
+              f"listing without images: {list_seconds * 1000:.0f}ms")
+        store.close()
+    except Exception as e:
+        print(f"✗ Record-level write test failed: {e}")
+        sys.exit(1)
+
+    # Test 4: Migration from signatures.encrypted
+    print("\n[TEST 4] Legacy File Migration")
+    try:
+        legacy_path = os.path.join(work_dir, "signatures.encrypted")
+        salt = os.urandom(16)
+        legacy = {"Old Signature": {'data': base64.b64encode(fake_png(9)).decode('utf-8'),
+                                    'type': 'signature', 'width': 150, 'height': 50,
+                                    'created': "2024-01-02T03:04:05"}}
+        with open(legacy_path, "wb") as f:
+            f.write(salt)
+            f.write(hashlib.sha256(b"old-pw").hexdigest().encode('utf-8'))
+            f.write(Fernet(derive_key("old-pw", salt)).encrypt(json.dumps(legacy).encode('utf-8')))
+
+        migrated = SignatureStore(os.path.join(work_dir, "migrated.db"))
+        assert migrate_legacy_file(legacy_path, migrated, "nope") is None
+        assert not migrated.exists() and os.path.exists(legacy_path)
+
+        # A failed copy leaves no empty store behind and the old file in place
+        def fail(entries):
+            raise OSError("disk full")
+        migrated.add_many = fail
+        try:
+            migrate_legacy_file(legacy_path, migrated, "old-pw")
+            raise AssertionError("migration error was swallowed")
+        except OSError:
+            pass
+        assert not migrated.exists() and not migrated.is_unlocked and os.path.exists(legacy_path)
+        del migrated.add_many
+
+        assert migrate_legacy_file(legacy_path, migrated, "old-pw") == 1
+        assert migrated.get_data("Old Signature") == fake_png(9)
+        assert migrated.get_info("Old Signature")['created'] == "2024-01-02T03:04:05"
+        assert os.path.exists(legacy_path + ".bak") and not os.path.exists(legacy_path)
+        migrated.close()
+        print("✓ Old library moved into the store with the same password")
+    except Exception as e:
+        print(f"✗ Migration test failed: {e}")
+        sys.exit(1)
+
+    # Test 5: Thumbnail cache
+    print("\n[TEST 5] Thumbnail Cache")
+    try:
+        import io
+        from PIL import Image, ImageDraw
+        import signature_processing
+
+        def drawn_png(width):
+            img = Image.new('RGBA', (480, 200), (255, 255, 255, 0))
+            ImageDraw.Draw(img).line([(20, 150), (240, 40), (460, 160)], fill=(0, 0, 0, 255),
+                                     width=width)
+            buffer = io.BytesIO()
+            img.save(buffer, format='PNG')
+            return buffer.getvalue()
+
+        thumbs_path = os.path.join(work_dir, "thumbs.db")
+        store = SignatureStore(thumbs_path)
+        store.create("master")
+        store.add("Pad Signature", drawn_png(3))
+
+        made = []
+        original_make = signature_processing.make_thumbnail
+        signature_processing.make_thumbnail = lambda data, size: (made.append(size),
+                                                                  original_make(data, size))[1]
+        try:
+            first = store.get_thumbnail("Pad Signature", (96, 36))
+            assert Image.open(io.BytesIO(first)).size == (86, 36)
+            assert store.get_thumbnail("Pad Signature", (96, 36)) == first and len(made) == 1
+            store.close()
+
+            store = SignatureStore(thumbs_path)
+            assert store.unlock("master")
+            assert store.get_thumbnail("Pad Signature", (96, 36)) == first and len(made) == 1
+
+            store.add("Pad Signature", drawn_png(9))
+            assert store.get_thumbnail("Pad Signature", (96, 36)) != first and len(made) == 2
+            assert store.get_thumbnail("Missing", (96, 36)) is None
+
+            store.add_many([{'name': f"Batch {i}", 'data': drawn_png(i + 2)} for i in range(3)])
+            batch = store.get_thumbnails(["Batch 0", "Missing", "Batch 2"], (96, 36))
+            assert sorted(batch) == ["Batch 0", "Batch 2"] and len(made) == 4
+            assert store.get_thumbnail("Batch 2", (96, 36)) == batch["Batch 2"] and len(made) == 4
+
+            # A thumbnail made while the signature is replaced (UI thread vs list
+            # worker) is returned but not kept, so the next request remakes it
+            def replacing_make(data, size):
+                made.append(size)
+                store.add("Batch 1", drawn_png(12))
+                return original_make(data, size)
+
+            signature_processing.make_thumbnail = replacing_make
+            stale = store.get_thumbnail("Batch 1", (96, 36))
+            signature_processing.make_thumbnail = original_make
+            assert store.get_thumbnail("Batch 1", (96, 36)) != stale and len(made) == 5
+        finally:
+            signature_processing.make_thumbnail = original_make
+        store.close()
+
+        with open(thumbs_path, "rb") as f:
+            assert b"IHDR" not in f.read()
+        print("✓ Thumbnail made once, reloaded encrypted from disk, remade after replace; "
+              "stale thumbnail from a concurrent replace not kept")
+    except Exception as e:
+        print(f"✗ Thumbnail cache test failed: {e}")
+        sys.exit(1)
+
+    # Test 6: Deferred unlock and idle timeout
+    print("\n[TEST 6] Unlock Session")
+    try:
+        import threading
+        import signature_store
+        from pdf_editor_complete import SignatureStorage
+
+        class FakeWindow:
+            """Stands in for the Tk root: runs after() callbacks from a queue"""
+            def __init__(self):
+                self.pending = []
+            def after(self, ms, callback):
+                self.pending.append(callback)
+            def config(self, **kwargs):
+                pass
+
+        window = FakeWindow()
+        start = time.perf_counter()
+        storage = SignatureStorage(storage_file=path, parent_window=window,
+                                   legacy_file=None, idle_timeout=0.5)
+        assert time.perf_counter() - start < 0.05 and not storage.is_unlocked
+
+        derivations = []
+        original_derive = signature_store.derive_key
+        signature_store.derive_key = lambda *args: (derivations.append(
+            threading.current_thread() is threading.main_thread()), original_derive(*args))[1]
+        storage.prompt_password = lambda: ("master", storage.store.unlock)
+        try:
+            used = []
+            storage.ensure_unlocked(lambda: used.append(len(storage.get_all_names())))
+            while window.pending:
+                time.sleep(0.01)
+                window.pending.pop(0)()
+            storage.ensure_unlocked(lambda: used.append("again"))
+            assert used == [2002, "again"], used
+            assert derivations == [False], derivations
+
+            time.sleep(0.6)
+            assert not storage.is_unlocked and storage.get_all_names() == []
+        finally:
+            signature_store.derive_key = original_derive
+        storage.store.close()
+        print("✓ No prompt at startup; key derived once off the UI thread; idle session locked")
+    except Exception as e:
+        print(f"✗ Unlock session test failed: {e}")
+        sys.exit(1)
+
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print("\n" + "=" * 60)
+print("ALL SIGNATURE STORE TESTS PASSED")
+print("=" * 60)